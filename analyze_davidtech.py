@@ -40,16 +40,21 @@ def main():
     stats = analyzer.get_overall_stats()
     print(f"Total Signals: {stats['total']}")
     print(f"Wins: {stats['wins']} | Losses: {stats['losses']}")
-    print(f"Win Rate: {stats['win_rate']:.1f}%")
-    print(f"Profit Factor: {stats['profit_factor']:.2f}")
+    overall = analyzer.bootstrap_stats(seed=0).iloc[0]
+    print(f"Win Rate: {stats['win_rate']:.1f}% (95% CI {overall['win_rate_low']:.1f}-{overall['win_rate_high']:.1f}%)")
+    print(f"Profit Factor: {stats['profit_factor']:.2f} (95% CI {overall['profit_factor_low']:.2f}-{overall['profit_factor_high']:.2f})")
     
     # Analyze by day of week
     print(f"\n📅 PERFORMANCE BY DAY OF WEEK")
     print("="*80)
     day_analysis = analyzer.analyze_by_day_of_week()
+    day_ci = analyzer.bootstrap_stats(['day_name'], seed=0).set_index('day_name')
     for day_stats in sorted(day_analysis, key=lambda x: x['win_rate'], reverse=True):
-        print(f"{day_stats['day']:10s}: {day_stats['win_rate']:5.1f}% WR ({day_stats['wins']:2d}/{day_stats['total']:2d}) | "
-              f"Avg Profit: {day_stats['avg_profit']:5.2f}% | PF: {day_stats['profit_factor']:.2f}")
+        ci = day_ci.loc[day_stats['day']]
+        print(f"{day_stats['day']:10s}: {day_stats['win_rate']:5.1f}% WR ({day_stats['wins']:2d}/{day_stats['total']:2d}) "
+              f"[{ci['win_rate_wilson_low']:4.1f}-{ci['win_rate_wilson_high']:5.1f}%] | "
+              f"Avg Profit: {day_stats['avg_profit']:5.2f}% [{ci['avg_profit_low']:.2f}-{ci['avg_profit_high']:.2f}] | "
+              f"PF: {day_stats['profit_factor']:.2f}")
     
     # Analyze by hour
     print(f"\n⏰ PERFORMANCE BY HOUR OF DAY")
@@ -85,14 +90,16 @@ def main():
     if day_hour_combos:
         print("\n📅+⏰ Day + Hour Combinations:")
         for combo in sorted(day_hour_combos, key=lambda x: x['signals'], reverse=True):
-            print(f"  {combo['day']} at {combo['hour']:02d}:00: {combo['signals']} signals | Avg Profit: {combo['avg_profit']:.2f}%")
+            print(f"  {combo['day']} at {combo['hour']:02d}:00: {combo['signals']} signals | Avg Profit: {combo['avg_profit']:.2f}% | "
+                  f"95% WR lower bound: {combo['win_rate_low']:.0f}%")
     else:
         print("\n📅+⏰ No perfect Day+Hour combinations found")
     
     if day_coin_combos:
         print("\n📅+💰 Day + Coin Combinations:")
         for combo in sorted(day_coin_combos, key=lambda x: x['signals'], reverse=True):
-            print(f"  {combo['day']} with {combo['symbol']}: {combo['signals']} signals | Avg Profit: {combo['avg_profit']:.2f}%")
+            print(f"  {combo['day']} with {combo['symbol']}: {combo['signals']} signals | Avg Profit: {combo['avg_profit']:.2f}% | "
+                  f"95% WR lower bound: {combo['win_rate_low']:.0f}%")
     else:
         print("\n📅+💰 No perfect Day+Coin combinations found")
     
@@ -11,20 +11,90 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import csv
+import argparse
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 # Add src to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(current_dir, 'src')
 sys.path.insert(0, src_dir)
 
-from data.binance_data import BinanceDataFetcher
+from data.binance_data import BinanceDataFetcher, KlineFetchError
+from data.outcome_engine import parse_signal, flatten_horizons
+from data.results_journal import JournalMismatchError, ResultsJournal, digest
+from data.result_sinks import CSVResultSink, ParquetResultSink, TIME_COLUMNS, results_frame
+from data.result_metrics import comprehensive_metrics
+from data.online_metrics import OnlineMetrics
+from src.backtesting.portfolio import PortfolioSimulator
+
+# Per-process fetcher reused by every shard a worker evaluates
+_worker_fetcher = None
+
+# Signals sharded together; outcomes are released in signal order once a
+# window's shards finish, so at most about one window is held in memory
+SHARD_WINDOW = 5000
+
+
+def _evaluate_shard(shard: list, lookforward_hours: int, resolve_intrabar: bool = False,
+                    strict: bool = False) -> tuple:
+    """
+    Process-pool worker: evaluate one symbol's signals against cached klines
+    
+    Args:
+        shard: (original index, signal dict, previous outcome) for a single trading pair
+        lookforward_hours: Hours to look forward for targets/SL
+        resolve_intrabar: Re-check stop-loss/target ties on 1s klines
+        strict: Fail on missing or incomplete klines instead of reporting NO_DATA
+        
+    Returns:
+        Tuple of ((original index, outcome) pairs, OnlineMetrics of the shard)
+    """
+    global _worker_fetcher
+    if _worker_fetcher is None:
+        # The parent has already prefetched and built the mapped series, so
+        # workers only read the cache and never rebuild a series themselves
+        _worker_fetcher = BinanceDataFetcher(async_fetch=False, resolve_intrabar=resolve_intrabar,
+                                             strict=strict, consolidate=False)
+    
+    return _evaluate_with(_worker_fetcher, shard, lookforward_hours)
+
+
+def _evaluate_with(fetcher: BinanceDataFetcher, shard: list, lookforward_hours: int) -> tuple:
+    """
+    Evaluate (index, signal, previous) entries with a fetcher
+    
+    Returns:
+        Tuple of ((index, outcome) pairs, OnlineMetrics of the shard's outcomes)
+    """
+    outcomes = fetcher.check_signal_outcomes([signal for _, signal, _ in shard], lookforward_hours,
+                                             previous=[prior for _, _, prior in shard])
+    metrics = OnlineMetrics.from_results(outcome for outcome in outcomes if outcome is not None)
+    return [(idx, outcome) for (idx, _, _), outcome in zip(shard, outcomes)], metrics
+
+
+def _signal_pair(signal: dict):
+    """Trading pair of a signal, or None if it cannot be parsed (reported by the worker's parser)"""
+    try:
+        return parse_signal(signal)['pair']
+    except Exception:
+        return None
+
+
+def _shard_by_symbol(signals: list, previous: list, offset: int = 0) -> list:
+    """Group (index, signal, previous outcome) entries by trading pair, largest shards first"""
+    shards = {}
+    for idx, (signal, prior) in enumerate(zip(signals, previous), offset):
+        shards.setdefault(_signal_pair(signal), []).append((idx, signal, prior))
+    return sorted(shards.values(), key=len, reverse=True)
 
 class MetaSignalsBacktester:
     """Comprehensive Meta Signals backtesting system"""
     
-    def __init__(self):
-        self.binance = BinanceDataFetcher()
+    def __init__(self, resolve_intrabar: bool = False, strict: bool = False):
+        self.binance = BinanceDataFetcher(resolve_intrabar=resolve_intrabar, strict=strict)
         self.results = []
+        self.horizon_results = []
         self.signals_df = None
         
         # Create results directory
@@ -55,9 +125,41 @@ class MetaSignalsBacktester:
         print(f"  Timeframes: {dict(self.signals_df['timeframe'].value_counts())}")
         print()
     
+    def plan_prefetch(self, max_signals: int = None, lookforward_hours: int = 72,
+                      previous_results: dict = None):
+        """
+        Print the kline downloads a backtest would need, without fetching
+        
+        Args:
+            max_signals: Limit number of signals (None for all)
+            lookforward_hours: Hours to look forward for targets/SL
+            previous_results: Outcomes of an earlier run (see load_previous_results)
+            
+        Returns:
+            FetchPlan with request and byte estimates
+        """
+        if self.signals_df is None:
+            self.load_signals()
+        
+        signals_to_test = self.signals_df.head(max_signals) if max_signals else self.signals_df
+        signals = [signal.to_dict() for _, signal in signals_to_test.iterrows()]
+        previous = None
+        if previous_results:
+            previous = [previous_results.get(str(signal.get('message_id'))) for signal in signals]
+        
+        plan = self.binance.plan_signal_klines(signals, lookforward_hours, previous)
+        plan.print_summary()
+        return plan
+    
     def run_full_backtest(self, max_signals: int = None, 
                          lookforward_hours: int = 72,
-                         batch_size: int = 50):
+                         batch_size: int = 50,
+                         workers: int = 1,
+                         journal_path: str = None,
+                         resume: bool = False,
+                         sinks: list = None,
+                         keep_results: bool = True,
+                         previous_results: dict = None):
         """
         Run comprehensive backtest on all signals
         
@@ -65,6 +167,16 @@ class MetaSignalsBacktester:
             max_signals: Limit number of signals (None for all)
             lookforward_hours: Hours to look forward for targets/SL
             batch_size: Process signals in batches for progress updates
+            workers: Worker processes for evaluation (1 = serial, 0 = all CPU cores)
+            journal_path: Append-only results journal (defaults to checkpoints/journal.jsonl)
+            resume: Reuse outcomes already in the journal for the same parameters
+                    (see journal_params); a journal of other parameters is refused
+            sinks: Result sinks that every outcome is streamed to
+            keep_results: Keep all outcomes in self.results (disable for
+                          large runs that only stream to sinks)
+            previous_results: Outcomes of an earlier run keyed by signal_id
+                              (see load_previous_results); closed signals are
+                              reused and ONGOING ones continue from their last candle
         """
         if self.signals_df is None:
             self.load_signals()
@@ -77,271 +189,322 @@ class MetaSignalsBacktester:
         print(f"📊 Testing {total_signals} signals")
         print(f"⏰ Lookforward period: {lookforward_hours} hours")
         print(f"📦 Batch size: {batch_size}")
+        if workers != 1:
+            print(f"🧵 Workers: {workers or os.cpu_count()}")
         print()
         
         results = []
+        tested = 0
         batch_count = 0
         start_time = datetime.now()
-        
-        for idx, (_, signal) in enumerate(signals_to_test.iterrows(), 1):
+        # Run totals are merged from each shard's partial metrics; batches
+        # only feed the progress summaries
+        self.metrics = OnlineMetrics()
+        batch = OnlineMetrics()
+        
+        if journal_path is None:
+            journal_path = os.path.join(self.results_dir, "checkpoints", "journal.jsonl")
+        journal = ResultsJournal(journal_path, self.journal_params(lookforward_hours, previous_results))
+        
+        def emit(idx: int, result: dict):
+            """Handle one outcome, called in signal order as shards finish"""
+            nonlocal tested, batch, batch_count
+            position = idx + 1
             try:
-                # Test signal
-                result = self.binance.check_signal_outcome(signal.to_dict(), lookforward_hours)
-                results.append(result)
+                if result is None:
+                    raise ValueError("signal could not be evaluated")
+                tested += 1
+                batch.update(result)
+                if keep_results:
+                    results.append(result)
+                for sink in sinks or []:
+                    sink.write(result)
                 
                 # Progress indicator
-                if idx % 10 == 0:
-                    print(f"⏳ Progress: {idx}/{total_signals} ({(idx/total_signals)*100:.1f}%)")
+                if position % 10 == 0:
+                    print(f"⏳ Progress: {position}/{total_signals} ({(position/total_signals)*100:.1f}%)")
                 
                 # Batch summary
-                if idx % batch_size == 0:
+                if batch.total == batch_size:
                     batch_count += 1
-                    self._print_batch_summary(results[-batch_size:], batch_count, batch_size)
-                
-                # Save intermediate results every 100 signals
-                if idx % 100 == 0:
-                    self._save_intermediate_results(results, idx)
+                    self._print_batch_summary(batch, batch_count)
+                    batch = OnlineMetrics()
                 
             except Exception as e:
-                print(f"❌ Error on signal {idx}: {e}")
-                continue
+                print(f"❌ Error on signal {position}: {e}")
+        
+        # Evaluate all signals with one kline load per symbol and window
+        signals = [signal.to_dict() for _, signal in signals_to_test.iterrows()]
+        self._evaluate(signals, lookforward_hours, workers, journal, emit, self.metrics,
+                       resume, previous_results)
         
         # Final batch summary if needed
-        remaining = len(results) % batch_size
-        if remaining > 0:
+        if batch.total > 0:
             batch_count += 1
-            self._print_batch_summary(results[-remaining:], batch_count, remaining)
+            self._print_batch_summary(batch, batch_count)
         
+        for sink in sinks or []:
+            sink.flush()
         self.results = results
         
         elapsed = datetime.now() - start_time
         print(f"\\n⏱️ Backtesting completed in {elapsed}")
-        print(f"✅ Successfully tested {len(results)} signals")
+        print(f"✅ Successfully tested {tested} signals")
         
         return results
     
-    def _print_batch_summary(self, batch_results: list, batch_num: int, batch_size: int):
-        """Print summary for a batch of results"""
-        valid_results = [r for r in batch_results if r['final_outcome'] != 'NO_DATA']
+    def journal_params(self, lookforward_hours: int, previous_results: dict = None) -> dict:
+        """
+        Run options that change outcomes, recorded with every journal entry
         
-        if not valid_results:
-            print(f"📦 Batch {batch_num}: No valid data")
+        Args:
+            lookforward_hours: Hours to look forward for targets/SL
+            previous_results: Outcomes of an earlier run (incremental runs)
+            
+        Returns:
+            Parameters a resumed run must share with the journal
+        """
+        return {
+            'lookforward_hours': lookforward_hours,
+            'resolve_ties': self.binance.intrabar is not None,
+            'incremental': digest(previous_results) if previous_results else None
+        }
+    
+    def _evaluate(self, signals: list, lookforward_hours: int, workers: int,
+                  journal: ResultsJournal, emit, metrics: OnlineMetrics,
+                  resume: bool = False, previous_results: dict = None):
+        """
+        Evaluate signals shard by shard, checkpointing to the journal
+        
+        Klines are prefetched once in this process (and, with workers,
+        each pair's mapped series is built here), then the signals are
+        split into windows of SHARD_WINDOW and each window's symbols are
+        evaluated (in a worker process when workers != 1). Every shard is
+        appended to the journal as soon as it finishes, and outcomes are
+        handed to emit in original signal order as soon as all earlier
+        signals are done, so the output matches a serial, uninterrupted
+        run while only shards that finished early are held back. Each
+        shard also returns the OnlineMetrics of its outcomes, which are
+        merged into metrics as the shard is recorded.
+        
+        Args:
+            signals: Signal dictionaries
+            lookforward_hours: Hours to look forward for targets/SL
+            workers: Worker processes (1 = serial, 0 = all CPU cores)
+            journal: Results journal
+            emit: Called as emit(index, outcome) for every signal, in
+                  order (outcome is None for failed signals)
+            metrics: Run totals that shard metrics are merged into
+            resume: Reuse outcomes already in the journal
+            previous_results: Outcomes of an earlier run keyed by signal_id
+        """
+        # Finished outcomes that wait for an earlier signal
+        ready = {}
+        cursor = 0
+        
+        def release():
+            nonlocal cursor
+            while cursor in ready:
+                emit(cursor, ready.pop(cursor))
+                cursor += 1
+        
+        pending = list(range(len(signals)))
+        if resume:
+            completed = journal.load()
+            pending = []
+            for idx, signal in enumerate(signals):
+                outcome = completed.pop(journal.key(signal.get('message_id')), None)
+                if outcome is None:
+                    pending.append(idx)
+                else:
+                    ready[idx] = outcome
+                    metrics.update(outcome)
+            print(f"♻️ Resuming: {len(signals) - len(pending)} signal(s) already in journal, "
+                  f"{len(pending)} to evaluate")
+        release()
+        
+        if not pending:
             return
         
-        wins = sum(1 for r in valid_results if r['final_outcome'].startswith('TARGET'))
-        losses = sum(1 for r in valid_results if r['final_outcome'] == 'STOP_LOSS')
-        ongoing = len(valid_results) - wins - losses
+        pending_signals = [signals[idx] for idx in pending]
+        previous = [None] * len(pending_signals)
+        if previous_results:
+            previous = [previous_results.get(str(signal.get('message_id'))) for signal in pending_signals]
+            print(f"🔁 Incremental run: {sum(p is not None for p in previous)} signal(s) "
+                  f"have previous outcomes, {sum(p is None for p in previous)} are new")
+        
+        if self.binance.async_fetch:
+            self.binance.prefetch_signal_klines(pending_signals, lookforward_hours, previous)
+        if workers != 1:
+            # A pair's signals can land in shards of several windows that run
+            # at once, so its mapped series is built here, once, up front
+            for pair in sorted({_signal_pair(signal) for signal in pending_signals} - {None}):
+                self.binance.get_mapped_klines(pair, refresh=True)
+        shards = []
+        for start in range(0, len(pending_signals), SHARD_WINDOW):
+            shards.extend(_shard_by_symbol(pending_signals[start:start + SHARD_WINDOW],
+                                           previous[start:start + SHARD_WINDOW], start))
+        
+        def record(shard_outcomes: list, shard_metrics: OnlineMetrics = None):
+            if shard_metrics is not None:
+                metrics.merge(shard_metrics)
+            entries = []
+            for local_idx, outcome in shard_outcomes:
+                idx = pending[local_idx]
+                ready[idx] = outcome
+                if outcome is not None:
+                    entries.append((signals[idx].get('message_id'), outcome))
+            journal.extend(entries)
+            release()
+        
+        with journal.open(resume=resume):
+            if workers == 1:
+                for shard in shards:
+                    record(*_evaluate_with(self.binance, shard, lookforward_hours))
+                return
+            
+            # Keep a few shards per worker in flight, submitted in window
+            # order, so finished shards never pile up far ahead of the cursor
+            max_in_flight = 2 * (workers or os.cpu_count())
+            queue = iter(shards)
+            futures = {}
+            with ProcessPoolExecutor(max_workers=workers or None) as executor:
+                while True:
+                    for shard in islice(queue, max_in_flight - len(futures)):
+                        futures[executor.submit(_evaluate_shard, shard, lookforward_hours,
+                                                self.binance.intrabar is not None,
+                                                self.binance.strict)] = shard
+                    if not futures:
+                        break
+                    
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        shard = futures.pop(future)
+                        try:
+                            record(*future.result())
+                        except KlineFetchError:
+                            raise
+                        except Exception as e:
+                            print(f"❌ Worker failed on {shard[0][1].get('symbol')} ({len(shard)} signals): {e}")
+                            record([(local_idx, None) for local_idx, _, _ in shard])
+    
+    def load_previous_results(self, filepath: str) -> dict:
+        """
+        Load the detailed results CSV of an earlier run for an incremental backtest
+        
+        Args:
+            filepath: Path of a *_detailed_*.csv file
+            
+        Returns:
+            Outcome dictionaries keyed by signal_id (as string)
+        """
+        print(f"📂 Loading previous results from: {os.path.basename(filepath)}")
+        df = pd.read_csv(filepath, float_precision='round_trip')
+        for column in TIME_COLUMNS.intersection(df.columns):
+            df[column] = pd.to_datetime(df[column], utc=True, format='ISO8601')
         
-        winrate = (wins / len(valid_results)) * 100 if valid_results else 0
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        previous = {str(record['signal_id']): record for record in records}
         
-        print(f"📦 Batch {batch_num} ({batch_size} signals): " + 
-              f"Win Rate: {winrate:.1f}% | " +
-              f"Wins: {wins} | Losses: {losses} | Ongoing: {ongoing}")
+        ongoing = sum(1 for r in records if r.get('final_outcome') == 'ONGOING')
+        print(f"✅ Loaded {len(previous)} previous outcomes ({ongoing} ongoing)")
+        return previous
     
-    def _save_intermediate_results(self, results: list, count: int):
-        """Save intermediate results"""
-        timestamp = datetime.now().strftime("%H%M%S")
-        filename = f"intermediate_results_{count}_{timestamp}.csv"
-        filepath = os.path.join(self.results_dir, filename)
+    def _print_batch_summary(self, batch: OnlineMetrics, batch_num: int):
+        """Print summary for a batch of results"""
+        if not batch.valid:
+            print(f"📦 Batch {batch_num}: No valid data")
+            return
         
-        df = pd.DataFrame(results)
-        df.to_csv(filepath, index=False)
-        print(f"💾 Saved intermediate results: {filename}")
+        median_t1 = batch.median_minutes('target1')
+        print(f"📦 Batch {batch_num} ({batch.total} signals): " + 
+              f"Win Rate: {batch.winrate:.1f}% | " +
+              f"Wins: {batch.wins} | Losses: {batch.losses} | Ongoing: {batch.ongoing}" +
+              (f" | Median T1: {median_t1:.0f} min" if median_t1 is not None else ""))
     
-    def calculate_comprehensive_metrics(self) -> dict:
-        """Calculate detailed performance metrics"""
-        if not self.results:
-            return {}
+    def run_horizon_backtest(self, horizons: list, max_signals: int = None) -> list:
+        """
+        Evaluate every signal for several lookforward horizons in one pass
         
-        print("📊 Calculating comprehensive metrics...")
+        Klines are loaded once for the longest horizon and each signal is
+        scanned once, instead of running the full backtest per horizon.
         
-        # Filter valid results
-        valid_results = [r for r in self.results if r['final_outcome'] != 'NO_DATA']
-        total_signals = len(self.results)
-        total_valid = len(valid_results)
-        
-        if total_valid == 0:
-            return {'error': 'No valid results to analyze'}
-        
-        # Basic outcome counts
-        target1_hits = sum(1 for r in valid_results if r['hit_target1'])
-        target2_hits = sum(1 for r in valid_results if r['hit_target2'])
-        target3_hits = sum(1 for r in valid_results if r['hit_target3'])
-        stop_loss_hits = sum(1 for r in valid_results if r['hit_stop_loss'])
-        
-        # Win categories
-        any_target_wins = sum(1 for r in valid_results if r['final_outcome'].startswith('TARGET'))
-        target1_only = sum(1 for r in valid_results if r['final_outcome'] == 'TARGET1')
-        target2_wins = sum(1 for r in valid_results if r['final_outcome'] == 'TARGET2')
-        target3_wins = sum(1 for r in valid_results if r['final_outcome'] == 'TARGET3')
-        
-        # Win rates
-        overall_winrate = (any_target_wins / total_valid) * 100
-        target1_rate = (target1_hits / total_valid) * 100
-        target2_rate = (target2_hits / total_valid) * 100
-        target3_rate = (target3_hits / total_valid) * 100
-        stop_loss_rate = (stop_loss_hits / total_valid) * 100
-        
-        # Timing analysis
-        target_times = []
-        sl_times = []
-        target1_times = []
-        target2_times = []
-        target3_times = []
-        
-        for r in valid_results:
-            if r.get('target1_minutes'):
-                target_times.append(r['target1_minutes'])
-                target1_times.append(r['target1_minutes'])
-            if r.get('target2_minutes'):
-                target_times.append(r['target2_minutes'])
-                target2_times.append(r['target2_minutes'])
-            if r.get('target3_minutes'):
-                target_times.append(r['target3_minutes'])
-                target3_times.append(r['target3_minutes'])
-            if r.get('stop_loss_minutes'):
-                sl_times.append(r['stop_loss_minutes'])
-        
-        # Profit/Loss analysis
-        profits = [r['max_profit_pct'] for r in valid_results if r['max_profit_pct'] > 0]
-        drawdowns = [abs(r['max_drawdown_pct']) for r in valid_results if r['max_drawdown_pct'] < 0]
-        
-        # Risk metrics
-        all_profits = [r['max_profit_pct'] for r in valid_results]
-        all_drawdowns = [r['max_drawdown_pct'] for r in valid_results]
-        
-        metrics = {
-            # Dataset info
-            'total_signals': total_signals,
-            'valid_signals': total_valid,
-            'data_coverage_pct': (total_valid / total_signals) * 100,
-            
-            # Win rates
-            'overall_winrate_pct': overall_winrate,
-            'target1_hit_rate_pct': target1_rate,
-            'target2_hit_rate_pct': target2_rate,
-            'target3_hit_rate_pct': target3_rate,
-            'stop_loss_rate_pct': stop_loss_rate,
-            
-            # Outcome counts
-            'total_wins': any_target_wins,
-            'total_losses': stop_loss_hits,
-            'target1_only_wins': target1_only,
-            'target2_wins': target2_wins,
-            'target3_wins': target3_wins,
-            'target1_hits': target1_hits,
-            'target2_hits': target2_hits,
-            'target3_hits': target3_hits,
-            
-            # Timing metrics (minutes)
-            'avg_target_time_min': np.mean(target_times) if target_times else 0,
-            'median_target_time_min': np.median(target_times) if target_times else 0,
-            'avg_target1_time_min': np.mean(target1_times) if target1_times else 0,
-            'avg_target2_time_min': np.mean(target2_times) if target2_times else 0,
-            'avg_target3_time_min': np.mean(target3_times) if target3_times else 0,
-            'avg_sl_time_min': np.mean(sl_times) if sl_times else 0,
-            'median_sl_time_min': np.median(sl_times) if sl_times else 0,
-            'fastest_target_min': min(target_times) if target_times else 0,
-            'slowest_target_min': max(target_times) if target_times else 0,
-            
-            # Profit/Loss metrics
-            'avg_max_profit_pct': np.mean(profits) if profits else 0,
-            'median_max_profit_pct': np.median(profits) if profits else 0,
-            'best_profit_pct': max(profits) if profits else 0,
-            'avg_max_drawdown_pct': np.mean(drawdowns) if drawdowns else 0,
-            'median_max_drawdown_pct': np.median(drawdowns) if drawdowns else 0,
-            'worst_drawdown_pct': max(drawdowns) if drawdowns else 0,
-            
-            # Risk metrics
-            'profit_factor': (sum(p for p in all_profits if p > 0) / 
-                            abs(sum(d for d in all_drawdowns if d < 0))) if any(d < 0 for d in all_drawdowns) else float('inf'),
-            'sharpe_estimate': np.mean(all_profits) / np.std(all_profits) if len(all_profits) > 1 and np.std(all_profits) > 0 else 0,
+        Args:
+            horizons: Lookforward horizons in hours (e.g. [24, 72, 168])
+            max_signals: Limit number of signals (None for all)
             
-            # Performance by categories
-            'symbol_performance': self._analyze_by_symbol(),
-            'timeframe_performance': self._analyze_by_timeframe(),
-            'strategy_performance': self._analyze_by_strategy(),
-            'action_performance': self._analyze_by_action()
-        }
+        Returns:
+            Per signal, a mapping of horizon to outcome dictionary
+        """
+        if self.signals_df is None:
+            self.load_signals()
+        
+        signals_to_test = self.signals_df.head(max_signals) if max_signals else self.signals_df
+        horizons = sorted(horizons)
         
-        return metrics
+        print("🚀 Starting multi-horizon Meta Signals Backtesting")
+        print("=" * 60)
+        print(f"📊 Testing {len(signals_to_test)} signals")
+        print(f"⏰ Horizons: {', '.join(f'{h:g}h' for h in horizons)}")
+        print()
+        
+        start_time = datetime.now()
+        signals = [signal.to_dict() for _, signal in signals_to_test.iterrows()]
+        outcomes = self.binance.check_signal_outcomes_multi(signals, horizons)
+        
+        self.horizons = horizons
+        self.horizon_results = [outcome for outcome in outcomes if outcome is not None]
+        
+        print(f"\\n⏱️ Backtesting completed in {datetime.now() - start_time}")
+        print(f"✅ Successfully tested {len(self.horizon_results)} signals")
+        
+        for horizon in horizons:
+            results = [outcome[horizon] for outcome in self.horizon_results]
+            valid = [r for r in results if r.get('final_outcome', 'NO_DATA') != 'NO_DATA']
+            wins = sum(1 for r in valid if r['final_outcome'].startswith('TARGET'))
+            losses = sum(1 for r in valid if r['final_outcome'] == 'STOP_LOSS')
+            winrate = (wins / len(valid)) * 100 if valid else 0
+            print(f"  {horizon:>6g}h: Win Rate: {winrate:.1f}% | Wins: {wins} | "
+                  f"Losses: {losses} | Ongoing: {len(valid) - wins - losses}")
+        
+        return self.horizon_results
     
-    def _analyze_by_symbol(self) -> dict:
-        """Analyze performance by symbol"""
-        symbol_stats = {}
+    def save_horizon_results(self, filename_prefix: str = "meta_signals_backtest"):
+        """Save per-horizon columns and per-horizon metrics of a multi-horizon run"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        for r in self.results:
-            if r['final_outcome'] == 'NO_DATA':
-                continue
-                
-            symbol = r['symbol']
-            if symbol not in symbol_stats:
-                symbol_stats[symbol] = {
-                    'total': 0, 'wins': 0, 'losses': 0,
-                    'profits': [], 'drawdowns': [], 'target_times': []
-                }
-            
-            stats = symbol_stats[symbol]
-            stats['total'] += 1
-            
-            if r['final_outcome'].startswith('TARGET'):
-                stats['wins'] += 1
-                if r.get('target1_minutes'):
-                    stats['target_times'].append(r['target1_minutes'])
-            elif r['final_outcome'] == 'STOP_LOSS':
-                stats['losses'] += 1
-            
-            if r['max_profit_pct'] > 0:
-                stats['profits'].append(r['max_profit_pct'])
-            if r['max_drawdown_pct'] < 0:
-                stats['drawdowns'].append(abs(r['max_drawdown_pct']))
-        
-        # Calculate summary stats
-        for symbol, stats in symbol_stats.items():
-            if stats['total'] > 0:
-                stats['winrate_pct'] = (stats['wins'] / stats['total']) * 100
-                stats['avg_profit_pct'] = np.mean(stats['profits']) if stats['profits'] else 0
-                stats['avg_drawdown_pct'] = np.mean(stats['drawdowns']) if stats['drawdowns'] else 0
-                stats['avg_target_time_min'] = np.mean(stats['target_times']) if stats['target_times'] else 0
-        
-        return symbol_stats
-    
-    def _analyze_by_timeframe(self) -> dict:
-        """Analyze performance by timeframe"""
-        return self._analyze_by_category('timeframe')
-    
-    def _analyze_by_strategy(self) -> dict:
-        """Analyze performance by strategy version"""
-        return self._analyze_by_category('strategy_version')
-    
-    def _analyze_by_action(self) -> dict:
-        """Analyze performance by action (LONG/SHORT)"""
-        return self._analyze_by_category('action')
-    
-    def _analyze_by_category(self, category: str) -> dict:
-        """Generic analysis by category"""
-        category_stats = {}
-        
-        for r in self.results:
-            if r['final_outcome'] == 'NO_DATA':
-                continue
-                
-            cat_value = r.get(category, 'Unknown')
-            if cat_value not in category_stats:
-                category_stats[cat_value] = {'total': 0, 'wins': 0, 'losses': 0}
-            
-            category_stats[cat_value]['total'] += 1
-            if r['final_outcome'].startswith('TARGET'):
-                category_stats[cat_value]['wins'] += 1
-            elif r['final_outcome'] == 'STOP_LOSS':
-                category_stats[cat_value]['losses'] += 1
+        results_file = f"{filename_prefix}_horizons_{timestamp}.csv"
+        results_path = os.path.join(self.results_dir, results_file)
+        pd.DataFrame([flatten_horizons(outcome) for outcome in self.horizon_results]).to_csv(
+            results_path, index=False)
+        print(f"💾 Horizon results saved: {results_file}")
+        
+        # Reuse the single-horizon metrics on each horizon's outcomes
+        saved_results = self.results
+        metrics = {}
+        try:
+            for horizon in self.horizons:
+                self.results = [outcome[horizon] for outcome in self.horizon_results
+                                if 'final_outcome' in outcome[horizon]]
+                metrics[f"{horizon:g}h"] = self.calculate_comprehensive_metrics()
+        finally:
+            self.results = saved_results
+        
+        metrics_file = f"{filename_prefix}_horizon_metrics_{timestamp}.json"
+        metrics_path = os.path.join(self.results_dir, metrics_file)
+        with open(metrics_path, 'w') as f:
+            json.dump(metrics, f, indent=2, default=str)
+        print(f"📊 Horizon metrics saved: {metrics_file}")
         
-        # Calculate win rates
-        for cat_value, stats in category_stats.items():
-            if stats['total'] > 0:
-                stats['winrate_pct'] = (stats['wins'] / stats['total']) * 100
+        return results_path, metrics_path
+    
+    def calculate_comprehensive_metrics(self) -> dict:
+        """Calculate detailed performance metrics"""
+        if not self.results:
+            return {}
         
-        return category_stats
+        print("📊 Calculating comprehensive metrics...")
+        return comprehensive_metrics(self.results)
     
     def save_full_results(self, filename_prefix: str = "meta_signals_backtest"):
         """Save comprehensive results"""
@@ -351,7 +514,8 @@ class MetaSignalsBacktester:
         results_file = f"{filename_prefix}_detailed_{timestamp}.csv"
         results_path = os.path.join(self.results_dir, results_file)
         
-        df = pd.DataFrame(self.results)
+        # Same column layout as a streamed run (see result_sinks.results_frame)
+        df = results_frame(self.results)
         df.to_csv(results_path, index=False)
         print(f"💾 Detailed results saved: {results_file}")
         
@@ -366,6 +530,103 @@ class MetaSignalsBacktester:
         
         return results_path, metrics_path
     
+    def open_result_sinks(self, filename_prefix: str = "meta_signals_backtest",
+                          parquet: bool = False, row_group_size: int = 1000) -> list:
+        """
+        Open streaming sinks for the detailed results of a run
+        
+        Args:
+            filename_prefix: Prefix for the output files
+            parquet: Also write a Parquet file (requires pyarrow)
+            row_group_size: Rows buffered per write
+            
+        Returns:
+            List of open sinks to pass to run_full_backtest
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_path = os.path.join(self.results_dir, f"{filename_prefix}_detailed_{timestamp}")
+        
+        sinks = [CSVResultSink(f"{base_path}.csv", row_group_size)]
+        if parquet:
+            sinks.append(ParquetResultSink(f"{base_path}.parquet", row_group_size))
+        
+        for sink in sinks:
+            print(f"💾 Streaming detailed results to: {os.path.basename(sink.path)}")
+        return sinks
+    
+    def save_streamed_summary(self, sinks: list, filename_prefix: str = "meta_signals_backtest") -> str:
+        """
+        Save and print the running aggregates of a streamed run
+        
+        Args:
+            sinks: Sinks the run was streamed to (closed)
+            filename_prefix: Prefix for the summary file
+            
+        Returns:
+            Path of the summary JSON file
+        """
+        summary = self.metrics.summary()
+        summary['detailed_files'] = [os.path.basename(sink.path) for sink in sinks]
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        summary_file = f"{filename_prefix}_summary_{timestamp}.json"
+        summary_path = os.path.join(self.results_dir, summary_file)
+        with open(summary_path, 'w') as f:
+            json.dump(summary, f, indent=2, default=str)
+        
+        print(f"📊 Summary saved: {summary_file}")
+        print(f"  Valid Data Coverage: {summary['valid_signals']:,}/{summary['total_signals']:,} "
+              f"({summary['data_coverage_pct']:.1f}%)")
+        print(f"  Win Rate: {summary['overall_winrate_pct']:.1f}% | "
+              f"Wins: {summary['total_wins']:,} | Losses: {summary['total_losses']:,}")
+        print(f"  Average Max Profit: {summary['avg_max_profit_pct']:.2f}% | "
+              f"Average Max Drawdown: {summary['avg_max_drawdown_pct']:.2f}%")
+        target1 = summary['time_to_hit']['target1']
+        if target1['count']:
+            print(f"  Time to Target 1: mean {target1['mean_minutes']:.0f} min | "
+                  f"median {target1['median_minutes']:.0f} min | p90 {target1['p90_minutes']:.0f} min")
+        return summary_path
+    
+    def run_portfolio_simulation(self, results=None, filename_prefix: str = "meta_signals_backtest",
+                                 config_path: str = "config/config.json") -> dict:
+        """
+        Simulate one account trading all evaluated signals and save its equity curve
+        
+        Args:
+            results: Outcomes or detailed results DataFrame (defaults to self.results)
+            filename_prefix: Prefix for the output files
+            config_path: Config file with the "backtesting" settings
+            
+        Returns:
+            Portfolio summary metrics
+        """
+        simulator = PortfolioSimulator.from_config(config_path)
+        portfolio = simulator.run(self.results if results is None else results)
+        summary = portfolio['summary']
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        equity_file = f"{filename_prefix}_equity_{timestamp}.csv"
+        portfolio['equity_curve'].to_csv(os.path.join(self.results_dir, equity_file), index=False)
+        trades_file = f"{filename_prefix}_trades_{timestamp}.csv"
+        portfolio['trades'].to_csv(os.path.join(self.results_dir, trades_file), index=False)
+        summary_file = f"{filename_prefix}_portfolio_{timestamp}.json"
+        with open(os.path.join(self.results_dir, summary_file), 'w') as f:
+            json.dump(summary, f, indent=2, default=str)
+        
+        print(f"\\n💼 PORTFOLIO SIMULATION")
+        print(f"  Capital: {summary['initial_capital']:,.2f} -> {summary['final_equity']:,.2f} "
+              f"({summary.get('total_return', 0):+.2f}%)")
+        print(f"  Trades: {summary['total_trades']:,} | Win Rate: {summary.get('win_rate', 0):.1f}% | "
+              f"Max Drawdown: {summary['max_drawdown_pct']:.2f}%")
+        print(f"  Sharpe: {summary['sharpe_ratio']:.2f} | Sortino: {summary['sortino_ratio']:.2f} | "
+              f"Exposure: {summary['exposure_pct']:.1f}% | "
+              f"Longest Under Water: {summary['max_underwater_hours']:.1f}h")
+        print(f"  Skipped signals: {summary['skipped_signals']}")
+        print(f"📈 Equity curve saved: {equity_file}")
+        print(f"💾 Trades saved: {trades_file}")
+        print(f"📊 Portfolio summary saved: {summary_file}")
+        return summary
+    
     def print_final_report(self):
         """Print comprehensive final report"""
         if not self.results:
@@ -438,14 +699,43 @@ class MetaSignalsBacktester:
 
 def main():
     """Main backtesting execution"""
-    backtester = MetaSignalsBacktester()
+    parser = argparse.ArgumentParser(description="Backtest Meta Signals against historical Binance data")
+    parser.add_argument('signals_file', nargs='?', default=None,
+                        help="Signals CSV (defaults to the latest file in data/signals)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for evaluation (1 = serial, 0 = all CPU cores)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip signals already in the results journal of a previous run")
+    parser.add_argument('--incremental', metavar='PREVIOUS_CSV', default=None,
+                        help="Reuse a previous detailed results CSV and only re-evaluate "
+                             "ongoing and new signals")
+    parser.add_argument('--horizons', default=None,
+                        help="Comma-separated lookforward hours (e.g. 24,72,168) evaluated "
+                             "in one pass with per-horizon columns")
+    parser.add_argument('--stream', action='store_true',
+                        help="Write detailed results while running instead of holding them in memory")
+    parser.add_argument('--parquet', action='store_true',
+                        help="With --stream, also write a Parquet copy (requires pyarrow)")
+    parser.add_argument('--plan', action='store_true',
+                        help="Only print the kline fetch plan (requests, bytes) and exit")
+    parser.add_argument('--resolve-ties', action='store_true',
+                        help="Re-check 1m candles that touched both the stop loss and a target "
+                             "on 1s klines instead of counting them as stop losses")
+    parser.add_argument('--strict', action='store_true',
+                        help="Stop when klines cannot be fetched or stay incomplete after repair "
+                             "instead of counting those signals as NO_DATA")
+    parser.add_argument('--portfolio', action='store_true',
+                        help="Also simulate one account trading all signals with the capital, "
+                             "risk and position limits of the config's backtesting block")
+    args = parser.parse_args()
+    
+    backtester = MetaSignalsBacktester(resolve_intrabar=args.resolve_ties, strict=args.strict)
     
     print("🔥 Meta Signals Comprehensive Backtesting")
     print("This will test ALL signals against historical Binance data")
     print()
     
-    # Check for command line argument for signals file
-    signals_file = sys.argv[1] if len(sys.argv) > 1 else None
+    signals_file = args.signals_file
     
     # Derive output filename prefix from input signal file
     output_prefix = "meta_signals_backtest"  # default
@@ -454,7 +744,6 @@ def main():
         backtester.load_signals(signals_file)
         
         # Extract base filename without path and extension
-        import os
         base_name = os.path.splitext(os.path.basename(signals_file))[0]
         # Remove common suffixes like '_backtest', '_export', etc.
         base_name = base_name.replace('_backtest', '').replace('_export', '')
@@ -479,14 +768,56 @@ def main():
     
     print()
     
+    previous_results = backtester.load_previous_results(args.incremental) if args.incremental else None
+    
+    if args.plan:
+        backtester.plan_prefetch(max_signals=max_signals, previous_results=previous_results)
+        return
+    
+    if args.horizons:
+        horizons = [float(h) for h in args.horizons.split(',') if h.strip()]
+        try:
+            backtester.run_horizon_backtest(horizons, max_signals=max_signals)
+        except KlineFetchError as e:
+            print(f"❌ Refusing to report results on incomplete kline data: {e}")
+            sys.exit(1)
+        backtester.save_horizon_results(filename_prefix=output_prefix)
+        return
+    
+    # Stream detailed rows to disk instead of keeping them in memory
+    sinks = backtester.open_result_sinks(output_prefix, parquet=args.parquet) if args.stream else []
+    
     # Run backtesting
-    backtester.run_full_backtest(max_signals=max_signals)
+    journal_path = os.path.join(backtester.results_dir, "checkpoints", f"{output_prefix}.jsonl")
+    try:
+        backtester.run_full_backtest(max_signals=max_signals, workers=args.workers,
+                                     journal_path=journal_path, resume=args.resume,
+                                     sinks=sinks, keep_results=not args.stream,
+                                     previous_results=previous_results)
+    except KlineFetchError as e:
+        print(f"❌ Refusing to report results on incomplete kline data: {e}")
+        sys.exit(1)
+    except JournalMismatchError as e:
+        print(f"❌ Cannot resume with different settings (run without --resume to start over): {e}")
+        sys.exit(1)
+    finally:
+        for sink in sinks:
+            sink.close()
+    
+    if args.stream:
+        backtester.save_streamed_summary(sinks, filename_prefix=output_prefix)
+        if args.portfolio:
+            backtester.run_portfolio_simulation(pd.read_csv(sinks[0].path), filename_prefix=output_prefix)
+        return
     
     # Calculate and save results with custom prefix
     backtester.save_full_results(filename_prefix=output_prefix)
     
     # Print final report
     backtester.print_final_report()
+    
+    if args.portfolio:
+        backtester.run_portfolio_simulation(filename_prefix=output_prefix)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Binance Archive Ingestion
+
+Imports daily/monthly kline archives downloaded from data.binance.vision
+into the local kline cache, e.g.:
+
+    python ingest_archives.py downloads/klines --workers 8
+    python ingest_archives.py downloads/klines --symbols BTCUSDT,ETHUSDT --intervals 1m
+"""
+
+import os
+import sys
+import argparse
+
+# Add src to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from data.archive_ingest import ingest_archives
+
+
+def main():
+    """Ingest archives from the command line"""
+    parser = argparse.ArgumentParser(description="Import Binance kline archives into the kline cache")
+    parser.add_argument('directory', help="Directory with downloaded .zip/.csv kline archives")
+    parser.add_argument('--cache-dir', default=os.path.join('data', 'cache', 'klines'),
+                        help="Kline store directory")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Worker processes (1 = serial, 0 = all CPU cores)")
+    parser.add_argument('--symbols', default=None,
+                        help="Comma-separated trading pairs to import (default: all)")
+    parser.add_argument('--intervals', default=None,
+                        help="Comma-separated intervals to import (default: all)")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="Replace day partitions that are already cached")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Directory not found: {args.directory}")
+        sys.exit(1)
+
+    summary = ingest_archives(
+        args.directory,
+        root=args.cache_dir,
+        workers=args.workers,
+        symbols=args.symbols.split(',') if args.symbols else None,
+        intervals=args.intervals.split(',') if args.intervals else None,
+        overwrite=args.overwrite
+    )
+
+    for key, days in sorted(summary['symbols'].items()):
+        print(f"  {key}: {days} day(s)")
+    if summary['failed']:
+        print(f"⚠️ {len(summary['failed'])} archive(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
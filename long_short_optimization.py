@@ -4,6 +4,10 @@ LONG & SHORT Optimization Analysis
 Comprehensive optimization analysis for both LONG and SHORT signals.
 Finds optimal trading patterns by day/hour/coin/month for each position type.
 Uses BacktestAnalyzer class to eliminate code duplication.
+
+    python long_short_optimization.py [results.csv]                 # pattern analysis
+    python long_short_optimization.py [results.csv] --sweep-sl-tp   # plus an SL/TP multiplier
+                                                                    # sweep on the cached 1m klines
 """
 
 import pandas as pd
@@ -20,6 +24,14 @@ if sys.platform == 'win32':
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from src.analytics.backtest_analyzer import BacktestAnalyzer
+from src.analytics.sl_tp_sweep import (
+    SlTpSweep, load_cached_klines, DEFAULT_SL_MULTIPLIERS, DEFAULT_TP_MULTIPLIERS
+)
+
+# --sweep-sl-tp adds an SL/TP multiplier sweep on the cached 1m klines
+SWEEP_SL_TP = '--sweep-sl-tp' in sys.argv
+SWEEP_LOOKFORWARD_HOURS = 72
+args = [arg for arg in sys.argv[1:] if arg != '--sweep-sl-tp']
 
 print("=" * 80)
 print("📊 LONG & SHORT OPTIMIZATION ANALYSIS")
@@ -29,9 +41,9 @@ print()
 # Find backtest file - either from command line argument or latest
 from pathlib import Path
 
-if len(sys.argv) > 1:
+if args:
     # Use specified file
-    backtest_file = Path(sys.argv[1])
+    backtest_file = Path(args[0])
     if not backtest_file.exists():
         print(f"❌ File not found: {backtest_file}")
         sys.exit(1)
@@ -90,8 +102,11 @@ print()
 long_df = analyzer.filter_by_action('LONG')
 short_df = analyzer.filter_by_action('SHORT')
 
-long_analyzer = BacktestAnalyzer(long_df) if len(long_df) > 0 else None
-short_analyzer = BacktestAnalyzer(short_df) if len(short_df) > 0 else None
+# Cached klines are only needed for the SL/TP sweep
+klines = load_cached_klines(df['symbol'].unique()) if SWEEP_SL_TP else None
+
+long_analyzer = BacktestAnalyzer(long_df, klines) if len(long_df) > 0 else None
+short_analyzer = BacktestAnalyzer(short_df, klines) if len(short_df) > 0 else None
 
 print("=" * 80)
 print("📈 LONG SIGNALS ANALYSIS (ACCURATE)")
@@ -381,6 +396,39 @@ if short_analyzer:
 
 print()
 
+# SL/TP multiplier sweep
+sl_tp_sweeps = {}
+if SWEEP_SL_TP:
+    print("=" * 80)
+    print("🎚️ SL/TP MULTIPLIER SWEEP (TARGET 1)")
+    print("=" * 80)
+    print("ℹ️  Only target1 is swept: each trade exits at the scaled target1 or stop loss")
+    print()
+
+    if not klines:
+        print("⚠️  No cached klines found - run full_backtest.py first")
+        print()
+
+    for side, side_analyzer in (('LONG', long_analyzer), ('SHORT', short_analyzer)):
+        if not klines or not side_analyzer:
+            continue
+        sweep = side_analyzer.sweep_sl_tp(DEFAULT_SL_MULTIPLIERS, DEFAULT_TP_MULTIPLIERS,
+                                          lookforward_hours=SWEEP_LOOKFORWARD_HOURS)
+        baseline = sweep[(sweep['sl_multiplier'] == 1) & (sweep['tp_multiplier'] == 1)].to_dict('records')[0]
+        best = SlTpSweep.best(sweep, metric='avg_pnl_pct', top=10)
+
+        print(f"{side}: {baseline['trades']} signals with cached klines ({SWEEP_LOOKFORWARD_HOURS}h window)")
+        print(f"   Signal levels (1.00x / 1.00x) | WR: {baseline['win_rate']:5.1f}% | "
+              f"Avg PnL: {baseline['avg_pnl_pct']:5.2f}% | PF: {baseline['profit_factor']:5.2f}")
+        for cell in best[:5]:
+            emoji = "🔥" if cell['avg_pnl_pct'] > baseline['avg_pnl_pct'] else "✅"
+            print(f"{emoji} SL {cell['sl_multiplier']:.2f}x / TP {cell['tp_multiplier']:.2f}x | "
+                  f"WR: {cell['win_rate']:5.1f}% | Avg PnL: {cell['avg_pnl_pct']:5.2f}% | "
+                  f"PF: {cell['profit_factor']:5.2f} | Avg Exit: {cell['avg_exit_minutes']:.0f} min")
+        print()
+
+        sl_tp_sweeps[side.lower()] = {'baseline': baseline, 'best': best}
+
 # Save results
 output = {
     'analysis_date': datetime.now().isoformat(),
@@ -406,15 +454,21 @@ output = {
     'filtered_short_wr': float(short_filtered_stats['win_rate']) if short_analyzer and short_filtered_analyzer else 0,
     'filtered_short_signals': short_filtered_stats['total'] if short_analyzer and short_filtered_analyzer else 0,
 }
+if SWEEP_SL_TP:
+    output['sl_tp_sweep'] = {
+        'target': 'target1',
+        'lookforward_hours': SWEEP_LOOKFORWARD_HOURS,
+        **sl_tp_sweeps
+    }
 
 # Create output filename based on input file
 output_dir = Path('data/analysis')
 output_dir.mkdir(parents=True, exist_ok=True)
 
 output_filename = 'long_short_optimization_results.json'
-if len(sys.argv) > 1:
+if args:
     # Extract base name from input file
-    input_base = Path(sys.argv[1]).stem.replace('_backtest_detailed', '')
+    input_base = Path(args[0]).stem.replace('_backtest_detailed', '')
     output_filename = f'long_short_optimization_{input_base}.json'
 
 output_path = output_dir / output_filename
@@ -1,27 +1,39 @@
 """
 SHORT Signal Optimization Analysis (Refactored)
 Uses shared BacktestAnalyzer to avoid code duplication
+
+    python short_optimization.py                 # day/hour/coin/month analysis
+    python short_optimization.py --sweep-sl-tp   # plus an SL/TP multiplier sweep
+                                                 # on the cached 1m klines
 """
 
 import json
 import sys
 from datetime import datetime
 from pathlib import Path
-from src.analytics import BacktestAnalyzer, load_latest_backtest
+from src.analytics import BacktestAnalyzer, SlTpSweep, load_latest_backtest, load_cached_klines
+from src.analytics.sl_tp_sweep import DEFAULT_SL_MULTIPLIERS, DEFAULT_TP_MULTIPLIERS
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# Add src to path (the SL/TP sweep reads the kline cache)
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+SWEEP_SL_TP = '--sweep-sl-tp' in sys.argv
+SWEEP_LOOKFORWARD_HOURS = 72
+
 # Load latest backtest results
 df = load_latest_backtest()
 
 # Filter for SHORT signals only
 short_df = df[df['action'] == 'SHORT'].copy()
 
-# Initialize analyzer
-analyzer = BacktestAnalyzer(short_df)
+# Initialize analyzer (with cached klines when sweeping SL/TP)
+klines = load_cached_klines(short_df['symbol'].unique()) if SWEEP_SL_TP else None
+analyzer = BacktestAnalyzer(short_df, klines)
 
 print("="*80)
 print("🔻 SHORT SIGNALS OPTIMIZATION ANALYSIS")
@@ -214,6 +226,41 @@ print(f"\n📆 Worst Months:")
 for month in worst_months:
     print(f"❌ {month['month']:9s}: {month['win_rate']:5.1f}% WR ({month['wins']}/{month['total']})")
 
+# ============================================================================
+# 8. SL/TP MULTIPLIER SWEEP (--sweep-sl-tp)
+# ============================================================================
+if SWEEP_SL_TP:
+    print("\n" + "="*80)
+    print("🎚️ SHORT SL/TP MULTIPLIER SWEEP (TARGET 1)")
+    print("="*80)
+
+    if not analyzer.klines:
+        print("⚠️ No cached klines found - run full_backtest.py first")
+    else:
+        sweep = analyzer.sweep_sl_tp(DEFAULT_SL_MULTIPLIERS, DEFAULT_TP_MULTIPLIERS,
+                                     lookforward_hours=SWEEP_LOOKFORWARD_HOURS)
+        baseline = sweep[(sweep['sl_multiplier'] == 1) & (sweep['tp_multiplier'] == 1)].to_dict('records')[0]
+        best = SlTpSweep.best(sweep, metric='avg_pnl_pct', top=10)
+
+        print(f"\n📊 {baseline['trades']} of {overall['total']} SHORT signals have cached klines "
+              f"({SWEEP_LOOKFORWARD_HOURS}h window)")
+        print("ℹ️ Only target1 is swept: each trade exits at the scaled target1 or stop loss")
+        print(f"\n📍 Signal levels (1.00x / 1.00x): {baseline['win_rate']:5.1f}% WR | "
+              f"Avg PnL: {baseline['avg_pnl_pct']:5.2f}% | PF: {baseline['profit_factor']:.2f}")
+        print(f"\n🏆 Best SL/TP multipliers by average PnL:")
+        for cell in best[:5]:
+            print(f"✅ SL {cell['sl_multiplier']:.2f}x / TP {cell['tp_multiplier']:.2f}x: "
+                  f"{cell['win_rate']:5.1f}% WR ({cell['wins']}/{cell['trades']}) | "
+                  f"Avg PnL: {cell['avg_pnl_pct']:5.2f}% | PF: {cell['profit_factor']:.2f} | "
+                  f"Avg Exit: {cell['avg_exit_minutes']:.0f} min")
+
+        analysis_results['sl_tp_sweep'] = {
+            'target': 'target1',
+            'lookforward_hours': SWEEP_LOOKFORWARD_HOURS,
+            'baseline': baseline,
+            'best': best
+        }
+
 # Save results
 output_dir = Path('data/analysis')
 output_dir.mkdir(parents=True, exist_ok=True)
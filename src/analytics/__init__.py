@@ -5,5 +5,7 @@ Provides backtest analysis utilities and tools.
 """
 
 from .backtest_analyzer import BacktestAnalyzer, load_latest_backtest
+from .sl_tp_sweep import SlTpSweep, load_cached_klines
+from .bootstrap import bootstrap_group_stats, wilson_interval
 
-__all__ = ['BacktestAnalyzer', 'load_latest_backtest']
\ No newline at end of file
+__all__ = ['BacktestAnalyzer', 'load_latest_backtest', 'SlTpSweep', 'load_cached_klines', 'bootstrap_group_stats', 'wilson_interval']
\ No newline at end of file
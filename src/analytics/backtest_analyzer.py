@@ -9,6 +9,8 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
+from .bootstrap import bootstrap_group_stats, wilson_interval
+
 
 class BacktestAnalyzer:
     """
@@ -16,15 +18,19 @@ class BacktestAnalyzer:
     Eliminates duplicate code across optimization and comparison scripts.
     """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, klines: Optional[Dict] = None):
         """
         Initialize analyzer with backtest results dataframe.
         
         Args:
             df: DataFrame with backtest results containing at least:
                 - signal_time, action, final_outcome, entry_price, target1
+            klines: Optional mapping of trading pair to a MappedKlines handle or CompactKlines
+                (e.g. from BinanceDataFetcher.get_mapped_klines), shared
+                with the outcome evaluator
         """
         self.df = df.copy()
+        self.klines = klines or {}
         self._prepare_dataframe()
     
     def _prepare_dataframe(self):
@@ -52,6 +58,115 @@ class BacktestAnalyzer:
             )
             self.df['is_loser'] = self.df['final_outcome'] == 'STOP_LOSS'
     
+    def get_price_window(
+        self,
+        symbol: str,
+        start_time: pd.Timestamp,
+        end_time: pd.Timestamp
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Get read-only (timestamps, high, low) views for a symbol and window.
+        
+        Args:
+            symbol: Coin or trading pair (USDT is appended if missing)
+            start_time: Inclusive window start
+            end_time: Inclusive window end
+            
+        Returns:
+            Tuple of array views, or None if no klines are attached
+        """
+        pair = symbol if symbol.endswith('USDT') else symbol + 'USDT'
+        handle = self.klines.get(pair)
+        if handle is None:
+            return None
+        
+        start_ms = pd.Timestamp(start_time).value // 1_000_000
+        end_ms = pd.Timestamp(end_time).value // 1_000_000
+        return handle.slice(start_ms, end_ms + 1)
+    
+    def get_window_excursions(
+        self,
+        lookforward_hours: float = 72,
+        df: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Highest high, lowest low and excursions over each signal's full window.
+
+        Uses the range index of each attached MappedKlines handle, so every
+        window costs two O(1) lookups instead of a scan over its candles.
+
+        Args:
+            lookforward_hours: Window length after each signal
+            df: DataFrame to analyze (uses self.df if None)
+
+        Returns:
+            DataFrame aligned with df with window_high, window_low,
+            max_favorable_pct and max_adverse_pct (NaN without klines)
+        """
+        if df is None:
+            df = self.df
+
+        result = pd.DataFrame(np.nan, index=df.index,
+                              columns=['window_high', 'window_low', 'max_favorable_pct', 'max_adverse_pct'])
+        signal_ns = pd.to_datetime(df['signal_time'], format='mixed', utc=True).dt.as_unit('ns').astype('int64')
+        # Ceil to whole milliseconds like the outcome engine
+        start_ms = -(-signal_ns // 1_000_000)
+        end_ms = signal_ns // 1_000_000 + int(lookforward_hours * 3_600_000)
+        pairs = df['symbol'].where(df['symbol'].str.endswith('USDT'), df['symbol'] + 'USDT')
+
+        for pair, rows in df.groupby(pairs).groups.items():
+            handle = self.klines.get(pair)
+            if handle is None:
+                continue
+
+            index = handle.range_index()
+            lo = np.searchsorted(handle.timestamps, start_ms[rows].to_numpy(), side='left')
+            hi = np.searchsorted(handle.timestamps, end_ms[rows].to_numpy(), side='right')
+            high = index.max_high(lo, hi)
+            low = index.min_low(lo, hi)
+            high[lo >= hi] = np.nan
+            low[lo >= hi] = np.nan
+
+            entry = df.loc[rows, 'entry_price'].to_numpy(dtype=np.float64)
+            long = (df.loc[rows, 'action'] == 'LONG').to_numpy()
+            up = (high - entry) / entry * 100
+            down = (low - entry) / entry * 100
+            result.loc[rows, 'window_high'] = high
+            result.loc[rows, 'window_low'] = low
+            result.loc[rows, 'max_favorable_pct'] = np.where(long, up, -down)
+            result.loc[rows, 'max_adverse_pct'] = np.where(long, down, -up)
+
+        return result
+
+    def sweep_sl_tp(
+        self,
+        sl_multipliers: List[float],
+        tp_multipliers: List[float],
+        lookforward_hours: float = 72,
+        target: str = 'target1',
+        df: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Evaluate a grid of SL/TP distance multipliers on the attached klines.
+        
+        Args:
+            sl_multipliers: Stop-loss distance multipliers (1.0 = signal's SL)
+            tp_multipliers: Take-profit distance multipliers (1.0 = signal's target)
+            lookforward_hours: Window length after each signal
+            target: Target column the TP multipliers apply to
+            df: DataFrame to analyze (uses self.df if None)
+            
+        Returns:
+            One row per multiplier pair (see SlTpSweep.run)
+        """
+        from .sl_tp_sweep import SlTpSweep
+        
+        if df is None:
+            df = self.df
+        
+        sweep = SlTpSweep.from_backtest(df, self.klines, lookforward_hours, target)
+        return sweep.run(sl_multipliers, tp_multipliers)
+    
     def filter_by_action(self, action: str) -> pd.DataFrame:
         """
         Filter dataframe by position type (LONG or SHORT).
@@ -123,6 +238,36 @@ class BacktestAnalyzer:
             'profit_factor': float(pf)
         }
     
+    def bootstrap_stats(
+        self,
+        by: Optional[List[str]] = None,
+        df: Optional[pd.DataFrame] = None,
+        n_resamples: int = 10000,
+        confidence: float = 0.95,
+        min_signals: int = 1,
+        workers: int = 1,
+        seed: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Get overall statistics with bootstrap confidence intervals per group.
+        
+        Args:
+            by: Column(s) to group on, e.g. ['day_name', 'hour'] (None for overall)
+            df: DataFrame to analyze (uses self.df if None)
+            n_resamples: Bootstrap resamples per group
+            confidence: Confidence level of the intervals
+            min_signals: Minimum signals required for inclusion
+            workers: Worker processes (1 = serial, 0 = all CPU cores)
+            seed: Seed for reproducible intervals
+            
+        Returns:
+            One row per group (see bootstrap.bootstrap_group_stats)
+        """
+        if df is None:
+            df = self.df
+        
+        return bootstrap_group_stats(df, by, n_resamples, confidence, min_signals, workers, seed)
+    
     def analyze_by_day_of_week(self, df: Optional[pd.DataFrame] = None) -> List[Dict]:
         """
         Analyze performance by day of week.
@@ -233,6 +378,9 @@ class BacktestAnalyzer:
         """
         Find 100% win rate combinations.
         
+        Each combination also gets win_rate_low, the lower bound of the
+        95% Wilson interval of its win rate (e.g. 51.0% for 4/4 wins).
+        
         Args:
             df: DataFrame to analyze (uses self.df if None)
             min_signals: Minimum signals for combination
@@ -257,7 +405,8 @@ class BacktestAnalyzer:
                             'hour': hour,
                             'signals': len(combo_data),
                             'wins': int(wins),
-                            'avg_profit': float(avg_profit)
+                            'avg_profit': float(avg_profit),
+                            'win_rate_low': float(wilson_interval(wins, len(combo_data))[0])
                         })
         
         # Day + Coin combinations
@@ -274,7 +423,8 @@ class BacktestAnalyzer:
                             'symbol': symbol,
                             'signals': len(combo_data),
                             'wins': int(wins),
-                            'avg_profit': float(avg_profit)
+                            'avg_profit': float(avg_profit),
+                            'win_rate_low': float(wilson_interval(wins, len(combo_data))[0])
                         })
         
         return day_hour_combos, day_coin_combos
@@ -0,0 +1,222 @@
+"""
+Bootstrap Confidence Intervals
+
+Resampling intervals for the per-group statistics of BacktestAnalyzer
+(win rate, average profit and profit factor as in get_overall_stats), so
+a 100% win rate over 4 signals is reported together with how little it
+says.
+
+Each group is reduced to four per-signal columns (win, winning profit,
+losing drawdown, winner with a profit). Missing excursions count as 0 in
+the sums and winners without one are left out of the average profit, as
+the NaN-skipping .mean()/.sum() of get_overall_stats do. A block of resamples is one index matrix
+rng.integers(0, n, (resamples, n)); gathering the columns through it and
+summing along the rows gives the wins, profit and loss of every resample
+at once. Blocks are capped at MAX_BLOCK_ELEMENTS indices, so large
+groups are split across several blocks, and the blocks are spread over
+a process pool. Every block seeds its own generator from (seed, group,
+first resample), so results do not depend on the number of workers.
+
+Percentile intervals collapse when every signal in a group has the same
+outcome (all resamples of 4/4 wins are 4/4 wins), so win rates also get
+a Wilson score interval, which stays wide for small groups.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
+from typing import List, Optional, Sequence, Tuple, Union
+
+# Largest resample index matrix (resamples x group size) drawn at once
+MAX_BLOCK_ELEMENTS = 2_000_000
+
+STATISTICS = ('win_rate', 'avg_profit', 'profit_factor')
+
+
+def wilson_interval(wins, total, confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wilson score interval of win rates
+
+    Args:
+        wins: Number of wins (scalar or array)
+        total: Number of signals (scalar or array)
+        confidence: Confidence level of the interval
+
+    Returns:
+        Tuple of (low, high) win rates in percent; (0, 100) for empty groups
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    wins = np.asarray(wins, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = wins / total
+        scale = 1 + z * z / total
+        center = (rate + z * z / (2 * total)) / scale
+        half = z * np.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / scale
+
+    low = np.where(total > 0, np.clip(center - half, 0, 1) * 100, 0.0)
+    high = np.where(total > 0, np.clip(center + half, 0, 1) * 100, 100.0)
+    return low, high
+
+
+def _signal_columns(df: pd.DataFrame) -> np.ndarray:
+    """
+    Per-signal columns summed by every resample, as an (n, 4) array
+
+    Win flag, profit if won, drawdown if lost and a flag for winners with
+    a profit. Missing profits and drawdowns are 0 in the sums, and the
+    last column keeps those winners out of the average profit.
+    """
+    win = df['is_winner'].to_numpy(dtype=bool)
+    loss = df['is_loser'].to_numpy(dtype=bool)
+    profit = df['max_profit_pct'].to_numpy(dtype=np.float64)
+    drawdown = df['max_drawdown_pct'].to_numpy(dtype=np.float64)
+    has_profit = win & ~np.isnan(profit)
+    return np.column_stack([win, np.where(has_profit, profit, 0.0),
+                            np.where(loss & ~np.isnan(drawdown), drawdown, 0.0), has_profit])
+
+
+def _statistics(sums: np.ndarray, total: int) -> np.ndarray:
+    """
+    Win rate, average profit and profit factor from column sums
+
+    Matches get_overall_stats: average profit is 0 without wins (NaN if
+    no winner has a profit) and the profit factor is inf without losses.
+    """
+    wins, profit, counted = sums[..., 0], sums[..., 1], sums[..., 3]
+    loss = np.abs(sums[..., 2])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = wins / total * 100
+        avg_profit = np.where(wins > 0, profit / counted, 0.0)
+        profit_factor = np.where(loss > 0, profit / loss, np.inf)
+    return np.stack([win_rate, avg_profit, profit_factor], axis=-1)
+
+
+def _resample_blocks(jobs: List[Tuple]) -> List[Tuple[int, int, np.ndarray]]:
+    """
+    Draw blocks of resamples (runs in worker processes)
+
+    Args:
+        jobs: (seed, group, start, count, columns) per block
+
+    Returns:
+        (group, start, sums) per block, sums being the (count, 4) column
+        sums of every resample
+    """
+    results = []
+    for seed, group, start, count, columns in jobs:
+        rng = np.random.default_rng([seed, group, start])
+        index = rng.integers(0, len(columns), size=(count, len(columns)))
+        sums = np.column_stack([columns[:, column].take(index).sum(axis=1)
+                                for column in range(columns.shape[1])])
+        results.append((group, start, sums))
+    return results
+
+
+def bootstrap_group_stats(
+    df: pd.DataFrame,
+    by: Union[str, Sequence[str], None] = None,
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    min_signals: int = 1,
+    workers: int = 1,
+    seed: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Point estimates and bootstrap intervals of every group's statistics
+
+    Args:
+        df: Prepared backtest results (BacktestAnalyzer.df or a filtered
+            copy) with is_winner, is_loser, max_profit_pct and max_drawdown_pct
+        by: Column(s) to group on (None = all signals as one group)
+        n_resamples: Bootstrap resamples per group
+        confidence: Confidence level of the intervals
+        min_signals: Minimum signals for a group to be included
+        workers: Worker processes (1 = serial, 0 = all CPU cores)
+        seed: Seed for reproducible intervals (None = random)
+
+    Returns:
+        One row per group (in order of first appearance) with the group
+        columns, total, wins, losses, each statistic with its _low/_high
+        percentile bounds, and win_rate_wilson_low/_high
+    """
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be positive, got {n_resamples}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+
+    keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+    if keys:
+        indices = df.groupby(keys, sort=False).indices
+    else:
+        indices = {(): np.arange(len(df))} if len(df) else {}
+    groups = sorted(((key, rows) for key, rows in indices.items() if len(rows) >= min_signals),
+                    key=lambda group: group[1][0])
+
+    if not groups:
+        return pd.DataFrame(columns=keys + ['total', 'wins', 'losses'])
+
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2**63)
+
+    columns = _signal_columns(df)
+    losers = df['is_loser'].to_numpy(dtype=bool)
+    jobs = []
+    remaining = []
+    for group, (_, rows) in enumerate(groups):
+        block = max(1, MAX_BLOCK_ELEMENTS // len(rows))
+        group_columns = columns[rows]
+        starts = range(0, n_resamples, block)
+        jobs.extend((seed, group, start, min(block, n_resamples - start), group_columns)
+                    for start in starts)
+        remaining.append(len(starts))
+
+    alpha = (1 - confidence) / 2
+    records = [None] * len(groups)
+    sums = {}
+
+    def finish(group: int):
+        """Build a group's record once all of its resamples are in"""
+        key, rows = groups[group]
+        total = len(rows)
+        point = _statistics(columns[rows].sum(axis=0), total)
+        # inverted_cdf picks resampled values without interpolating, so an
+        # infinite profit factor stays inf instead of turning into NaN
+        low, high = np.quantile(_statistics(sums.pop(group), total), [alpha, 1 - alpha],
+                                axis=0, method='inverted_cdf')
+
+        record = dict(zip(keys, key if isinstance(key, tuple) else (key,)))
+        wins = int(columns[rows, 0].sum())
+        record.update({'total': total, 'wins': wins, 'losses': int(losers[rows].sum())})
+        for position, name in enumerate(STATISTICS):
+            record[name] = float(point[position])
+            record[f'{name}_low'] = float(low[position])
+            record[f'{name}_high'] = float(high[position])
+        wilson_low, wilson_high = wilson_interval(wins, total, confidence)
+        record['win_rate_wilson_low'] = float(wilson_low)
+        record['win_rate_wilson_high'] = float(wilson_high)
+        records[group] = record
+
+    def collect(blocks: List[Tuple[int, int, np.ndarray]]):
+        for group, start, block_sums in blocks:
+            if group not in sums:
+                sums[group] = np.empty((n_resamples, columns.shape[1]))
+            sums[group][start:start + len(block_sums)] = block_sums
+            remaining[group] -= 1
+            if remaining[group] == 0:
+                finish(group)
+
+    if workers == 1:
+        collect(_resample_blocks(jobs))
+    else:
+        # A few chunks per worker, interleaved so large groups' blocks spread out
+        chunk_count = min(len(jobs), (workers or os.cpu_count()) * 4)
+        with ProcessPoolExecutor(max_workers=workers or None) as executor:
+            futures = [executor.submit(_resample_blocks, jobs[i::chunk_count]) for i in range(chunk_count)]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    return pd.DataFrame(records)
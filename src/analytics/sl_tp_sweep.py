@@ -0,0 +1,297 @@
+"""
+Stop-Loss / Take-Profit Parameter Sweep
+
+Evaluates a grid of SL and TP multipliers for every signal without
+touching klines again. For each signal the running extremes of its
+lookforward window are precomputed once:
+
+    up[i]   = max(high[0..i])      (np.maximum.accumulate)
+    down[i] = max(-low[0..i])      (i.e. minus the running min of lows)
+
+Both arrays are non-decreasing, so the first candle at which any price
+level is crossed is a single np.searchsorted lookup. A whole grid of
+scaled levels is resolved per signal with two vectorized lookups.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Default grid of the optimization scripts' --sweep-sl-tp section
+DEFAULT_SL_MULTIPLIERS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+DEFAULT_TP_MULTIPLIERS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 3.0)
+
+
+def load_cached_klines(symbols: Iterable[str], cache_dir: str = "data/cache/klines",
+                       interval: str = "1m") -> Dict:
+    """
+    Memory-map the cached klines of the given coins for a sweep
+
+    Reads only what full_backtest.py already cached; nothing is fetched.
+
+    Args:
+        symbols: Coins or trading pairs (USDT is appended if missing)
+        cache_dir: Kline store directory
+        interval: Kline interval
+
+    Returns:
+        Mapping of trading pair to MappedKlines for pairs with cached klines
+    """
+    # Needs src on sys.path, like the scripts that run full_backtest.py
+    from data.kline_store import KlineStore
+
+    store = KlineStore(cache_dir)
+    klines = {}
+    for symbol in symbols:
+        pair = symbol if symbol.endswith('USDT') else symbol + 'USDT'
+        if pair not in klines:
+            handle = store.open_mapped(pair, interval)
+            if handle is not None:
+                klines[pair] = handle
+    return klines
+
+
+class SlTpSweep:
+    """
+    Grid search over SL/TP distance multipliers on precomputed excursions
+
+    Multipliers scale the distance from entry: an SL multiplier of 1.5
+    puts the stop 1.5x further from entry than the signal's stop loss,
+    and a TP multiplier of 0.8 puts the target 0.8x as far as the
+    signal's target. As in the outcome engine, a candle that touches
+    both levels counts as a stop-loss.
+    """
+
+    def __init__(self, target: str = 'target1'):
+        """
+        Initialize an empty sweep
+
+        Args:
+            target: Signal target level the TP multipliers apply to
+        """
+        self.target = target
+        self.paths = []
+        self.skipped = 0
+
+    @staticmethod
+    def _window_start_ms(signal_time: pd.Timestamp) -> int:
+        """First candle open time that counts for a signal (whole ms, rounded up)"""
+        return -(-pd.Timestamp(signal_time).value // 1_000_000)
+
+    def add_signal(self, signal_time, action: str, entry_price: float,
+                   stop_loss: float, target_price: float,
+                   timestamps_ms: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                   signal_id=None) -> bool:
+        """
+        Precompute the running excursions of one signal
+
+        Args:
+            signal_time: Signal timestamp (tz-aware or UTC)
+            action: 'LONG' or 'SHORT'
+            entry_price: Entry price
+            stop_loss: Signal stop-loss price
+            target_price: Signal target price the TP multipliers scale
+            timestamps_ms: Candle open times of the lookforward window
+            highs: Candle highs aligned with timestamps_ms
+            lows: Candle lows aligned with timestamps_ms
+            signal_id: Optional identifier kept with the path
+
+        Returns:
+            True if the signal was added, False if it lacks levels or candles
+        """
+        levels = (entry_price, stop_loss, target_price)
+        if any(level is None or pd.isna(level) or not level for level in levels) or len(timestamps_ms) == 0:
+            self.skipped += 1
+            return False
+
+        highs = np.nan_to_num(np.asarray(highs, dtype=np.float64), nan=-np.inf)
+        lows = np.nan_to_num(np.asarray(lows, dtype=np.float64), nan=np.inf)
+
+        self.paths.append({
+            'signal_id': signal_id,
+            'long': action == 'LONG',
+            'entry': float(entry_price),
+            'stop_loss': float(stop_loss),
+            'target': float(target_price),
+            'start_ms': pd.Timestamp(signal_time).value / 1_000_000,
+            'timestamps': np.asarray(timestamps_ms),
+            'up': np.maximum.accumulate(highs),
+            'down': np.maximum.accumulate(-lows)
+        })
+        return True
+
+    @classmethod
+    def from_backtest(cls, df: pd.DataFrame, klines: Dict, lookforward_hours: float = 72,
+                      target: str = 'target1') -> 'SlTpSweep':
+        """
+        Build a sweep from backtest results and memory-mapped klines
+
+        Args:
+            df: Backtest results with signal_time, symbol, action, entry_price,
+                stop_loss and the target column
+            klines: Mapping of trading pair to MappedKlines or CompactKlines
+                (e.g. from BinanceDataFetcher.get_mapped_klines)
+            lookforward_hours: Window length after each signal
+            target: Target column the TP multipliers apply to
+
+        Returns:
+            SlTpSweep with one path per usable signal
+        """
+        sweep = cls(target=target)
+        window_ms = int(lookforward_hours * 3_600_000)
+        signal_times = pd.to_datetime(df['signal_time'], format='mixed', utc=True)
+
+        for signal_time, (_, row) in zip(signal_times, df.iterrows()):
+            symbol = row['symbol']
+            pair = symbol if symbol.endswith('USDT') else symbol + 'USDT'
+            handle = klines.get(pair)
+            if handle is None:
+                sweep.skipped += 1
+                continue
+
+            start_ms = cls._window_start_ms(signal_time)
+            end_ms = signal_time.value // 1_000_000 + window_ms
+            timestamps_ms, highs, lows = handle.slice(start_ms, end_ms + 1)
+            sweep.add_signal(signal_time, row['action'], row['entry_price'], row['stop_loss'],
+                             row[target], timestamps_ms, highs, lows,
+                             signal_id=row.get('signal_id'))
+
+        return sweep
+
+    def _first_crossings(self, path: Dict, sl_multipliers: np.ndarray,
+                         tp_multipliers: np.ndarray):
+        """Index of the first candle reaching each scaled SL and TP level (len if never)"""
+        entry = path['entry']
+        sl_prices = np.where(sl_multipliers == 1, path['stop_loss'],
+                             entry + sl_multipliers * (path['stop_loss'] - entry))
+        tp_prices = np.where(tp_multipliers == 1, path['target'],
+                             entry + tp_multipliers * (path['target'] - entry))
+
+        if path['long']:
+            # high >= TP, low <= SL
+            tp_index = np.searchsorted(path['up'], tp_prices, side='left')
+            sl_index = np.searchsorted(path['down'], -sl_prices, side='left')
+        else:
+            # low <= TP, high >= SL
+            tp_index = np.searchsorted(path['down'], -tp_prices, side='left')
+            sl_index = np.searchsorted(path['up'], sl_prices, side='left')
+
+        sl_pct = np.abs(sl_prices - entry) / entry * 100
+        tp_pct = np.abs(tp_prices - entry) / entry * 100
+        return sl_index, tp_index, sl_pct, tp_pct
+
+    def signal_outcomes(self, sl_multiplier: float = 1.0, tp_multiplier: float = 1.0) -> pd.DataFrame:
+        """
+        Outcome of every signal for one SL/TP multiplier pair
+
+        Returns:
+            DataFrame with signal_id, outcome ('TARGET', 'STOP_LOSS' or
+            'ONGOING'), pnl_pct and exit_minutes per signal
+        """
+        rows = []
+        sl_mults = np.array([sl_multiplier], dtype=np.float64)
+        tp_mults = np.array([tp_multiplier], dtype=np.float64)
+
+        for path in self.paths:
+            n = len(path['up'])
+            sl_index, tp_index, sl_pct, tp_pct = self._first_crossings(path, sl_mults, tp_mults)
+            sl_i, tp_i = int(sl_index[0]), int(tp_index[0])
+
+            if sl_i < n and sl_i <= tp_i:
+                outcome, pnl, exit_index = 'STOP_LOSS', -sl_pct[0], sl_i
+            elif tp_i < n:
+                outcome, pnl, exit_index = 'TARGET', tp_pct[0], tp_i
+            else:
+                outcome, pnl, exit_index = 'ONGOING', 0.0, None
+
+            exit_minutes = None
+            if exit_index is not None:
+                exit_minutes = (path['timestamps'][exit_index] - path['start_ms']) / 60_000
+
+            rows.append({
+                'signal_id': path['signal_id'],
+                'outcome': outcome,
+                'pnl_pct': float(pnl),
+                'exit_minutes': exit_minutes
+            })
+
+        return pd.DataFrame(rows)
+
+    def run(self, sl_multipliers: Sequence[float], tp_multipliers: Sequence[float]) -> pd.DataFrame:
+        """
+        Evaluate every SL/TP multiplier combination on all signals
+
+        Args:
+            sl_multipliers: Stop-loss distance multipliers
+            tp_multipliers: Take-profit distance multipliers
+
+        Returns:
+            DataFrame with one row per (sl_multiplier, tp_multiplier) and
+            columns trades, wins, losses, ongoing, win_rate, avg_pnl_pct,
+            total_pnl_pct, profit_factor and avg_exit_minutes
+        """
+        sl_mults = np.asarray(sl_multipliers, dtype=np.float64)
+        tp_mults = np.asarray(tp_multipliers, dtype=np.float64)
+        shape = (len(sl_mults), len(tp_mults))
+
+        wins = np.zeros(shape, dtype=np.int64)
+        losses = np.zeros(shape, dtype=np.int64)
+        gross_profit = np.zeros(shape)
+        gross_loss = np.zeros(shape)
+        exit_minutes = np.zeros(shape)
+
+        for path in self.paths:
+            n = len(path['up'])
+            sl_index, tp_index, sl_pct, tp_pct = self._first_crossings(path, sl_mults, tp_mults)
+
+            sl_grid = sl_index[:, None]
+            tp_grid = tp_index[None, :]
+            loss = (sl_grid < n) & (sl_grid <= tp_grid)
+            win = (tp_grid < n) & ~loss
+
+            wins += win
+            losses += loss
+            gross_profit += np.where(win, tp_pct[None, :], 0.0)
+            gross_loss += np.where(loss, sl_pct[:, None], 0.0)
+
+            exit_index = np.minimum(np.minimum(sl_grid, tp_grid), n - 1)
+            minutes = (path['timestamps'][exit_index] - path['start_ms']) / 60_000
+            exit_minutes += np.where(win | loss, minutes, 0.0)
+
+        trades = len(self.paths)
+        closed = wins + losses
+        win_rate = wins / trades * 100 if trades else np.zeros(shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.inf)
+            avg_exit = np.where(closed > 0, exit_minutes / np.maximum(closed, 1), 0.0)
+        total_pnl = gross_profit - gross_loss
+
+        sl_grid, tp_grid = np.meshgrid(sl_mults, tp_mults, indexing='ij')
+        return pd.DataFrame({
+            'sl_multiplier': sl_grid.ravel(),
+            'tp_multiplier': tp_grid.ravel(),
+            'trades': trades,
+            'wins': wins.ravel(),
+            'losses': losses.ravel(),
+            'ongoing': (trades - closed).ravel(),
+            'win_rate': win_rate.ravel(),
+            'avg_pnl_pct': (total_pnl / max(trades, 1)).ravel(),
+            'total_pnl_pct': total_pnl.ravel(),
+            'profit_factor': profit_factor.ravel(),
+            'avg_exit_minutes': avg_exit.ravel()
+        })
+
+    @staticmethod
+    def best(results: pd.DataFrame, metric: str = 'avg_pnl_pct', top: int = 10) -> List[Dict]:
+        """
+        Best grid cells by a metric
+
+        Args:
+            results: Output of run()
+            metric: Column to rank by
+            top: Number of cells to return
+
+        Returns:
+            List of row dictionaries, best first
+        """
+        return results.sort_values(metric, ascending=False).head(top).to_dict('records')
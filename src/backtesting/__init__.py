@@ -1,5 +1,8 @@
 """Backtesting package"""
 
 from .engine import BacktestEngine
+from .performance import performance_report
+from .portfolio import PortfolioSimulator, load_backtesting_config
 
-__all__ = ['BacktestEngine']
\ No newline at end of file
+__all__ = ['BacktestEngine', 'PortfolioSimulator', 'load_backtesting_config',
+           'performance_report']
\ No newline at end of file
@@ -8,6 +8,7 @@ from typing import List, Dict, Any
 import pandas as pd
 from datetime import datetime
 from ..parsers.base_parser import Signal
+from .performance import performance_report
 
 
 class BacktestEngine:
@@ -149,18 +150,8 @@ class BacktestEngine:
         if not self.trade_history:
             return {'total_trades': 0, 'total_pnl': 0, 'win_rate': 0}
         
-        total_pnl = sum(trade['pnl'] for trade in self.trade_history)
-        winning_trades = [trade for trade in self.trade_history if trade['pnl'] > 0]
-        
-        metrics = {
-            'total_trades': len(self.trade_history),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(self.trade_history) - len(winning_trades),
-            'win_rate': len(winning_trades) / len(self.trade_history) * 100,
-            'total_pnl': total_pnl,
-            'total_return': (total_pnl / self.initial_capital) * 100,
-            'current_capital': self.current_capital,
-            'open_positions': len(self.positions)
-        }
+        metrics = performance_report(pd.DataFrame(self.trade_history), self.initial_capital)
+        metrics['current_capital'] = self.current_capital
+        metrics['open_positions'] = len(self.positions)
         
         return metrics
\ No newline at end of file
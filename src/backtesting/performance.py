@@ -0,0 +1,258 @@
+"""
+Performance Metrics
+
+Array-based performance statistics of a trades table (one row per closed
+trade, e.g. PortfolioSimulator.trades or a DataFrame of
+BacktestEngine.trade_history). Every metric is a NumPy/pandas vector
+operation over all trades, so reports over tens of thousands of trades
+do not loop in Python.
+
+A trades table needs entry_time, exit_time and either a realized pnl
+column or entry_price, exit_price and size (plus action for shorts).
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict
+
+# Crypto markets trade every day of the year
+PERIODS_PER_YEAR = 365
+
+NS_PER_HOUR = 3_600_000_000_000
+
+
+def _epoch_ns(values: pd.Series) -> np.ndarray:
+    """Times (naive = UTC) as int64 ns"""
+    return pd.DatetimeIndex(pd.to_datetime(values, utc=True)).as_unit('ns').asi8
+
+
+def trade_pnl(trades: pd.DataFrame, commission: float = 0.0) -> np.ndarray:
+    """
+    Realized P&L per trade
+
+    Args:
+        trades: Trades table
+        commission: Fee per fill as a fraction of notional, only applied
+                    when P&L is derived from prices (a pnl column is
+                    taken as already net of fees)
+
+    Returns:
+        P&L of every trade, aligned with the table rows
+    """
+    if 'pnl' in trades:
+        return trades['pnl'].to_numpy(dtype=np.float64)
+
+    entry = trades['entry_price'].to_numpy(dtype=np.float64)
+    exit_ = trades['exit_price'].to_numpy(dtype=np.float64)
+    size = trades['size'].to_numpy(dtype=np.float64)
+    direction = 1.0
+    if 'action' in trades:
+        direction = np.where(trades['action'].astype(str).str.upper().isin(['SHORT', 'SELL']), -1.0, 1.0)
+    return size * (exit_ - entry) * direction - size * (entry + exit_) * commission
+
+
+def equity_curve(trades: pd.DataFrame, initial_capital: float = 10000,
+                 commission: float = 0.0) -> pd.Series:
+    """
+    Realized equity after every trade exit
+
+    The curve starts with initial_capital at the first entry time and
+    adds each trade's P&L at its exit time.
+
+    Args:
+        trades: Trades table
+        initial_capital: Starting account balance
+        commission: See trade_pnl
+
+    Returns:
+        Equity indexed by time (UTC)
+    """
+    if len(trades) == 0:
+        return pd.Series(dtype=np.float64, index=pd.DatetimeIndex([], tz='UTC'))
+
+    pnl = trade_pnl(trades, commission)
+    exit_ns = _epoch_ns(trades['exit_time'])
+    order = np.argsort(exit_ns, kind='stable')
+    times = np.r_[_epoch_ns(trades['entry_time']).min(), exit_ns[order]]
+    equity = initial_capital + np.r_[0.0, np.cumsum(pnl[order])]
+    return pd.Series(equity, index=pd.to_datetime(times, unit='ns', utc=True), name='equity')
+
+
+def drawdown_frame(equity: pd.Series) -> pd.DataFrame:
+    """
+    Running peak and drawdown of an equity curve
+
+    Args:
+        equity: Equity indexed by time
+
+    Returns:
+        DataFrame with equity, peak, drawdown (currency) and drawdown_pct
+    """
+    values = equity.to_numpy(dtype=np.float64)
+    peak = np.maximum.accumulate(values) if len(values) else values
+    return pd.DataFrame({
+        'equity': values,
+        'peak': peak,
+        'drawdown': values - peak,
+        'drawdown_pct': (values / peak - 1) * 100 if len(values) else values
+    }, index=equity.index)
+
+
+def time_under_water(equity: pd.Series) -> Dict[str, float]:
+    """
+    Durations the curve spent below a previous peak
+
+    A period under water runs from a peak to the first point that is back
+    at or above it (or to the end of the curve, if it never recovers).
+
+    Args:
+        equity: Equity indexed by time
+
+    Returns:
+        Dictionary with the longest and current period (hours), the number
+        of periods and the share of the curve's span spent under water
+    """
+    result = {'max_underwater_hours': 0.0, 'current_underwater_hours': 0.0,
+              'underwater_periods': 0, 'underwater_time_pct': 0.0}
+    if len(equity) < 2:
+        return result
+
+    values = equity.to_numpy(dtype=np.float64)
+    times = equity.index.as_unit('ns').asi8
+    at_peak = values >= np.maximum.accumulate(values)
+
+    # Each peak opens a group that lasts until the next peak
+    group = np.cumsum(at_peak) - 1
+    peak_times = times[at_peak]
+    group_end = np.r_[peak_times[1:], times[-1]]
+    underwater = np.bincount(group, weights=~at_peak * 1.0, minlength=len(peak_times)) > 0
+    durations = (group_end - peak_times)[underwater] / NS_PER_HOUR
+
+    span = times[-1] - times[0]
+    result.update({
+        'max_underwater_hours': float(durations.max()) if len(durations) else 0.0,
+        'current_underwater_hours': float(durations[-1]) if underwater[-1] else 0.0,
+        'underwater_periods': int(underwater.sum()),
+        'underwater_time_pct': float(durations.sum() * NS_PER_HOUR / span * 100) if span else 0.0
+    })
+    return result
+
+
+def daily_returns(equity: pd.Series) -> pd.Series:
+    """
+    Daily returns of an equity curve
+
+    Days without exits carry the previous day's equity, i.e. a 0% return.
+
+    Args:
+        equity: Equity indexed by time, starting with the initial capital
+
+    Returns:
+        Return of every calendar day (UTC) from the first to the last point
+    """
+    if len(equity) < 2:
+        return pd.Series(dtype=np.float64)
+
+    daily = equity.resample('1D').last().ffill()
+    previous = np.r_[equity.iloc[0], daily.to_numpy()[:-1]]
+    return pd.Series(daily.to_numpy() / previous - 1, index=daily.index, name='return')
+
+
+def sharpe_ratio(returns: pd.Series, periods_per_year: int = PERIODS_PER_YEAR) -> float:
+    """Annualized Sharpe ratio of periodic returns (zero risk-free rate)"""
+    values = returns.to_numpy(dtype=np.float64)
+    if len(values) < 2:
+        return 0.0
+    std = values.std(ddof=1)
+    return float(values.mean() / std * np.sqrt(periods_per_year)) if std > 0 else 0.0
+
+
+def sortino_ratio(returns: pd.Series, periods_per_year: int = PERIODS_PER_YEAR) -> float:
+    """Annualized Sortino ratio of periodic returns (downside deviation below 0)"""
+    values = returns.to_numpy(dtype=np.float64)
+    if len(values) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(values, 0) ** 2))
+    if downside == 0:
+        return float('inf') if values.mean() > 0 else 0.0
+    return float(values.mean() / downside * np.sqrt(periods_per_year))
+
+
+def exposure(trades: pd.DataFrame) -> Dict[str, float]:
+    """
+    How much of the time the account held positions
+
+    Args:
+        trades: Trades table
+
+    Returns:
+        Dictionary with the share of time with at least one open position,
+        the average number of open positions and the average holding time
+    """
+    result = {'exposure_pct': 0.0, 'avg_open_positions': 0.0, 'avg_holding_hours': 0.0}
+    if len(trades) == 0:
+        return result
+
+    entry_ns = _epoch_ns(trades['entry_time'])
+    exit_ns = np.maximum(_epoch_ns(trades['exit_time']), entry_ns)
+    order = np.argsort(entry_ns, kind='stable')
+    entry_ns, exit_ns = entry_ns[order], exit_ns[order]
+
+    # Union of the holding intervals: a block starts where an entry comes
+    # after every earlier exit
+    reach = np.maximum.accumulate(exit_ns)
+    starts = np.r_[True, entry_ns[1:] > reach[:-1]]
+    block_start = entry_ns[starts]
+    block_end = reach[np.r_[np.flatnonzero(starts)[1:] - 1, len(reach) - 1]]
+
+    span = reach[-1] - entry_ns[0]
+    held = exit_ns - entry_ns
+    if span > 0:
+        result['exposure_pct'] = float((block_end - block_start).sum() / span * 100)
+        result['avg_open_positions'] = float(held.sum() / span)
+    result['avg_holding_hours'] = float(held.mean() / NS_PER_HOUR)
+    return result
+
+
+def performance_report(trades: pd.DataFrame, initial_capital: float = 10000,
+                       commission: float = 0.0) -> Dict[str, Any]:
+    """
+    All performance metrics of a trades table
+
+    Args:
+        trades: Trades table
+        initial_capital: Starting account balance
+        commission: See trade_pnl
+
+    Returns:
+        Dictionary of trade, equity, drawdown, risk-adjusted and exposure metrics
+    """
+    pnl = trade_pnl(trades, commission) if len(trades) else np.empty(0)
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+
+    equity = equity_curve(trades, initial_capital, commission)
+    drawdowns = drawdown_frame(equity)
+    returns = daily_returns(equity)
+
+    report = {
+        'total_trades': len(pnl),
+        'winning_trades': len(wins),
+        'losing_trades': len(pnl) - len(wins),
+        'win_rate': len(wins) / len(pnl) * 100 if len(pnl) else 0,
+        'total_pnl': float(pnl.sum()),
+        'total_return': float(pnl.sum()) / initial_capital * 100,
+        'avg_trade_pnl': float(pnl.mean()) if len(pnl) else 0,
+        'avg_win': float(wins.mean()) if len(wins) else 0,
+        'avg_loss': float(losses.mean()) if len(losses) else 0,
+        'profit_factor': float(wins.sum() / -losses.sum()) if len(losses) else float('inf') if len(wins) else 0.0,
+        'final_equity': initial_capital + float(pnl.sum()),
+        'max_drawdown': float(drawdowns['drawdown'].min()) if len(drawdowns) else 0.0,
+        'max_drawdown_pct': float(drawdowns['drawdown_pct'].min()) if len(drawdowns) else 0.0,
+        'sharpe_ratio': sharpe_ratio(returns),
+        'sortino_ratio': sortino_ratio(returns),
+        'trading_days': len(returns)
+    }
+    report.update(time_under_water(equity))
+    report.update(exposure(trades))
+    return report
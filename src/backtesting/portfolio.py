@@ -0,0 +1,319 @@
+"""
+Portfolio Simulator
+
+Replays evaluated signal outcomes as one account instead of scoring
+every signal on its own. Entry events (signal time) and exit events (the
+time the outcome engine closed the trade) of all signals are merged in
+time order, so positions compete for slots and capital, and every closed
+trade changes the size of the next one. Entries are replayed from one
+sorted array and the exits of open positions wait in a heap, which never
+holds more than max_positions events.
+
+Settings come from the "backtesting" block of the config file:
+initial_capital, commission, slippage, risk_per_trade, max_positions.
+"""
+
+import os
+import json
+import heapq
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Union
+
+from ..data.outcome_engine import TARGET_LEVELS
+from ..data.result_sinks import TIME_COLUMNS
+from .engine import BacktestEngine
+from .performance import performance_report
+
+# Outcome fields the simulation reads
+OUTCOME_COLUMNS = ('signal_id', 'symbol', 'action', 'entry_price', 'stop_loss',
+                   'final_outcome') + TARGET_LEVELS + tuple(sorted(TIME_COLUMNS))
+
+# Sentinel entry time after every real event
+END_NS = np.iinfo(np.int64).max
+
+
+def _to_epoch_ns(values) -> np.ndarray:
+    """Timestamps (Timestamp objects or ISO strings, naive = UTC) as int64 ns, NaT as -1"""
+    try:
+        times = pd.DatetimeIndex(values)
+    except (TypeError, ValueError):
+        # Mixed formats or offsets; much slower than the direct conversion
+        times = pd.DatetimeIndex(pd.to_datetime(values, utc=True, errors='coerce', format='mixed'))
+    if times.tz is None:
+        times = times.tz_localize('UTC')
+    epoch_ns = times.as_unit('ns').asi8.copy()
+    epoch_ns[times.isna()] = -1
+    return epoch_ns
+
+
+def _to_float(values: np.ndarray) -> np.ndarray:
+    return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _outcome_columns(outcomes: Union[List[Dict], pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """
+    Arrays of the OUTCOME_COLUMNS (None where a column is missing), with
+    the TIME_COLUMNS as epoch ns
+    """
+    columns = {}
+    for name in OUTCOME_COLUMNS:
+        if isinstance(outcomes, pd.DataFrame):
+            values = outcomes[name] if name in outcomes else np.full(len(outcomes), None, dtype=object)
+        else:
+            values = np.empty(len(outcomes), dtype=object)
+            values[:] = [outcome.get(name) for outcome in outcomes]
+        if name in TIME_COLUMNS:
+            columns[name] = _to_epoch_ns(values)
+        else:
+            columns[name] = np.asarray(values, dtype=object)
+    return columns
+
+
+def load_backtesting_config(config_path: str = "config/config.json") -> Dict[str, Any]:
+    """
+    Load the "backtesting" block of the config file
+
+    Falls back to config.template.json next to the given path when the
+    config file does not exist.
+
+    Args:
+        config_path: Path to configuration file
+
+    Returns:
+        Backtesting settings (empty if neither file exists)
+    """
+    if not os.path.exists(config_path):
+        config_path = os.path.join(os.path.dirname(config_path), "config.template.json")
+        if not os.path.exists(config_path):
+            return {}
+    with open(config_path, 'r') as f:
+        return json.load(f).get('backtesting', {})
+
+
+class PortfolioSimulator(BacktestEngine):
+    """
+    Event-driven simulation of one account trading every evaluated signal
+
+    Closed trades of a run are kept as a DataFrame in self.trades
+    (instead of the engine's per-trade trade_history dicts).
+    """
+
+    def __init__(self, initial_capital: float = 10000, commission: float = 0.001,
+                 slippage: float = 0.0005, risk_per_trade: float = 0.02,
+                 max_positions: int = 5):
+        """
+        Initialize the simulator
+
+        Args:
+            initial_capital: Starting account balance
+            commission: Fee per fill as a fraction of notional
+            slippage: Adverse price move per fill as a fraction of price
+            risk_per_trade: Fraction of equity lost if a trade hits its stop loss
+            max_positions: Maximum number of positions open at the same time
+        """
+        super().__init__(initial_capital, commission)
+        self.slippage = slippage
+        self.risk_per_trade = risk_per_trade
+        self.max_positions = max_positions
+        self.equity_curve = []
+        self.trades = pd.DataFrame()
+        self.skipped = {}
+
+    @classmethod
+    def from_config(cls, config_path: str = "config/config.json") -> 'PortfolioSimulator':
+        """Create a simulator from the "backtesting" block of the config file"""
+        settings = load_backtesting_config(config_path)
+        keys = ('initial_capital', 'commission', 'slippage', 'risk_per_trade', 'max_positions')
+        return cls(**{key: settings[key] for key in keys if key in settings})
+
+    def _reset(self):
+        self.current_capital = self.initial_capital
+        self.positions = {}
+        self.trades = pd.DataFrame()
+        self.equity_curve = []
+        self.skipped = {'no_data': 0, 'no_stop_loss': 0, 'max_positions': 0,
+                        'insufficient_capital': 0}
+
+    def _prepare(self, outcomes: Union[List[Dict], pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """
+        Column arrays of the tradable signals
+
+        A closed trade exits at the level it hit (stop loss or its final
+        target). A signal still ONGOING at the end of its lookforward
+        window is closed at its last candle at the entry price, since the
+        outcome carries no closing price.
+        """
+        columns = _outcome_columns(outcomes)
+        final = columns['final_outcome']
+
+        tradable = pd.Series(final).isin(['STOP_LOSS', 'TARGET1', 'TARGET2', 'TARGET3', 'ONGOING']).to_numpy()
+        self.skipped['no_data'] += int((~tradable).sum())
+
+        entry = _to_float(columns['entry_price'])
+        stop = _to_float(columns['stop_loss'])
+        has_stop = np.isfinite(stop) & (stop > 0) & (stop != entry) & np.isfinite(entry) & (entry > 0)
+        self.skipped['no_stop_loss'] += int((tradable & ~has_stop).sum())
+
+        exit_price = entry.copy()
+        exit_ns = columns['last_candle_time'].copy()
+        for name in ('stop_loss',) + TARGET_LEVELS:
+            hit = final == name.upper()
+            if hit.any():
+                exit_price[hit] = _to_float(columns[name][hit])
+                exit_ns[hit] = columns[f'{name}_time'][hit]
+
+        entry_ns = columns['signal_time']
+        valid = tradable & has_stop & (entry_ns >= 0) & (exit_ns >= 0) & np.isfinite(exit_price)
+        self.skipped['no_data'] += int((tradable & has_stop & ~valid).sum())
+
+        rows = np.flatnonzero(valid)
+        direction = np.where(pd.Series(columns['action']).astype(str).str.upper()
+                             .isin(['SHORT', 'SELL']).to_numpy(), -1.0, 1.0)
+        return {
+            'rows': rows[np.argsort(entry_ns[rows], kind='stable')],
+            'entry_ns': entry_ns,
+            'exit_ns': np.maximum(exit_ns, entry_ns),
+            'entry': entry,
+            'stop': stop,
+            'exit_price': exit_price,
+            'direction': direction,
+            'outcome': final,
+            'signal_id': columns['signal_id'],
+            'symbol': columns['symbol'],
+        }
+
+    def run(self, outcomes: Union[List[Dict], pd.DataFrame]) -> Dict[str, Any]:
+        """
+        Simulate the account over all signal outcomes
+
+        Position size risks risk_per_trade of the current equity between
+        the filled entry and the stop loss, capped at an equal share
+        (equity / max_positions) and by the free cash, so there is no
+        leverage. Signals arriving while max_positions are open, or with
+        no cash left, are skipped. Equity is marked at cost while
+        positions are open.
+
+        Args:
+            outcomes: Outcome dictionaries (check_signal_outcomes) or a
+                      detailed results DataFrame/CSV frame
+
+        Returns:
+            Dictionary with the summary metrics, trades and equity curve
+        """
+        self._reset()
+        data = self._prepare(outcomes)
+        # Plain lists: per-event access to numpy scalars would dominate the loop
+        exit_ns = data['exit_ns'].tolist()
+        entry_price = data['entry'].tolist()
+        stop_price = data['stop'].tolist()
+        exit_price = data['exit_price'].tolist()
+        direction = data['direction'].tolist()
+        slippage = self.slippage
+        commission = self.commission
+        risk_per_trade = self.risk_per_trade
+        max_positions = self.max_positions
+
+        rows = data['rows']
+        entries = zip(data['entry_ns'][rows].tolist() + [END_NS], rows.tolist() + [-1])
+
+        cash = self.initial_capital
+        invested = 0.0
+        total_fees = 0.0
+        positions = self.positions
+        exits = []  # heap of (exit_ns, row) of the open positions
+        curve = self.equity_curve
+        closed = []
+        skipped_full = skipped_cash = 0
+
+        for time_ns, row in entries:
+            # Exits at or before this entry free their slot and cash first
+            while exits and exits[0][0] <= time_ns:
+                exit_time, closing = heapq.heappop(exits)
+                size, notional, fill, entry_fee = positions.pop(closing)
+                exit_fill = exit_price[closing] * (1 - direction[closing] * slippage)
+                exit_fee = size * exit_fill * commission
+                gross_pnl = size * (exit_fill - fill) * direction[closing]
+                cash += notional + gross_pnl - exit_fee
+                invested -= notional
+                total_fees += exit_fee
+                closed.append((closing, exit_time, size, fill, exit_fill, gross_pnl - entry_fee - exit_fee, notional))
+                curve.append((exit_time, cash + invested, cash, len(positions)))
+
+            if row < 0:
+                break
+            if len(positions) >= max_positions:
+                skipped_full += 1
+                continue
+
+            equity = cash + invested
+            fill = entry_price[row] * (1 + direction[row] * slippage)
+            size = min(equity * risk_per_trade / abs(fill - stop_price[row]),
+                       equity / max_positions / fill,
+                       cash / (fill * (1 + commission)))
+            if size <= 0:
+                skipped_cash += 1
+                continue
+
+            notional = size * fill
+            entry_fee = notional * commission
+            cash -= notional + entry_fee
+            invested += notional
+            total_fees += entry_fee
+            positions[row] = (size, notional, fill, entry_fee)
+            heapq.heappush(exits, (exit_ns[row], row))
+            curve.append((time_ns, cash + invested, cash, len(positions)))
+
+        self.current_capital = cash
+        self.skipped['max_positions'] += skipped_full
+        self.skipped['insufficient_capital'] += skipped_cash
+        self.trades = self._trades_frame(data, closed)
+        summary = self.get_performance_summary()
+        summary['total_fees'] = total_fees
+        return {
+            'summary': summary,
+            'trades': self.trades,
+            'equity_curve': self.equity_frame()
+        }
+
+    @staticmethod
+    def _trades_frame(data: Dict[str, np.ndarray], closed: List[tuple]) -> pd.DataFrame:
+        """Closed trades in exit order"""
+        columns = ('row', 'exit_time', 'size', 'entry_price', 'exit_price', 'pnl', 'notional')
+        values = dict(zip(columns, (np.array(column) for column in zip(*closed)))) if closed else {
+            name: np.empty(0, dtype=np.int64 if name in ('row', 'exit_time') else np.float64) for name in columns}
+        rows = values['row']
+        return pd.DataFrame({
+            'signal_id': data['signal_id'][rows],
+            'symbol': data['symbol'][rows],
+            'action': np.where(data['direction'][rows] > 0, 'LONG', 'SHORT'),
+            'entry_price': values['entry_price'],
+            'exit_price': values['exit_price'],
+            'size': values['size'],
+            'pnl': values['pnl'],
+            'return_pct': values['pnl'] / values['notional'] * 100,
+            'entry_time': pd.to_datetime(data['entry_ns'][rows], unit='ns', utc=True),
+            'exit_time': pd.to_datetime(values['exit_time'], unit='ns', utc=True),
+            'outcome': data['outcome'][rows]
+        })
+
+    def equity_frame(self) -> pd.DataFrame:
+        """Equity after every fill of the last run, with its drawdown from the running peak"""
+        curve = pd.DataFrame.from_records(self.equity_curve, columns=['timestamp', 'equity', 'cash', 'open_positions'])
+        curve['timestamp'] = pd.to_datetime(curve['timestamp'], unit='ns', utc=True)
+        peak = np.maximum.accumulate(np.r_[self.initial_capital, curve['equity'].to_numpy()])[1:]
+        curve['drawdown_pct'] = (curve['equity'] / peak - 1) * 100
+        return curve
+
+    def get_performance_summary(self) -> Dict[str, Any]:
+        """Performance metrics of the last run (see performance.performance_report) plus skips"""
+        summary = performance_report(self.trades, self.initial_capital)
+        summary.update({
+            'initial_capital': self.initial_capital,
+            'current_capital': self.current_capital,
+            'open_positions': len(self.positions),
+            'max_positions': self.max_positions,
+            'risk_per_trade': self.risk_per_trade,
+            'skipped_signals': dict(self.skipped)
+        })
+        return summary
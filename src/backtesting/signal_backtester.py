@@ -18,6 +18,11 @@ import time
 import sys
 sys.path.append('..')
 from data.binance_data import BinanceDataFetcher
+from data.result_metrics import signal_metrics
+from data.result_sinks import results_frame
+
+# Signals evaluated per kline load when streaming, bounding memory use
+EVALUATION_WINDOW = 5000
 
 class SignalBacktester:
     """Comprehensive signal backtesting engine"""
@@ -54,13 +59,15 @@ class SignalBacktester:
             print(f"❌ Error loading signals: {e}")
             self.signals_df = pd.DataFrame()
     
-    def backtest_signal(self, signal: Dict, lookforward_hours: int = 72) -> Dict:
+    def backtest_signal(self, signal: Dict, lookforward_hours: int = 72,
+                        outcome: Optional[Dict] = None) -> Dict:
         """
         Backtest a single signal
         
         Args:
             signal: Signal dictionary
             lookforward_hours: Hours to look forward for targets/SL
+            outcome: Precomputed outcome (e.g. from a batch evaluation)
             
         Returns:
             Detailed backtest result
@@ -68,7 +75,8 @@ class SignalBacktester:
         print(f"🔍 Testing {signal['symbol']} {signal['action']} @ ${signal['entry_price']}")
         
         # Use our Binance data fetcher
-        outcome = self.binance.check_signal_outcome(signal, lookforward_hours)
+        if outcome is None:
+            outcome = self.binance.check_signal_outcome(signal, lookforward_hours)
         
         # Add additional analysis
         outcome.update({
@@ -98,17 +106,39 @@ class SignalBacktester:
         
         return outcome
     
-    def run_backtest(self, max_signals: Optional[int] = None, 
-                    lookforward_hours: int = 72) -> List[Dict]:
+    def plan_prefetch(self, max_signals: Optional[int] = None,
+                      lookforward_hours: int = 72):
+        """
+        Print the kline downloads a backtest would need, without fetching
+
+        Args:
+            max_signals: Limit number of signals to plan for
+            lookforward_hours: Hours to look forward for each signal
+
+        Returns:
+            FetchPlan with request and byte estimates
+        """
+        signals_to_test = self.signals_df.head(max_signals) if max_signals else self.signals_df
+        signals = [signal.to_dict() for _, signal in signals_to_test.iterrows()]
+        plan = self.binance.plan_signal_klines(signals, lookforward_hours)
+        plan.print_summary()
+        return plan
+
+    def run_backtest(self, max_signals: Optional[int] = None,
+                    lookforward_hours: int = 72,
+                    sinks: Optional[List] = None) -> List[Dict]:
         """
         Run backtest on all signals
         
         Args:
             max_signals: Limit number of signals to test (for quick testing)
             lookforward_hours: Hours to look forward for each signal
+            sinks: Result sinks (see data.result_sinks) to stream results to;
+                   results are then written out window by window instead
+                   of being kept in self.results
             
         Returns:
-            List of backtest results
+            List of backtest results (empty when streaming to sinks)
         """
         print("🚀 Starting comprehensive backtest...")
         print("=" * 50)
@@ -121,16 +151,36 @@ class SignalBacktester:
         print()
         
         results = []
+        tested = wins = losses = 0
         
-        for idx, (_, signal) in enumerate(signals_to_test.iterrows(), 1):
+        # Evaluate all signals with one kline load per symbol (per window when streaming)
+        signals = [signal.to_dict() for _, signal in signals_to_test.iterrows()]
+        window = EVALUATION_WINDOW if sinks else max(len(signals), 1)
+        
+        for idx, signal in enumerate(signals, 1):
+            if (idx - 1) % window == 0:
+                outcomes = iter(self.binance.check_signal_outcomes(signals[idx - 1:idx - 1 + window],
+                                                                   lookforward_hours))
+            outcome = next(outcomes)
             print(f"[{idx}/{total_signals}] ", end="")
             
+            if outcome is None:
+                print(f"❌ Error: could not evaluate {signal['symbol']}")
+                continue
+            
             try:
-                result = self.backtest_signal(signal.to_dict(), lookforward_hours)
-                results.append(result)
+                result = self.backtest_signal(signal, lookforward_hours, outcome=outcome)
+                if sinks:
+                    for sink in sinks:
+                        sink.write(result)
+                else:
+                    results.append(result)
                 
                 # Show quick result
                 outcome = result['final_outcome']
+                tested += 1
+                wins += outcome.startswith('TARGET')
+                losses += outcome == 'STOP_LOSS'
                 symbol = result['symbol']
                 
                 if outcome == 'TARGET1':
@@ -146,17 +196,15 @@ class SignalBacktester:
                 
                 # Progress update every 20 signals
                 if idx % 20 == 0:
-                    wins = sum(1 for r in results if r['final_outcome'].startswith('TARGET'))
-                    losses = sum(1 for r in results if r['final_outcome'] == 'STOP_LOSS')
-                    winrate = (wins / len(results)) * 100 if results else 0
+                    winrate = (wins / tested) * 100 if tested else 0
                     print(f"\\n📈 Progress: {idx}/{total_signals} | Winrate: {winrate:.1f}% | Wins: {wins} | Losses: {losses}\\n")
                 
             except Exception as e:
                 print(f"❌ Error: {e}")
                 continue
-            
-            # Small delay to avoid rate limits
-            time.sleep(0.1)
+        
+        for sink in sinks or []:
+            sink.flush()
         
         self.results = results
         return results
@@ -167,176 +215,7 @@ class SignalBacktester:
             return {}
         
         print("📊 Calculating performance metrics...")
-        
-        # Basic counts
-        total_signals = len(self.results)
-        valid_results = [r for r in self.results if r['final_outcome'] != 'NO_DATA']
-        
-        target1_hits = sum(1 for r in valid_results if r['hit_target1'])
-        target2_hits = sum(1 for r in valid_results if r['hit_target2']) 
-        target3_hits = sum(1 for r in valid_results if r['hit_target3'])
-        stop_loss_hits = sum(1 for r in valid_results if r['hit_stop_loss'])
-        
-        # Win rates
-        total_valid = len(valid_results)
-        if total_valid > 0:
-            target1_rate = (target1_hits / total_valid) * 100
-            target2_rate = (target2_hits / total_valid) * 100
-            target3_rate = (target3_hits / total_valid) * 100
-            stop_loss_rate = (stop_loss_hits / total_valid) * 100
-            
-            # Overall win rate (any target hit)
-            wins = sum(1 for r in valid_results if r['final_outcome'].startswith('TARGET'))
-            overall_winrate = (wins / total_valid) * 100
-        else:
-            target1_rate = target2_rate = target3_rate = stop_loss_rate = overall_winrate = 0
-        
-        # Timing analysis
-        target_times = []
-        sl_times = []
-        
-        for r in valid_results:
-            if r['target1_minutes']:
-                target_times.append(r['target1_minutes'])
-            if r['target2_minutes']:
-                target_times.append(r['target2_minutes'])
-            if r['target3_minutes']:
-                target_times.append(r['target3_minutes'])
-            if r['stop_loss_minutes']:
-                sl_times.append(r['stop_loss_minutes'])
-        
-        # Profit/Loss analysis
-        profits = [r['max_profit_pct'] for r in valid_results if r['max_profit_pct'] > 0]
-        drawdowns = [abs(r['max_drawdown_pct']) for r in valid_results if r['max_drawdown_pct'] < 0]
-        
-        # Risk/Reward analysis
-        rr_ratios = []
-        for r in valid_results:
-            for target in ['rr_target1', 'rr_target2', 'rr_target3']:
-                if target in r and r[target]:
-                    rr_ratios.append(r[target])
-        
-        metrics = {
-            'total_signals': total_signals,
-            'valid_signals': total_valid,
-            'data_coverage': (total_valid / total_signals) * 100 if total_signals > 0 else 0,
-            
-            # Win rates
-            'overall_winrate': overall_winrate,
-            'target1_rate': target1_rate,
-            'target2_rate': target2_rate,
-            'target3_rate': target3_rate,
-            'stop_loss_rate': stop_loss_rate,
-            
-            # Counts
-            'target1_hits': target1_hits,
-            'target2_hits': target2_hits,
-            'target3_hits': target3_hits,
-            'stop_loss_hits': stop_loss_hits,
-            'wins': wins,
-            'losses': stop_loss_hits,
-            
-            # Timing (in minutes)
-            'avg_target_time': np.mean(target_times) if target_times else 0,
-            'median_target_time': np.median(target_times) if target_times else 0,
-            'avg_sl_time': np.mean(sl_times) if sl_times else 0,
-            'median_sl_time': np.median(sl_times) if sl_times else 0,
-            'fastest_target': min(target_times) if target_times else 0,
-            'slowest_target': max(target_times) if target_times else 0,
-            
-            # Profit/Loss
-            'avg_max_profit': np.mean(profits) if profits else 0,
-            'max_profit_achieved': max(profits) if profits else 0,
-            'avg_max_drawdown': np.mean(drawdowns) if drawdowns else 0,
-            'worst_drawdown': max(drawdowns) if drawdowns else 0,
-            
-            # Risk/Reward
-            'avg_risk_reward': np.mean(rr_ratios) if rr_ratios else 0,
-            'best_risk_reward': max(rr_ratios) if rr_ratios else 0,
-            
-            # Symbol performance
-            'symbol_performance': self._analyze_by_symbol(),
-            'timeframe_performance': self._analyze_by_timeframe(),
-            'strategy_performance': self._analyze_by_strategy()
-        }
-        
-        return metrics
-    
-    def _analyze_by_symbol(self) -> Dict:
-        """Analyze performance by symbol"""
-        symbol_stats = {}
-        
-        for r in self.results:
-            symbol = r['symbol']
-            if symbol not in symbol_stats:
-                symbol_stats[symbol] = {
-                    'total': 0, 'wins': 0, 'losses': 0,
-                    'target_times': [], 'sl_times': []
-                }
-            
-            symbol_stats[symbol]['total'] += 1
-            
-            if r['final_outcome'].startswith('TARGET'):
-                symbol_stats[symbol]['wins'] += 1
-                if r.get('target1_minutes'):
-                    symbol_stats[symbol]['target_times'].append(r['target1_minutes'])
-            elif r['final_outcome'] == 'STOP_LOSS':
-                symbol_stats[symbol]['losses'] += 1
-                if r.get('stop_loss_minutes'):
-                    symbol_stats[symbol]['sl_times'].append(r['stop_loss_minutes'])
-        
-        # Calculate win rates and averages
-        for symbol, stats in symbol_stats.items():
-            if stats['total'] > 0:
-                stats['winrate'] = (stats['wins'] / stats['total']) * 100
-                stats['avg_target_time'] = np.mean(stats['target_times']) if stats['target_times'] else 0
-                stats['avg_sl_time'] = np.mean(stats['sl_times']) if stats['sl_times'] else 0
-        
-        return symbol_stats
-    
-    def _analyze_by_timeframe(self) -> Dict:
-        """Analyze performance by timeframe"""
-        tf_stats = {}
-        
-        for r in self.results:
-            tf = r.get('timeframe', 'Unknown')
-            if tf not in tf_stats:
-                tf_stats[tf] = {'total': 0, 'wins': 0, 'losses': 0}
-            
-            tf_stats[tf]['total'] += 1
-            if r['final_outcome'].startswith('TARGET'):
-                tf_stats[tf]['wins'] += 1
-            elif r['final_outcome'] == 'STOP_LOSS':
-                tf_stats[tf]['losses'] += 1
-        
-        # Calculate win rates
-        for tf, stats in tf_stats.items():
-            if stats['total'] > 0:
-                stats['winrate'] = (stats['wins'] / stats['total']) * 100
-        
-        return tf_stats
-    
-    def _analyze_by_strategy(self) -> Dict:
-        """Analyze performance by strategy version"""
-        strategy_stats = {}
-        
-        for r in self.results:
-            strategy = r.get('strategy_version', 'Unknown')
-            if strategy not in strategy_stats:
-                strategy_stats[strategy] = {'total': 0, 'wins': 0, 'losses': 0}
-            
-            strategy_stats[strategy]['total'] += 1
-            if r['final_outcome'].startswith('TARGET'):
-                strategy_stats[strategy]['wins'] += 1
-            elif r['final_outcome'] == 'STOP_LOSS':
-                strategy_stats[strategy]['losses'] += 1
-        
-        # Calculate win rates
-        for strategy, stats in strategy_stats.items():
-            if stats['total'] > 0:
-                stats['winrate'] = (stats['wins'] / stats['total']) * 100
-        
-        return strategy_stats
+        return signal_metrics(self.results)
     
     def save_results(self, filename_prefix: str = "backtest") -> str:
         """Save detailed results to CSV"""
@@ -348,8 +227,8 @@ class SignalBacktester:
             print("❌ No results to save")
             return ""
         
-        # Convert results to DataFrame and save
-        df = pd.DataFrame(self.results)
+        # Convert results to DataFrame (same layout as streamed sinks) and save
+        df = results_frame(self.results)
         df.to_csv(filepath, index=False)
         
         print(f"💾 Results saved to: {filepath}")
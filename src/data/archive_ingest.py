@@ -0,0 +1,259 @@
+"""
+Binance Archive Ingestion
+
+Imports kline archives from Binance's public data dump
+(data.binance.vision) straight into the kline store, so historical
+backfills are bulk file I/O instead of paginated REST requests.
+
+Supported file names (zipped or already extracted):
+    {SYMBOL}-{interval}-{YYYY}-{MM}-{DD}.zip   daily archive
+    {SYMBOL}-{interval}-{YYYY}-{MM}.zip        monthly archive
+
+Each archive holds one headerless CSV with the standard kline columns
+(open time, open, high, low, close, volume, close time, quote volume,
+...). Open times
+are epoch milliseconds, or microseconds in newer spot archives.
+"""
+
+import calendar
+import os
+import re
+import time
+import zipfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .kline_store import KlineStore, COLUMNS, DAY_MS, INTERVAL_MS, KLINE_FIELDS, day_index
+
+ARCHIVE_NAME = re.compile(
+    r'^(?P<symbol>[A-Z0-9]+)-(?P<interval>\w+)-(?P<year>\d{4})-(?P<month>\d{2})(?:-(?P<day>\d{2}))?\.(?:zip|csv)$'
+)
+
+# Rows parsed per chunk while streaming an archive
+CHUNK_ROWS = 500_000
+
+
+def parse_archive_name(filename: str) -> Optional[Dict]:
+    """
+    Parse a Binance kline archive file name
+
+    Args:
+        filename: Base name such as 'BTCUSDT-1m-2024-01-15.zip'
+
+    Returns:
+        Dictionary with symbol, interval and the covered day numbers,
+        or None if the name is not a kline archive
+    """
+    match = ARCHIVE_NAME.match(filename)
+    if match is None or match['interval'] not in INTERVAL_MS:
+        return None
+
+    year, month = int(match['year']), int(match['month'])
+    if match['day']:
+        first_day = last_day = int(match['day'])
+    else:
+        first_day, last_day = 1, calendar.monthrange(year, month)[1]
+
+    start = datetime(year, month, first_day, tzinfo=timezone.utc)
+    first = day_index(int(start.timestamp() * 1000))
+    return {
+        'symbol': match['symbol'],
+        'interval': match['interval'],
+        'days': list(range(first, first + last_day - first_day + 1)),
+        'monthly': match['day'] is None
+    }
+
+
+def _read_csv_stream(stream) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse kline CSV rows from a (decompressing) file object in chunks"""
+    ts_parts, value_parts = [], []
+    reader = pd.read_csv(stream, header=None, usecols=list(KLINE_FIELDS),
+                         chunksize=CHUNK_ROWS, dtype=str)
+
+    for chunk in reader:
+        # Some archives start with a header row
+        chunk = chunk[pd.to_numeric(chunk[0], errors='coerce').notna()]
+        ts_parts.append(chunk[0].astype(np.int64).to_numpy())
+        value_parts.append(chunk.iloc[:, 1:].astype(np.float64).to_numpy().T)
+
+    if not ts_parts:
+        return np.empty(0, dtype=np.int64), np.empty((len(COLUMNS), 0), dtype=np.float64)
+
+    timestamps = np.concatenate(ts_parts)
+    values = np.concatenate(value_parts, axis=1)
+
+    # Newer spot archives use microsecond open times
+    timestamps = np.where(timestamps >= 10 ** 14, timestamps // 1000, timestamps)
+
+    order = np.argsort(timestamps, kind='stable')
+    return timestamps[order], np.ascontiguousarray(values[:, order])
+
+
+def read_archive(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read the candles of one archive file (zip or csv)
+
+    Zip members are decompressed as a stream, never extracted to disk.
+
+    Returns:
+        Tuple of (int64 open times in ms, float64 OHLCV matrix)
+    """
+    if not path.endswith('.zip'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return _read_csv_stream(f)
+
+    with zipfile.ZipFile(path) as archive:
+        members = [name for name in archive.namelist() if name.endswith('.csv')]
+        if not members:
+            raise ValueError(f"No CSV file in {path}")
+        ts_parts, value_parts = [], []
+        for name in members:
+            with archive.open(name) as member:
+                timestamps, values = _read_csv_stream(member)
+            ts_parts.append(timestamps)
+            value_parts.append(values)
+
+    timestamps = np.concatenate(ts_parts)
+    values = np.concatenate(value_parts, axis=1)
+    order = np.argsort(timestamps, kind='stable')
+    return timestamps[order], values[:, order]
+
+
+def ingest_file(path: str, root: str, overwrite: bool = False) -> Dict:
+    """
+    Import one archive file into the kline store
+
+    Every day the archive covers is written, including days without
+    candles, so those days are not fetched again later.
+
+    Args:
+        path: Archive file
+        root: Kline store directory
+        overwrite: Replace day partitions that are already cached
+
+    Returns:
+        Dictionary with file, symbol, interval, rows and days_written
+    """
+    info = parse_archive_name(os.path.basename(path))
+    store = KlineStore(root)
+    now_ms = int(time.time() * 1000)
+
+    days = [day for day in info['days'] if (day + 1) * DAY_MS <= now_ms]
+    if not overwrite:
+        days = [day for day in days if not store.has_partition(info['symbol'], info['interval'], day)]
+
+    result = {'file': path, 'symbol': info['symbol'], 'interval': info['interval'],
+              'rows': 0, 'days_written': 0}
+    if not days:
+        return result
+
+    timestamps, values = read_archive(path)
+    store.write_days(info['symbol'], info['interval'], timestamps, values, days)
+    result['rows'] = int(len(timestamps))
+    result['days_written'] = len(days)
+    return result
+
+
+def find_archives(directory: str, symbols: Optional[Iterable[str]] = None,
+                  intervals: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Find kline archives below a directory
+
+    Daily archives whose day is also covered by a monthly archive of the
+    same symbol and interval are left out, so no two files write the
+    same day partition.
+
+    Args:
+        directory: Directory searched recursively
+        symbols: Only include these trading pairs
+        intervals: Only include these intervals
+
+    Returns:
+        Sorted list of archive paths
+    """
+    symbols = set(symbols) if symbols else None
+    intervals = set(intervals) if intervals else None
+    found = {}
+
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            info = parse_archive_name(filename)
+            if info is None:
+                continue
+            if symbols and info['symbol'] not in symbols:
+                continue
+            if intervals and info['interval'] not in intervals:
+                continue
+            # Prefer the zip when both the zip and its extracted CSV are present
+            key = os.path.splitext(filename)[0]
+            if key not in found or filename.endswith('.zip'):
+                found[key] = (os.path.join(dirpath, filename), info)
+
+    monthly_days = set()
+    for path, info in found.values():
+        if info['monthly']:
+            monthly_days.update((info['symbol'], info['interval'], day) for day in info['days'])
+
+    return sorted(
+        path for path, info in found.values()
+        if info['monthly'] or (info['symbol'], info['interval'], info['days'][0]) not in monthly_days
+    )
+
+
+def ingest_archives(directory: str, root: str = "data/cache/klines", workers: int = 4,
+                    symbols: Optional[Iterable[str]] = None,
+                    intervals: Optional[Iterable[str]] = None,
+                    overwrite: bool = False) -> Dict:
+    """
+    Import every kline archive below a directory into the kline store
+
+    Files are read and written in parallel worker processes; they never
+    share a day partition (see find_archives).
+
+    Args:
+        directory: Directory with downloaded archives
+        root: Kline store directory
+        workers: Worker processes (1 = in this process, 0 = all CPU cores)
+        symbols: Only import these trading pairs
+        intervals: Only import these intervals
+        overwrite: Replace day partitions that are already cached
+
+    Returns:
+        Summary with files, rows, days_written, failed and per-symbol day counts
+    """
+    paths = find_archives(directory, symbols, intervals)
+    summary = {'files': len(paths), 'rows': 0, 'days_written': 0, 'failed': [], 'symbols': {}}
+    if not paths:
+        print(f"⚠️ No kline archives found in {directory}")
+        return summary
+
+    print(f"📦 Ingesting {len(paths)} archive(s) from {directory}")
+
+    def record(result: Dict):
+        summary['rows'] += result['rows']
+        summary['days_written'] += result['days_written']
+        key = f"{result['symbol']} {result['interval']}"
+        summary['symbols'][key] = summary['symbols'].get(key, 0) + result['days_written']
+
+    if workers == 1:
+        for path in paths:
+            try:
+                record(ingest_file(path, root, overwrite))
+            except Exception as e:
+                print(f"❌ Error ingesting {path}: {e}")
+                summary['failed'].append(path)
+    else:
+        with ProcessPoolExecutor(max_workers=workers or None) as executor:
+            futures = {executor.submit(ingest_file, path, root, overwrite): path for path in paths}
+            for future in as_completed(futures):
+                try:
+                    record(future.result())
+                except Exception as e:
+                    print(f"❌ Error ingesting {futures[future]}: {e}")
+                    summary['failed'].append(futures[future])
+
+    print(f"✅ Ingested {summary['rows']:,} candles into {summary['days_written']} day partition(s)")
+    return summary
@@ -0,0 +1,186 @@
+"""
+Async Binance Kline Fetcher
+
+Concurrent kline downloads over a pooled aiohttp session. Ranges for
+many symbols are split into pages and scheduled concurrently under the
+request-weight budget of a shared RateLimiter, and results follow the
+same DataFrame contract as BinanceDataFetcher.get_kline_data.
+"""
+
+import asyncio
+import aiohttp
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+
+from .kline_store import INTERVAL_MS, klines_to_arrays, arrays_to_frame
+from .rate_limiter import RateLimiter
+
+# (symbol, interval, start_ms, end_ms) with an inclusive end, like the klines endpoint
+KlineRequest = Tuple[str, str, int, int]
+
+
+class AsyncKlineFetcher:
+    """Fetch klines for many symbol/range requests concurrently"""
+
+    BASE_URL = "https://api.binance.com"
+    KLINES_PATH = "/api/v3/klines"
+    PAGE_LIMIT = 1000
+    KLINES_WEIGHT = 2
+    ENDPOINT = 'binance:klines'
+
+    def __init__(self, base_url: str = BASE_URL, max_concurrency: int = 10,
+                 weight_per_minute: int = 6000, max_retries: int = 5,
+                 timeout: float = 30.0, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize the fetcher
+
+        Args:
+            base_url: REST base URL (point at a local stub server for offline tests)
+            max_concurrency: Maximum requests in flight (and pooled connections)
+            weight_per_minute: Request-weight budget per minute (if no limiter is given)
+            max_retries: Retries per page on HTTP 429/418/5xx
+            timeout: Total timeout per request in seconds
+            rate_limiter: Shared limiter to draw request weight from
+        """
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter(
+            {self.ENDPOINT: (weight_per_minute, 60.0)}, max_retries=max_retries
+        )
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+
+    def _pages(self, interval: str, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """Split [start_ms, end_ms] into ranges of at most PAGE_LIMIT candles"""
+        span = self.PAGE_LIMIT * INTERVAL_MS[interval]
+        return [(page_start, min(page_start + span - 1, end_ms))
+                for page_start in range(start_ms, end_ms + 1, span)]
+
+    async def _get_page(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[List]:
+        """Fetch one page of klines, retrying when throttled"""
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'startTime': start_ms,
+            'endTime': end_ms,
+            'limit': self.PAGE_LIMIT
+        }
+        url = f"{self.base_url}{self.KLINES_PATH}"
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire_async(self.ENDPOINT, self.KLINES_WEIGHT)
+            async with self._semaphore:
+                async with self._session.get(url, params=params) as response:
+                    delay = self.rate_limiter.record_response(
+                        self.ENDPOINT, response.status, response.headers, attempt
+                    )
+                    if response.status == 200:
+                        return await response.json()
+
+                    if delay is None and response.status >= 500 and attempt < self.max_retries:
+                        delay = self.rate_limiter.backoff_delay(attempt)
+                    if delay is None:
+                        response.raise_for_status()
+
+            await asyncio.sleep(delay)
+
+        return []
+
+    async def _get_sequential(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[List]:
+        """Paginate one request at a time (intervals without a fixed length)"""
+        rows = []
+        while start_ms <= end_ms:
+            page = await self._get_page(symbol, interval, start_ms, end_ms)
+            if not page:
+                break
+            rows.extend(page)
+            start_ms = int(page[-1][0]) + 1
+        return rows
+
+    async def fetch_arrays(self, symbol: str, interval: str, start_ms: int,
+                           end_ms: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetch candles with open time in [start_ms, end_ms], pages in parallel
+
+        Returns:
+            Tuple of (int64 open times in ms, float64 OHLCV matrix)
+        """
+        if interval not in INTERVAL_MS:
+            return klines_to_arrays(await self._get_sequential(symbol, interval, start_ms, end_ms))
+
+        pages = await asyncio.gather(*[
+            self._get_page(symbol, interval, page_start, page_end)
+            for page_start, page_end in self._pages(interval, start_ms, end_ms)
+        ])
+        return klines_to_arrays([row for page in pages for row in page])
+
+    async def fetch_many_arrays(self, requests: List[KlineRequest]
+                                ) -> List[Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Fetch many requests concurrently
+
+        Returns:
+            One (timestamps, values) tuple per request, in order
+            (None for requests that failed)
+        """
+        async def run(request: KlineRequest):
+            symbol = request[0]
+            try:
+                return await self.fetch_arrays(*request)
+            except Exception as e:
+                print(f"❌ Error fetching {symbol}: {e}")
+                return None
+
+        return await asyncio.gather(*[run(request) for request in requests])
+
+    async def fetch_many(self, requests: List[KlineRequest]) -> List[pd.DataFrame]:
+        """
+        Fetch many requests concurrently as OHLCV DataFrames
+
+        Returns:
+            One DataFrame per request, in order (empty when nothing was found)
+        """
+        frames = []
+        for arrays in await self.fetch_many_arrays(requests):
+            if arrays is None or len(arrays[0]) == 0:
+                frames.append(pd.DataFrame())
+            else:
+                frames.append(arrays_to_frame(*arrays))
+        return frames
+
+
+def fetch_klines_concurrently(requests: List[KlineRequest], as_frames: bool = True, **kwargs):
+    """
+    Synchronous entry point: run AsyncKlineFetcher over many requests
+
+    Args:
+        requests: (symbol, interval, start_ms, end_ms) tuples
+        as_frames: Return DataFrames (otherwise (timestamps, values) tuples)
+        **kwargs: Passed to AsyncKlineFetcher
+
+    Returns:
+        Results in request order
+    """
+    async def run():
+        async with AsyncKlineFetcher(**kwargs) as fetcher:
+            if as_frames:
+                return await fetcher.fetch_many(requests)
+            return await fetcher.fetch_many_arrays(requests)
+
+    return asyncio.run(run())
@@ -12,16 +12,76 @@ from datetime import datetime, timedelta
 import time
 import json
 import os
-from typing import Dict, List, Optional, Tuple
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .kline_store import (
+    KlineStore, MappedKlines, COLUMNS, DAY_MS, INTERVAL_MS, ROLLUP_SOURCE, can_roll_up,
+    klines_to_arrays, arrays_to_frame, contiguous_runs, partition_complete
+)
+from .async_kline_fetcher import AsyncKlineFetcher, fetch_klines_concurrently
+from .rate_limiter import RateLimiter, get_shared_limiter
+from .prefetch_planner import FetchPlan, merge_windows, window_days
+from .intrabar_resolver import IntrabarCache, MINUTE_MS, RESOLUTION
+from .compact_klines import CompactKlines
+from .outcome_engine import (
+    parse_signal, evaluate_signal, evaluate_signal_horizons, evaluate_signal_coarse,
+    evaluate_klines, no_data_outcome, resume_point, is_settled
+)
+
+
+class KlineFetchError(Exception):
+    """Klines could not be fetched, or cached klines are incomplete (strict mode)"""
+
 
 class BinanceDataFetcher:
     """Fetch historical data from Binance for backtesting"""
     
-    def __init__(self):
-        """Initialize Binance client (public API only)"""
+    def __init__(self, async_fetch: bool = True, max_concurrency: int = 10,
+                 api_url: str = AsyncKlineFetcher.BASE_URL,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 use_range_index: bool = False,
+                 coarse_interval: Optional[str] = None,
+                 resolve_intrabar: bool = False,
+                 strict: bool = False,
+                 consolidate: bool = True):
+        """
+        Initialize Binance client (public API only)
+        
+        Args:
+            async_fetch: Prefetch missing klines concurrently before batch evaluation
+            max_concurrency: Maximum concurrent requests for async prefetching
+            api_url: REST base URL used by the async prefetcher
+            rate_limiter: Request-weight limiter (defaults to the process-wide one)
+            use_range_index: Evaluate signals with a range max/min index over
+                             each memory-mapped series instead of scanning windows
+            coarse_interval: Scan bars of this interval (e.g. '1h') first and
+                             load 1m candles only for bars that reach a level
+            resolve_intrabar: Re-check exit candles that touched both the stop
+                              loss and a target on 1s klines of that minute
+            strict: Raise KlineFetchError when klines cannot be fetched or a
+                    cached day still has gaps after repair, instead of
+                    continuing with what is available
+            consolidate: Rebuild a pair's memory-mapped series during batch
+                         evaluation when it does not cover the signal windows;
+                         disable in worker processes whose parent has built
+                         the series already (windows the series does not
+                         cover are then read from the day partitions)
+        """
         self.client = Client()  # No API key needed for historical data
+        self.async_fetch = async_fetch
+        self.api_url = api_url
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or get_shared_limiter()
+        self.use_range_index = use_range_index
+        self.coarse_interval = coarse_interval
+        self.strict = strict
+        self.consolidate = consolidate
         self.cache_dir = "data/cache"
         os.makedirs(self.cache_dir, exist_ok=True)
+        self.kline_store = KlineStore(os.path.join(self.cache_dir, "klines"))
+        self.intrabar = IntrabarCache(os.path.join(self.cache_dir, "intrabar")) if resolve_intrabar else None
+        self._mapped = {}  # (symbol, interval) -> MappedKlines
     
     def get_kline_data(self, symbol: str, start_time: datetime, end_time: datetime, 
                       interval: str = "1m") -> pd.DataFrame:
@@ -35,62 +95,532 @@ class BinanceDataFetcher:
             interval: Kline interval (1m, 5m, 15m, 1h, 4h, 1d)
             
         Returns:
-            DataFrame with OHLCV data
+            DataFrame with OHLCV data (empty if none was found)
+            
+        Raises:
+            KlineFetchError: In strict mode, if the klines could not be fetched
         """
         print(f"📊 Fetching {symbol} data from {start_time} to {end_time}")
         
-        # Check cache first
-        cache_key = f"{symbol}_{interval}_{start_time.strftime('%Y%m%d')}_{end_time.strftime('%Y%m%d')}"
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.csv")
-        
-        if os.path.exists(cache_file):
-            print(f"💾 Loading from cache: {cache_file}")
-            return pd.read_csv(cache_file, parse_dates=['timestamp'])
+        # Convert to millisecond timestamps (end is inclusive, like the klines endpoint)
+        start_ts = int(start_time.timestamp() * 1000)
+        end_ts = int(end_time.timestamp() * 1000)
         
         try:
-            # Convert to millisecond timestamps
-            start_ts = int(start_time.timestamp() * 1000)
-            end_ts = int(end_time.timestamp() * 1000)
-            
-            # Fetch klines
-            klines = self.client.get_historical_klines(
-                symbol=symbol,
-                interval=interval,
-                start_str=start_ts,
-                end_str=end_ts
+            # Only fetch day partitions that are not in the kline store yet
+            pending = self._fetch_missing_days(symbol, interval, start_ts, end_ts + 1)
+            timestamps, values = self.kline_store.read_range(
+                symbol, interval, start_ts, end_ts + 1, extra=pending
             )
             
-            if not klines:
+            if len(timestamps) == 0:
                 print(f"⚠️ No data found for {symbol}")
                 return pd.DataFrame()
             
-            # Convert to DataFrame
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'count', 'taker_buy_volume',
-                'taker_buy_quote_volume', 'ignore'
-            ])
+            return arrays_to_frame(timestamps, values)
+            
+        except Exception as e:
+            print(f"❌ Error fetching {symbol}: {e}")
+            if self.strict:
+                if isinstance(e, KlineFetchError):
+                    raise
+                raise KlineFetchError(f"{symbol} {interval}: {e}") from e
+            return pd.DataFrame()
+    
+    def get_compact_klines(self, symbol: str, start_time: datetime, end_time: datetime,
+                           interval: str = "1m", float32: bool = True) -> Optional[CompactKlines]:
+        """
+        Fetch klines into a compact container instead of a DataFrame
+        
+        Same data as get_kline_data (including quote_volume), stored as
+        int32 candle offsets and float32 (or float64) columns, e.g. to
+        keep a month of every symbol in memory for parameter sweeps.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTCUSDT')
+            start_time: Start datetime
+            end_time: End datetime (inclusive)
+            interval: Kline interval with a fixed length
+            float32: Store prices and volumes as float32
+            
+        Returns:
+            CompactKlines, or None if no data was found
+            
+        Raises:
+            KlineFetchError: In strict mode, if the klines could not be fetched
+        """
+        print(f"📊 Fetching {symbol} data from {start_time} to {end_time}")
+        
+        start_ts = int(start_time.timestamp() * 1000)
+        end_ts = int(end_time.timestamp() * 1000)
+        
+        try:
+            pending = self._fetch_missing_days(symbol, interval, start_ts, end_ts + 1)
+            timestamps, values = self.kline_store.read_range(
+                symbol, interval, start_ts, end_ts + 1, extra=pending
+            )
+        except Exception as e:
+            print(f"❌ Error fetching {symbol}: {e}")
+            if self.strict:
+                if isinstance(e, KlineFetchError):
+                    raise
+                raise KlineFetchError(f"{symbol} {interval}: {e}") from e
+            return None
+        
+        if len(timestamps) == 0:
+            print(f"⚠️ No data found for {symbol}")
+            return None
+        
+        return CompactKlines.from_arrays(timestamps, values, symbol, interval, float32)
+    
+    def _request_klines(self, symbol: str, interval: str,
+                        start_ms: int, end_ms: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Download candles with open time in [start_ms, end_ms] from the REST API
+        
+        Returns:
+            Tuple of (timestamps, values)
+        """
+        # Rate limiting: reserve the weight of every page this range needs
+        pages = -(-(end_ms + 1 - start_ms) // (AsyncKlineFetcher.PAGE_LIMIT * INTERVAL_MS.get(interval, DAY_MS)))
+        self.rate_limiter.acquire(AsyncKlineFetcher.ENDPOINT,
+                                  weight=AsyncKlineFetcher.KLINES_WEIGHT * max(pages, 1))
+        
+        klines = self.client.get_historical_klines(
+            symbol=symbol,
+            interval=interval,
+            start_str=start_ms,
+            end_str=end_ms
+        )
+        response = getattr(self.client, 'response', None)
+        if response is not None:
+            self.rate_limiter.record_response(AsyncKlineFetcher.ENDPOINT,
+                                              response.status_code, response.headers)
+        return klines_to_arrays(klines)
+    
+    def _roll_up(self, symbol: str, interval: str, days: List[int]) -> List[int]:
+        """Materialize coarser-interval days from cached 1m partitions, returning the days still missing"""
+        rolled = set(self.kline_store.materialize_rollups(symbol, interval, days))
+        if rolled:
+            print(f"🧮 Rolled up {len(rolled)} day(s) of {symbol} {interval} from cached {ROLLUP_SOURCE} klines")
+        return [day for day in days if day not in rolled]
+    
+    def _fetch_missing_days(self, symbol: str, interval: str, start_ms: int, end_ms: int,
+                            days: Optional[List[int]] = None) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Fetch the day partitions of [start_ms, end_ms) missing from the store
+        (only those listed in days, if given)
+        
+        Completed days are written to the store. Days that are still in
+        progress are returned instead, so they get refetched next time.
+        
+        Returns:
+            Mapping of day number to (timestamps, values) for incomplete days
+        """
+        wanted = self.kline_store.days_in_range(start_ms, end_ms)
+        if days is not None:
+            wanted = sorted(set(wanted).intersection(days))
+        missing = [day for day in wanted if not self.kline_store.has_partition(symbol, interval, day)]
+        missing = self._roll_up(symbol, interval, missing)
+        if not missing:
+            print(f"💾 Loading from cache: {symbol} {interval}")
+            self._ensure_complete(symbol, interval, wanted)
+            return {}
+        
+        now_ms = int(time.time() * 1000)
+        pending = {}
+        
+        for run in contiguous_runs(missing):
+            run_start = run[0] * DAY_MS
+            run_end = min((run[-1] + 1) * DAY_MS, now_ms)
+            if run_start >= run_end:
+                continue
+            
+            timestamps, values = self._request_klines(symbol, interval, run_start, run_end - 1)
+            
+            complete = [day for day in run if (day + 1) * DAY_MS <= now_ms]
+            self.kline_store.write_days(symbol, interval, timestamps, values, complete)
+            print(f"✅ Cached {len(complete)} day(s) of {symbol} {interval}")
+            
+            for day in run[len(complete):]:
+                lo = np.searchsorted(timestamps, day * DAY_MS, side='left')
+                hi = np.searchsorted(timestamps, (day + 1) * DAY_MS, side='left')
+                pending[day] = (timestamps[lo:hi], values[:, lo:hi])
+        
+        self._ensure_complete(symbol, interval, wanted)
+        return pending
+    
+    @staticmethod
+    def _gap_requests(gaps: List[List[int]], interval: str) -> List[Tuple[int, int]]:
+        """Merge nearby gap spans into inclusive request ranges of at most one page each"""
+        page_ms = AsyncKlineFetcher.PAGE_LIMIT * INTERVAL_MS[interval]
+        requests = []
+        for start, end in gaps:
+            if requests and end - requests[-1][0] < page_ms:
+                requests[-1] = (requests[-1][0], end)
+            else:
+                requests.append((start, end))
+        return requests
+    
+    def repair_klines(self, symbol: str, interval: str = "1m",
+                      days: Optional[List[int]] = None) -> Dict:
+        """
+        Fetch the missing spans of cached day partitions again
+        
+        Only the gaps recorded in the manifest are requested, never the
+        whole day. The refetched candles are merged into the partition,
+        duplicates are dropped, and the partition is marked verified:
+        candles that are still missing are gaps on the exchange itself.
+        
+        Args:
+            symbol: Trading pair
+            interval: Kline interval
+            days: Day numbers to check (defaults to every cached day)
+            
+        Returns:
+            Dictionary with days_repaired, requests, candles_filled and
+            failed (day numbers whose refetch raised)
+        """
+        if days is None:
+            days = self.kline_store.cached_days(symbol, interval)
+        summary = {'days_repaired': 0, 'requests': 0, 'candles_filled': 0, 'failed': []}
+        
+        for day in self.kline_store.incomplete_days(symbol, interval, days):
+            status = self.kline_store.partition_status(symbol, interval, day)
+            timestamps, values = self.kline_store.read_partition(symbol, interval, day)
+            ts_parts, value_parts = [timestamps], [values]
+            try:
+                for start, end in self._gap_requests(status['gaps'], interval):
+                    fetched_ts, fetched_values = self._request_klines(symbol, interval, start, end)
+                    keep = (fetched_ts >= day * DAY_MS) & (fetched_ts < (day + 1) * DAY_MS)
+                    ts_parts.append(fetched_ts[keep])
+                    value_parts.append(fetched_values[:, keep])
+                    summary['requests'] += 1
+            except Exception as e:
+                print(f"❌ Error repairing {symbol} {interval} on day {day}: {e}")
+                summary['failed'].append(day)
+                continue
+            
+            self.kline_store.write_partition(symbol, interval, day, np.concatenate(ts_parts),
+                                             np.concatenate(value_parts, axis=1), verified=True)
+            summary['candles_filled'] += self.kline_store.partition_status(symbol, interval, day)['actual'] - status['actual']
+            summary['days_repaired'] += 1
+        
+        if summary['days_repaired']:
+            # The consolidated series still holds the old partitions
+            self.kline_store.drop_series(symbol, interval)
+            self._mapped.pop((symbol, interval), None)
+            print(f"🩹 Repaired {summary['days_repaired']} day(s) of {symbol} {interval}: "
+                  f"{summary['candles_filled']} missing candle(s) filled with {summary['requests']} request(s)")
+        return summary
+    
+    def _ensure_complete(self, symbol: str, interval: str, days: List[int]):
+        """Repair incomplete cached days; in strict mode raise if any stay incomplete"""
+        if not self.kline_store.incomplete_days(symbol, interval, days):
+            return
+        failed = self.repair_klines(symbol, interval, days)['failed']
+        if failed and self.strict:
+            raise KlineFetchError(f"{symbol} {interval}: {len(failed)} cached day(s) still have gaps")
+    
+    def prefetch_klines(self, requests: List[Tuple[str, datetime, datetime]],
+                        interval: str = "1m") -> int:
+        """
+        Concurrently fetch all uncached day partitions for many windows
+        
+        Overlapping windows are merged per symbol and only the uncached
+        days they touch are downloaded with the async fetcher, then written
+        to the kline store. Days that are still in progress are left to the
+        regular fetch path.
+        
+        Args:
+            requests: (symbol, start_time, end_time) windows
+            interval: Kline interval
             
-            # Clean up data types
-            numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        Returns:
+            Number of day partitions written
+        """
+        windows = {}
+        for symbol, start_time, end_time in requests:
+            windows.setdefault(symbol, []).append(
+                (int(start_time.timestamp() * 1000), int(end_time.timestamp() * 1000))
+            )
+        return self.run_fetch_plan(self.plan_fetch(windows, interval))
+    
+    def plan_fetch(self, windows: Dict[str, List[Tuple[int, int]]], interval: str = "1m") -> FetchPlan:
+        """
+        Plan the downloads needed to cover kline windows
+        
+        Days that can be rolled up from cached 1m klines are materialized
+        first, so they do not show up in the plan.
+        
+        Args:
+            windows: Symbol -> inclusive (start_ms, end_ms) windows
+            interval: Kline interval
             
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+        Returns:
+            FetchPlan with the uncached day runs
+        """
+        if can_roll_up(interval):
+            for symbol, symbol_windows in windows.items():
+                days = window_days(merge_windows(symbol_windows))
+                self._roll_up(symbol, interval, [day for day in days
+                                                 if not self.kline_store.has_partition(symbol, interval, day)])
+        return FetchPlan.build(windows, self.kline_store, interval)
+    
+    def run_fetch_plan(self, plan: FetchPlan) -> int:
+        """
+        Download the day runs of a fetch plan concurrently into the kline store
+        
+        Returns:
+            Number of day partitions written
+        """
+        if not plan.jobs:
+            return 0
+        
+        symbols = {job['symbol'] for job in plan.jobs}
+        print(f"🌐 Prefetching {sum(len(job['days']) for job in plan.jobs)} day(s) of {plan.interval} klines "
+              f"for {len(symbols)} symbol(s)")
+        
+        results = fetch_klines_concurrently(
+            [(job['symbol'], plan.interval, job['start_ms'], job['end_ms']) for job in plan.jobs],
+            as_frames=False,
+            base_url=self.api_url,
+            max_concurrency=self.max_concurrency,
+            rate_limiter=self.rate_limiter
+        )
+        
+        written = 0
+        for job, arrays in zip(plan.jobs, results):
+            if arrays is None:
+                continue
+            self.kline_store.write_days(job['symbol'], plan.interval, arrays[0], arrays[1], job['days'])
+            written += len(job['days'])
+        
+        print(f"✅ Prefetched {written} day(s)")
+        return written
+    
+    def get_mapped_klines(self, symbol: str, interval: str = "1m",
+                          refresh: bool = True) -> Optional[MappedKlines]:
+        """
+        Get a shared read-only memory-mapped handle on cached klines
+        
+        Handles are kept per symbol/interval, so the outcome evaluator and
+        analytics can share one mapping across all signals.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTCUSDT')
+            interval: Kline interval
+            refresh: Consolidate newly cached days into the series first
             
-            # Cache the data
-            df.to_csv(cache_file, index=False)
-            print(f"✅ Cached data to: {cache_file}")
+        Returns:
+            MappedKlines handle, or None if nothing is cached
+        """
+        key = (symbol, interval)
+        if refresh or key not in self._mapped:
+            handle = self.kline_store.open_mapped(symbol, interval, refresh=refresh)
+            if handle is None:
+                return None
+            self._mapped[key] = handle
+        return self._mapped[key]
+    
+    def _closed_days(self, start_ms: int, end_ms: int) -> List[int]:
+        """Day partitions of [start_ms, end_ms) that have started (and can be mapped)"""
+        now_ms = int(time.time() * 1000)
+        return [day for day in self.kline_store.days_in_range(start_ms, end_ms)
+                if day * DAY_MS < now_ms]
+    
+    def _indexed_series(self, symbol: str, start_time: datetime, end_time: datetime,
+                        interval: str = "1m"):
+        """
+        Whole mapped series with its range index, if it covers a window
+        
+        Returns:
+            Tuple of (timestamps, high, low, RangeExtremeIndex), or None
+        """
+        start_ts = int(start_time.timestamp() * 1000)
+        end_ts = int(end_time.timestamp() * 1000)
+        handle = self.get_mapped_klines(symbol, interval, refresh=False)
+        if handle is None or not handle.covers(self._closed_days(start_ts, end_ts + 1)):
+            return None
+        return handle.timestamps, handle.high, handle.low, handle.range_index()
+    
+    def _load_window_arrays(self, symbol: str, start_time: datetime, end_time: datetime,
+                            interval: str = "1m",
+                            consolidate: bool = False,
+                            days: Optional[List[int]] = None) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Load (timestamps, high, low) for a window without building a DataFrame
+        
+        Windows covered by the memory-mapped series are returned as views;
+        other windows (e.g. touching an in-progress day) are stitched from
+        the day partitions in memory.
+        
+        Args:
+            symbol: Trading pair
+            start_time: Start datetime
+            end_time: End datetime (inclusive)
+            interval: Kline interval
+            consolidate: Rebuild the mapped series if it does not cover the window
+            days: Only these day partitions are needed (e.g. the days of merged
+                  signal windows); other days in the window are not fetched
             
-            # Rate limiting
-            time.sleep(0.1)
+        Returns:
+            Tuple of arrays, or None if no data is available
+        """
+        print(f"📊 Fetching {symbol} data from {start_time} to {end_time}")
+        
+        start_ts = int(start_time.timestamp() * 1000)
+        end_ts = int(end_time.timestamp() * 1000)
+        arrays = None
+        
+        try:
+            pending = self._fetch_missing_days(symbol, interval, start_ts, end_ts + 1, days=days)
             
-            return df
+            if not pending:
+                needed = self._closed_days(start_ts, end_ts + 1)
+                if days is not None:
+                    needed = sorted(set(needed).intersection(days))
+                handle = self.get_mapped_klines(symbol, interval, refresh=False)
+                if consolidate and (handle is None or not handle.covers(needed)):
+                    handle = self.get_mapped_klines(symbol, interval, refresh=True)
+                if handle is not None and handle.covers(needed):
+                    arrays = handle.slice(start_ts, end_ts + 1)
             
+            if arrays is None:
+                timestamps, values = self.kline_store.read_range(
+                    symbol, interval, start_ts, end_ts + 1, extra=pending
+                )
+                arrays = (timestamps, values[COLUMNS.index('high')], values[COLUMNS.index('low')])
+                
         except Exception as e:
             print(f"❌ Error fetching {symbol}: {e}")
-            return pd.DataFrame()
+            if self.strict:
+                if isinstance(e, KlineFetchError):
+                    raise
+                raise KlineFetchError(f"{symbol} {interval}: {e}") from e
+            return None
+        
+        if len(arrays[0]) == 0:
+            print(f"⚠️ No data found for {symbol}")
+            return None
+        
+        return arrays
+    
+    def _fine_arrays(self, symbol: str, start_ms: int, end_ms: int,
+                     interval: str = "1m") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (timestamps, high, low) of candles with open time in [start_ms, end_ms]
+        
+        Read from the kline store when every day is cached, otherwise only
+        this range is downloaded (and not cached, as it is not a full day).
+        """
+        if self.kline_store.missing_days(symbol, interval, start_ms, end_ms + 1):
+            try:
+                timestamps, values = self._request_klines(symbol, interval, start_ms, end_ms)
+            except Exception as e:
+                if self.strict:
+                    raise KlineFetchError(f"{symbol} {interval}: {e}") from e
+                raise
+            keep = (timestamps >= start_ms) & (timestamps <= end_ms)
+            timestamps, values = timestamps[keep], values[:, keep]
+        else:
+            self._ensure_complete(symbol, interval, self.kline_store.days_in_range(start_ms, end_ms + 1))
+            timestamps, values = self.kline_store.read_range(symbol, interval, start_ms, end_ms + 1)
+        return timestamps, values[COLUMNS.index('high')], values[COLUMNS.index('low')]
+    
+    def _evaluate_coarse(self, levels: Dict, coarse_arrays, end_ms: int,
+                         previous: Optional[Dict] = None,
+                         resolve: Optional[Callable] = None) -> Dict:
+        """Evaluate a signal on coarse_interval bars, refining to 1m where a level is reached"""
+        if coarse_arrays is None:
+            if resume_point(previous) is not None:
+                return dict(previous)
+            return no_data_outcome(levels, 'NO_DATA')
+        
+        coarse_ms, coarse_highs, coarse_lows = coarse_arrays
+        return evaluate_signal_coarse(
+            levels, coarse_ms, coarse_highs, coarse_lows, INTERVAL_MS[self.coarse_interval],
+            lambda start_ms, stop_ms: self._fine_arrays(levels['pair'], start_ms, stop_ms),
+            end_ms, previous=previous, resolve=resolve
+        )
+    
+    def _evaluate_tracked(self, idx: int, evaluate: Callable, resolve: Optional[Callable],
+                          ties: List) -> Dict:
+        """
+        Run evaluate(resolve=...), remembering it in ties when it asked for
+        an intrabar minute that is not cached yet
+        """
+        if resolve is None:
+            return evaluate()
+        misses = self.intrabar.misses
+        outcome = evaluate(resolve=resolve)
+        if self.intrabar.misses > misses:
+            ties.append((idx, evaluate, resolve))
+        return outcome
+    
+    def _fetch_intrabar(self) -> int:
+        """
+        Download the pending tied minutes at 1s into the intrabar cache
+        
+        Returns:
+            Number of minutes cached
+        """
+        now_ms = int(time.time() * 1000)
+        jobs = [(symbol, [minute for minute in run if minute + MINUTE_MS <= now_ms])
+                for symbol, runs in self.intrabar.pending_runs().items() for run in runs]
+        jobs = [(symbol, run) for symbol, run in jobs if run]
+        if not jobs:
+            return 0
+        
+        print(f"🔬 Fetching {RESOLUTION} klines for {sum(len(run) for _, run in jobs)} tied minute(s)")
+        requests = [(symbol, RESOLUTION, run[0], run[-1] + MINUTE_MS - 1) for symbol, run in jobs]
+        
+        if self.async_fetch:
+            results = fetch_klines_concurrently(
+                requests,
+                as_frames=False,
+                base_url=self.api_url,
+                max_concurrency=self.max_concurrency,
+                rate_limiter=self.rate_limiter
+            )
+        else:
+            results = []
+            for request in requests:
+                try:
+                    results.append(self._request_klines(*request))
+                except Exception as e:
+                    print(f"❌ Error fetching {request[0]}: {e}")
+                    results.append(None)
+        
+        cached = 0
+        for (symbol, run), arrays in zip(jobs, results):
+            if arrays is None:
+                continue
+            self.intrabar.write_minutes(symbol, run, *arrays)
+            cached += len(run)
+        return cached
+    
+    def _resolve_ties(self, ties: List, outcomes: List):
+        """Fetch the minutes tied evaluations asked for, then evaluate those signals again"""
+        if not ties:
+            return
+        
+        try:
+            self._fetch_intrabar()
+        except Exception as e:
+            print(f"⚠️ {RESOLUTION} fetch failed, keeping stop-loss-first results: {e}")
+            return
+        
+        changed = 0
+        for idx, evaluate, resolve in ties:
+            try:
+                outcome = evaluate(resolve=resolve)
+            except Exception as e:
+                print(f"❌ Error re-evaluating tied signal #{idx}: {e}")
+                continue
+            changed += outcome != outcomes[idx]
+            outcomes[idx] = outcome
+        print(f"🔍 Re-checked {len(ties)} tied exit candle(s) on {RESOLUTION} klines, {changed} outcome(s) changed")
     
     def check_signal_outcome(self, signal: Dict, lookforward_hours: int = 72) -> Dict:
         """
@@ -103,184 +633,366 @@ class BinanceDataFetcher:
         Returns:
             Dictionary with outcome analysis
         """
-        # Only add USDT if not already present
-        symbol = signal['symbol'] if signal['symbol'].endswith('USDT') else signal['symbol'] + 'USDT'
-        entry_price = float(signal['entry_price'])
-        stop_loss = float(signal['stop_loss']) if signal['stop_loss'] else None
-        target1 = float(signal['target1']) if signal['target1'] else None
-        target2 = float(signal['target2']) if signal['target2'] else None
-        target3 = float(signal['target3']) if signal['target3'] else None
-        action = signal['action']
-        
-        # Parse signal timestamp (ensure timezone-aware)
-        signal_time = pd.to_datetime(signal['timestamp'])
-        if signal_time.tz is None:
-            signal_time = signal_time.tz_localize('UTC')
+        levels = parse_signal(signal)
+        signal_time = levels['signal_time']
         end_time = signal_time + timedelta(hours=lookforward_hours)
+        resolve = self.intrabar.resolver(levels['pair']) if self.intrabar else None
         
-        # Fetch data
-        df = self.get_kline_data(symbol, signal_time, end_time, interval="1m")
-        
-        if df.empty:
-            return {
-                'signal_id': signal['message_id'],
-                'symbol': signal['symbol'],
-                'status': 'NO_DATA',
-                'entry_price': entry_price,
-                'outcome': 'NO_DATA'
-            }
-        
-        # Filter data after signal time (ensure timezone-aware comparison)
-        if hasattr(signal_time, 'tz_localize') and signal_time.tz is None:
-            signal_time = signal_time.tz_localize('UTC')
-        elif isinstance(signal_time, str):
-            signal_time = pd.to_datetime(signal_time, utc=True)
-        
-        # Ensure DataFrame timestamp is timezone-aware
-        if df['timestamp'].dt.tz is None:
-            df['timestamp'] = df['timestamp'].dt.tz_localize('UTC')
-        
-        df = df[df['timestamp'] >= signal_time].copy()
-        if df.empty:
-            return {
-                'signal_id': signal['message_id'],
-                'symbol': signal['symbol'],
-                'status': 'NO_DATA_AFTER_SIGNAL',
-                'entry_price': entry_price,
-                'outcome': 'NO_DATA'
-            }
-        
-        outcome = {
-            'signal_id': signal['message_id'],
-            'symbol': signal['symbol'],
-            'action': action,
-            'signal_time': signal_time,
-            'entry_price': entry_price,
-            'stop_loss': stop_loss,
-            'target1': target1,
-            'target2': target2,
-            'target3': target3,
-            'status': 'ACTIVE',
-            'outcome': 'ONGOING',
-            'hit_target1': False,
-            'hit_target2': False,
-            'hit_target3': False,
-            'hit_stop_loss': False,
-            'target1_time': None,
-            'target2_time': None,
-            'target3_time': None,
-            'stop_loss_time': None,
-            'target1_minutes': None,
-            'target2_minutes': None,
-            'target3_minutes': None,
-            'stop_loss_minutes': None,
-            'max_profit_pct': 0,
-            'max_drawdown_pct': 0,
-            'final_outcome': 'ONGOING'
-        }
-        
-        # Check each candle
-        for idx, row in df.iterrows():
-            timestamp = row['timestamp']
-            high = row['high']
-            low = row['low']
+        if self.coarse_interval:
+            # Include the coarse bar that contains the signal time
+            bar = timedelta(milliseconds=INTERVAL_MS[self.coarse_interval])
+            coarse_arrays = self._load_window_arrays(levels['pair'], signal_time - bar, end_time,
+                                                     interval=self.coarse_interval)
+            evaluate = partial(self._evaluate_coarse, levels, coarse_arrays, end_time.value // 1_000_000)
+        else:
+            # Fetch data as read-only arrays (no per-signal DataFrame)
+            arrays = self._load_window_arrays(levels['pair'], signal_time, end_time, interval="1m")
             
-            minutes_elapsed = (timestamp - signal_time).total_seconds() / 60
+            if arrays is None:
+                return no_data_outcome(levels, 'NO_DATA')
             
-            if action == 'LONG':
-                # Calculate profit/loss percentages
-                profit_pct = ((high - entry_price) / entry_price) * 100
-                drawdown_pct = ((low - entry_price) / entry_price) * 100
-                
-                # Update max profit and drawdown
-                outcome['max_profit_pct'] = max(outcome['max_profit_pct'], profit_pct)
-                outcome['max_drawdown_pct'] = min(outcome['max_drawdown_pct'], drawdown_pct)
-                
-                # Check stop loss first (if hit, position closes)
-                if stop_loss and low <= stop_loss and not outcome['hit_stop_loss']:
-                    outcome['hit_stop_loss'] = True
-                    outcome['stop_loss_time'] = timestamp
-                    outcome['stop_loss_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'STOP_LOSS'
-                    outcome['status'] = 'CLOSED'
-                    break
-                
-                # Check targets (in order) - CLOSE POSITION when target is hit
-                if target1 and high >= target1 and not outcome['hit_target1']:
-                    outcome['hit_target1'] = True
-                    outcome['target1_time'] = timestamp
-                    outcome['target1_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'TARGET1'
-                    # Continue to check for higher targets in same candle
-                
-                if target2 and high >= target2 and not outcome['hit_target2']:
-                    outcome['hit_target2'] = True
-                    outcome['target2_time'] = timestamp
-                    outcome['target2_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'TARGET2'
-                    # Continue to check for Target 3 in same candle
-                
-                if target3 and high >= target3 and not outcome['hit_target3']:
-                    outcome['hit_target3'] = True
-                    outcome['target3_time'] = timestamp
-                    outcome['target3_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'TARGET3'
-                    outcome['status'] = 'CLOSED'
-                    break  # Exit on Target 3 (highest target)
-                
-                # If any target was hit in this candle, position should close
-                if outcome['hit_target1'] or outcome['hit_target2'] or outcome['hit_target3']:
-                    outcome['status'] = 'CLOSED'
-                    break
-            
-            else:  # SHORT
-                # Calculate profit/loss percentages (inverted for shorts)
-                profit_pct = ((entry_price - low) / entry_price) * 100
-                drawdown_pct = ((entry_price - high) / entry_price) * 100
-                
-                # Update max profit and drawdown
-                outcome['max_profit_pct'] = max(outcome['max_profit_pct'], profit_pct)
-                outcome['max_drawdown_pct'] = min(outcome['max_drawdown_pct'], drawdown_pct)
-                
-                # Check stop loss first
-                if stop_loss and high >= stop_loss and not outcome['hit_stop_loss']:
-                    outcome['hit_stop_loss'] = True
-                    outcome['stop_loss_time'] = timestamp
-                    outcome['stop_loss_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'STOP_LOSS'
-                    outcome['status'] = 'CLOSED'
-                    break
-                
-                # Check targets (in order) - CLOSE POSITION when target is hit
-                if target1 and low <= target1 and not outcome['hit_target1']:
-                    outcome['hit_target1'] = True
-                    outcome['target1_time'] = timestamp
-                    outcome['target1_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'TARGET1'
-                    # Continue to check for higher targets in same candle
-                
-                if target2 and low <= target2 and not outcome['hit_target2']:
-                    outcome['hit_target2'] = True
-                    outcome['target2_time'] = timestamp
-                    outcome['target2_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'TARGET2'
-                    # Continue to check for Target 3 in same candle
-                
-                if target3 and low <= target3 and not outcome['hit_target3']:
-                    outcome['hit_target3'] = True
-                    outcome['target3_time'] = timestamp
-                    outcome['target3_minutes'] = minutes_elapsed
-                    outcome['final_outcome'] = 'TARGET3'
-                    outcome['status'] = 'CLOSED'
-                    break  # Exit on Target 3 (highest target)
-                
-                # If any target was hit in this candle, position should close
-                if outcome['hit_target1'] or outcome['hit_target2'] or outcome['hit_target3']:
-                    outcome['status'] = 'CLOSED'
-                    break
+            # Scan NumPy arrays instead of iterating DataFrame rows
+            timestamps_ms, highs, lows = arrays
+            evaluate = partial(evaluate_signal, levels, timestamps_ms, highs, lows)
+            if self.use_range_index:
+                indexed = self._indexed_series(levels['pair'], signal_time, end_time)
+                if indexed is not None:
+                    timestamps_ms, highs, lows, index = indexed
+                    evaluate = partial(evaluate_signal, levels, timestamps_ms, highs, lows,
+                                       end_time.value // 1_000_000, index=index)
+        
+        ties = []
+        outcomes = [self._evaluate_tracked(0, evaluate, resolve, ties)]
+        self._resolve_ties(ties, outcomes)
+        outcome = outcomes[0]
         
+        # The window holds no 1m candles at all, which the 1m path reports as NO_DATA
+        if self.coarse_interval and outcome.get('status') == 'NO_DATA_AFTER_SIGNAL':
+            return no_data_outcome(levels, 'NO_DATA')
         return outcome
+
+    def _group_by_pair(self, signals: List[Dict], lookforward_hours: int,
+                       previous: Optional[List[Optional[Dict]]] = None):
+        """
+        Group parsed signals by trading pair
+
+        Signals whose previous outcome is settled are left out, and
+        ONGOING ones only need candles after their last evaluated candle.
+
+        Returns:
+            Tuple of (pair -> [(index, levels)], pair -> merged inclusive
+            (start_ms, end_ms) windows of the pair's remaining signals,
+            indexes of settled signals)
+        """
+        groups = {}
+        starts = {}
+        settled = []
+        window = timedelta(hours=lookforward_hours)
+
+        for idx, signal in enumerate(signals):
+            try:
+                levels = parse_signal(signal)
+            except Exception as e:
+                print(f"❌ Error parsing signal {signal.get('message_id')}: {e}")
+                continue
+
+            prior = previous[idx] if previous else None
+            end_ms = (levels['signal_time'] + window).value // 1_000_000
+            if is_settled(prior, end_ms):
+                settled.append(idx)
+                continue
+
+            resume_ms = resume_point(prior)
+            start = (levels['signal_time'] if resume_ms is None
+                     else pd.Timestamp(resume_ms + 1, unit='ms', tz='UTC'))
+            groups.setdefault(levels['pair'], []).append((idx, levels))
+            starts[idx] = start
+
+        windows = {
+            pair: merge_windows(
+                (starts[idx].value // 1_000_000, (levels['signal_time'] + window).value // 1_000_000)
+                for idx, levels in members
+            )
+            for pair, members in groups.items()
+        }
+        return groups, windows, settled
+
+    @staticmethod
+    def _window_hull(pair_windows: List[Tuple[int, int]]) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """(start_time, end_time) spanning a pair's merged windows"""
+        return (pd.Timestamp(pair_windows[0][0], unit='ms', tz='UTC'),
+                pd.Timestamp(pair_windows[-1][1], unit='ms', tz='UTC'))
+
+    def _prefetch_windows(self, windows: Dict[str, List[Tuple[int, int]]],
+                          interval: str = "1m") -> int:
+        """Plan and prefetch pair windows, falling back to the sequential path on failure"""
+        try:
+            plan = self.plan_fetch(windows, interval)
+            plan.print_summary()
+            return self.run_fetch_plan(plan)
+        except Exception as e:
+            print(f"⚠️ Async prefetch failed, falling back to sequential fetch: {e}")
+            return 0
+
+    def plan_signal_klines(self, signals: List[Dict], lookforward_hours: int = 72,
+                           previous: Optional[List[Optional[Dict]]] = None) -> FetchPlan:
+        """
+        Plan the 1m downloads needed to evaluate signals, without fetching
+
+        Args:
+            signals: List of signal dictionaries
+            lookforward_hours: How many hours to look forward from signal time
+            previous: Earlier outcomes aligned with signals (see check_signal_outcomes)
+
+        Returns:
+            FetchPlan (see FetchPlan.summary for request and byte estimates)
+        """
+        _, windows, _ = self._group_by_pair(signals, lookforward_hours, previous)
+        return self.plan_fetch(windows)
+
+    def prefetch_signal_klines(self, signals: List[Dict], lookforward_hours: int = 72,
+                               previous: Optional[List[Optional[Dict]]] = None) -> int:
+        """
+        Download every uncached kline day needed to evaluate signals
+
+        Lets a parent process fill the cache once before handing signals
+        to workers that only read it.
+
+        Args:
+            signals: List of signal dictionaries
+            lookforward_hours: How many hours to look forward from signal time
+            previous: Earlier outcomes aligned with signals (see check_signal_outcomes)
+
+        Returns:
+            Number of day partitions written
+        """
+        _, windows, _ = self._group_by_pair(signals, lookforward_hours, previous)
+        return self._prefetch_windows(windows)
+
+    def load_compact_klines(self, signals: List[Dict], lookforward_hours: int = 72,
+                            float32: bool = True) -> Dict[str, CompactKlines]:
+        """
+        Load the 1m klines of every signal window into resident compact containers
+        
+        One container per pair spans all of its signal windows, so a
+        parameter sweep can evaluate many signal variants with
+        check_signal_outcomes(..., klines=...) without reading the cache again.
+        
+        Args:
+            signals: List of signal dictionaries
+            lookforward_hours: How many hours to look forward from signal time
+            float32: Store prices and volumes as float32 (see CompactKlines)
+            
+        Returns:
+            Mapping of trading pair to CompactKlines (pairs without data are left out)
+        """
+        groups, windows, _ = self._group_by_pair(signals, lookforward_hours)
+        if self.async_fetch:
+            self._prefetch_windows(windows)
+        
+        klines = {}
+        for pair in groups:
+            start_time, end_time = self._window_hull(windows[pair])
+            compact = self.get_compact_klines(pair, start_time, end_time, float32=float32)
+            if compact is not None:
+                klines[pair] = compact
+        return klines
     
+    def check_signal_outcomes(self, signals: List[Dict],
+                              lookforward_hours: int = 72,
+                              previous: Optional[List[Optional[Dict]]] = None,
+                              klines: Optional[Dict] = None) -> List[Optional[Dict]]:
+        """
+        Check many signals, loading one kline range per symbol
+
+        Signals are grouped by trading pair. For each pair a single 1m range
+        spanning all signal windows is loaded (only the days the merged
+        windows touch are fetched), and every signal is evaluated against
+        the shared (memory-mapped) arrays using index offsets.
+
+        With previous outcomes (e.g. from an earlier run), closed and fully
+        evaluated signals are reused as they are, and ONGOING signals are
+        continued from their last evaluated candle, so only newer klines
+        are loaded.
+
+        With coarse_interval set, one coarse range is loaded per pair instead
+        and 1m candles only for the coarse bars that reach a level.
+
+        With resolve_intrabar set, exit candles that touched both the stop
+        loss and a target are collected during the scan, their minutes are
+        fetched at 1s in one batch, and only those signals are evaluated
+        again to find which level was reached first.
+
+        With klines given, signals are evaluated against those resident
+        containers only (see load_compact_klines) and nothing is loaded.
+
+        Args:
+            signals: List of signal dictionaries
+            lookforward_hours: How many hours to look forward from signal time
+            previous: Earlier outcomes aligned with signals (None entries
+                      are evaluated from scratch)
+            klines: Mapping of trading pair to CompactKlines or MappedKlines;
+                    signals of pairs that are missing come out as NO_DATA
+
+        Returns:
+            Outcome dictionaries in the same order as signals
+            (None for signals that could not be evaluated)
+        """
+        outcomes = [None] * len(signals)
+        groups, windows, settled = self._group_by_pair(signals, lookforward_hours, previous)
+        window = timedelta(hours=lookforward_hours)
+
+        ties = []  # evaluations waiting for intrabar minutes
+
+        for idx in settled:
+            outcomes[idx] = previous[idx]
+
+        if klines is not None:
+            self._check_resident(groups, klines, window, previous, outcomes, ties)
+            self._resolve_ties(ties, outcomes)
+            return outcomes
+
+        if self.coarse_interval:
+            self._check_coarse(groups, windows, window, previous, outcomes, ties)
+            self._resolve_ties(ties, outcomes)
+            return outcomes
+
+        if self.async_fetch:
+            self._prefetch_windows(windows)
+
+        for pair, members, arrays in self._pair_arrays(groups, windows):
+            if arrays is None:
+                for idx, levels in members:
+                    prior = previous[idx] if previous else None
+                    outcomes[idx] = (dict(prior) if resume_point(prior) is not None
+                                    else no_data_outcome(levels, 'NO_DATA'))
+                continue
+
+            timestamps_ms, highs, lows, index = arrays
+            resolve = self.intrabar.resolver(pair) if self.intrabar else None
+
+            for idx, levels in members:
+                end_ms = (levels['signal_time'] + window).value // 1_000_000
+                evaluate = partial(evaluate_signal, levels, timestamps_ms, highs, lows, end_ms,
+                                   previous=previous[idx] if previous else None, index=index)
+                try:
+                    outcomes[idx] = self._evaluate_tracked(idx, evaluate, resolve, ties)
+                except Exception as e:
+                    print(f"❌ Error evaluating signal {levels['signal_id']}: {e}")
+
+        self._resolve_ties(ties, outcomes)
+        return outcomes
+
+    def _check_resident(self, groups: Dict, klines: Dict, window: timedelta,
+                        previous: Optional[List[Optional[Dict]]], outcomes: List, ties: List):
+        """check_signal_outcomes body for resident kline containers (nothing is loaded)"""
+        for pair, members in groups.items():
+            handle = klines.get(pair)
+            resolve = self.intrabar.resolver(pair) if self.intrabar else None
+            for idx, levels in members:
+                prior = previous[idx] if previous else None
+                if handle is None:
+                    outcomes[idx] = (dict(prior) if resume_point(prior) is not None
+                                    else no_data_outcome(levels, 'NO_DATA'))
+                    continue
+                end_ms = (levels['signal_time'] + window).value // 1_000_000
+                evaluate = partial(evaluate_klines, levels, handle, end_ms, previous=prior)
+                try:
+                    outcomes[idx] = self._evaluate_tracked(idx, evaluate, resolve, ties)
+                except Exception as e:
+                    print(f"❌ Error evaluating signal {levels['signal_id']}: {e}")
+    
+    def _check_coarse(self, groups: Dict, windows: Dict, window: timedelta,
+                      previous: Optional[List[Optional[Dict]]], outcomes: List, ties: List):
+        """check_signal_outcomes body for coarse-to-fine evaluation (one coarse load per pair)"""
+        # Include the coarse bar that contains each window start
+        bar_ms = INTERVAL_MS[self.coarse_interval]
+        windows = {pair: merge_windows((start - bar_ms, end) for start, end in pair_windows)
+                   for pair, pair_windows in windows.items()}
+        
+        if self.async_fetch:
+            self._prefetch_windows(windows, interval=self.coarse_interval)
+        
+        for pair, members in groups.items():
+            start_time, end_time = self._window_hull(windows[pair])
+            coarse_arrays = self._load_window_arrays(pair, start_time, end_time,
+                                                     interval=self.coarse_interval,
+                                                     days=window_days(windows[pair]))
+            resolve = self.intrabar.resolver(pair) if self.intrabar else None
+            for idx, levels in members:
+                end_ms = (levels['signal_time'] + window).value // 1_000_000
+                evaluate = partial(self._evaluate_coarse, levels, coarse_arrays, end_ms,
+                                   previous=previous[idx] if previous else None)
+                try:
+                    outcomes[idx] = self._evaluate_tracked(idx, evaluate, resolve, ties)
+                except KlineFetchError:
+                    raise
+                except Exception as e:
+                    print(f"❌ Error evaluating signal {levels['signal_id']}: {e}")
+    
+    def _pair_arrays(self, groups: Dict, windows: Dict):
+        """
+        Yield (pair, members, arrays) with one kline load per pair
+        
+        arrays is (timestamps, high, low, index) where index is a
+        RangeExtremeIndex over the whole mapped series when use_range_index
+        is set and the series covers the range, otherwise None with window
+        arrays; arrays is None if no klines are available.
+        """
+        for pair, members in groups.items():
+            start_time, end_time = self._window_hull(windows[pair])
+            arrays = self._load_window_arrays(pair, start_time, end_time, interval="1m",
+                                              consolidate=self.consolidate, days=window_days(windows[pair]))
+            if arrays is not None:
+                indexed = (self._indexed_series(pair, start_time, end_time)
+                           if self.use_range_index else None)
+                arrays = indexed or arrays + (None,)
+            yield pair, members, arrays
+
+    def check_signal_outcomes_multi(self, signals: List[Dict],
+                                    horizons: List[float]) -> List[Optional[Dict[float, Dict]]]:
+        """
+        Check many signals for several lookforward horizons at once
+
+        Klines are loaded once per pair for the longest horizon, and each
+        signal is scanned once; every horizon's outcome equals what
+        check_signal_outcomes would return for that lookforward_hours.
+
+        Args:
+            signals: List of signal dictionaries
+            horizons: Lookforward horizons in hours (e.g. [24, 72, 168])
+
+        Returns:
+            Per signal, a mapping of horizon to outcome dictionary
+            (None for signals that could not be evaluated)
+        """
+        outcomes = [None] * len(signals)
+        ties = []
+        groups, windows, _ = self._group_by_pair(signals, max(horizons))
+
+        if self.async_fetch:
+            self._prefetch_windows(windows)
+
+        for pair, members, arrays in self._pair_arrays(groups, windows):
+            if arrays is None:
+                for idx, levels in members:
+                    outcomes[idx] = {h: no_data_outcome(levels, 'NO_DATA') for h in horizons}
+                continue
+
+            timestamps_ms, highs, lows, index = arrays
+            resolve = self.intrabar.resolver(pair) if self.intrabar else None
+
+            for idx, levels in members:
+                evaluate = partial(evaluate_signal_horizons, levels, timestamps_ms, highs, lows, horizons,
+                                   index=index)
+                try:
+                    outcomes[idx] = self._evaluate_tracked(idx, evaluate, resolve, ties)
+                except Exception as e:
+                    print(f"❌ Error evaluating signal {levels['signal_id']}: {e}")
+
+        self._resolve_ties(ties, outcomes)
+        return outcomes
+
     def get_symbol_list(self) -> List[str]:
         """Get list of available trading symbols"""
         try:
@@ -0,0 +1,177 @@
+"""
+Compact Klines
+
+Struct-of-arrays kline container for keeping many symbols resident in
+memory, e.g. during parameter sweeps. Open times are stored as int32
+offsets in candles from the first candle, and prices and volumes can be
+kept as float32, which roughly halves the working set of the float64
+frames and arrays returned elsewhere.
+
+A container can be used wherever a MappedKlines handle is accepted
+(slice, window, high/low, range_index), including the outcome engine
+(see outcome_engine.evaluate_klines, which
+BinanceDataFetcher.check_signal_outcomes uses for containers from
+load_compact_klines) and the analytics classes.
+
+float32 values carry about 7 significant digits: a level within
+~1e-7 relative distance of a high or low can compare differently than
+on float64 data. Use float32=False when outcomes must match exactly.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+from .kline_store import COLUMNS, INTERVAL_MS, arrays_to_frame, with_all_columns
+from .range_index import RangeExtremeIndex
+
+
+class CompactKlines:
+    """Klines of one symbol as int32 candle offsets plus one array per column"""
+
+    def __init__(self, symbol: str, interval: str, epoch_ms: int,
+                 offsets: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Wrap prepared arrays (see from_arrays for building a container)
+
+        Args:
+            symbol: Trading pair
+            interval: Kline interval (fixed length, e.g. '1m')
+            epoch_ms: Open time of the candle at offset 0
+            offsets: Sorted int32 open-time offsets in candles from epoch_ms
+            columns: Column name -> values aligned with offsets
+        """
+        self.symbol = symbol
+        self.interval = interval
+        self.step_ms = INTERVAL_MS[interval]
+        self.epoch_ms = int(epoch_ms)
+        self.offsets = offsets
+        self.columns = columns
+        self._range_index = None
+
+    @classmethod
+    def from_arrays(cls, timestamps: np.ndarray, values: np.ndarray, symbol: str = "",
+                    interval: str = "1m", float32: bool = True) -> 'CompactKlines':
+        """
+        Build a container from (timestamps, values) arrays as used by the kline store
+
+        Args:
+            timestamps: Sorted open times in epoch ms
+            values: Matrix with a row per column in COLUMNS order (older
+                    five-row OHLCV matrices are accepted)
+            symbol: Trading pair
+            interval: Kline interval the open times are aligned to
+            float32: Store prices and volumes as float32 instead of float64
+
+        Returns:
+            CompactKlines
+
+        Raises:
+            ValueError: If the interval has no fixed length, or open times
+                        are not whole candles apart
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Interval {interval} has no fixed length")
+        step_ms = INTERVAL_MS[interval]
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        epoch_ms = int(timestamps[0]) if len(timestamps) else 0
+
+        relative = timestamps - epoch_ms
+        if np.any(relative % step_ms):
+            raise ValueError(f"Open times of {symbol or 'klines'} are not aligned to {interval} candles")
+        offsets = relative // step_ms
+        if len(offsets) and offsets[-1] > np.iinfo(np.int32).max:
+            raise ValueError(f"{interval} range of {symbol or 'klines'} is too long for int32 offsets")
+
+        dtype = np.float32 if float32 else np.float64
+        values = with_all_columns(np.asarray(values, dtype=np.float64))
+        columns = {name: np.ascontiguousarray(values[row], dtype=dtype) for row, name in enumerate(COLUMNS)}
+        return cls(symbol, interval, epoch_ms, offsets.astype(np.int32), columns)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, symbol: str = "", interval: str = "1m",
+                   float32: bool = True) -> 'CompactKlines':
+        """
+        Build a container from a get_kline_data DataFrame
+
+        Columns missing from the frame (e.g. quote_volume) are filled with NaN.
+        """
+        if df.empty:
+            timestamps = np.empty(0, dtype=np.int64)
+        else:
+            timestamps = pd.DatetimeIndex(pd.to_datetime(df['timestamp'], utc=True)).as_unit('ms').asi8
+        values = np.vstack([df[name].to_numpy(dtype=np.float64) if name in df else np.full(len(df), np.nan)
+                            for name in COLUMNS]) if len(df) else np.empty((len(COLUMNS), 0))
+        return cls.from_arrays(timestamps, values, symbol, interval, float32)
+
+    @classmethod
+    def from_mapped(cls, handle, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                    float32: bool = True) -> 'CompactKlines':
+        """
+        Copy a MappedKlines handle (or the candles in [start_ms, end_ms)) into a container
+        """
+        lo = 0 if start_ms is None else handle.window(start_ms, start_ms)[0]
+        hi = len(handle) if end_ms is None else handle.window(end_ms, end_ms)[0]
+        values = np.vstack([handle.column(name)[lo:hi] for name in COLUMNS])
+        return cls.from_arrays(handle.timestamps[lo:hi], values, handle.symbol, handle.interval, float32)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the offsets and columns"""
+        return self.offsets.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Open times in epoch ms (int64, computed on access)"""
+        return self.epoch_ms + self.offsets.astype(np.int64) * self.step_ms
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of one column"""
+        return self.columns[name]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.columns['high']
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.columns['low']
+
+    def range_index(self) -> RangeExtremeIndex:
+        """Range max/min index over the whole container (built on first use)"""
+        if self._range_index is None:
+            self._range_index = RangeExtremeIndex(self.high, self.low)
+        return self._range_index
+
+    def _position(self, ms: int) -> int:
+        """Index of the first candle whose open time is >= ms"""
+        offset = -(-(int(ms) - self.epoch_ms) // self.step_ms)
+        if offset <= 0:
+            return 0
+        if offset > self.offsets[-1]:
+            return len(self.offsets)
+        return int(np.searchsorted(self.offsets, offset, side='left'))
+
+    def window(self, start_ms: int, end_ms: int) -> Tuple[int, int]:
+        """Index bounds of candles with open time in [start_ms, end_ms)"""
+        if len(self.offsets) == 0:
+            return 0, 0
+        return self._position(start_ms), self._position(end_ms)
+
+    def slice(self, start_ms: int, end_ms: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(timestamps, high, low) for candles in [start_ms, end_ms); high/low are views"""
+        lo, hi = self.window(start_ms, end_ms)
+        timestamps = self.epoch_ms + self.offsets[lo:hi].astype(np.int64) * self.step_ms
+        return timestamps, self.high[lo:hi], self.low[lo:hi]
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(int64 open times, float64 matrix with a row per column), as used by the kline store"""
+        values = np.vstack([self.columns[name].astype(np.float64) for name in COLUMNS])
+        return self.timestamps, values
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame in the get_kline_data layout"""
+        return arrays_to_frame(*self.to_arrays())
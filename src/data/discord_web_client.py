@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
 
+from .rate_limiter import RateLimiter, get_shared_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,15 +22,17 @@ class DiscordWebClient:
     
     BASE_URL = "https://discord.com/api/v10"
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, rate_limiter: Optional[RateLimiter] = None):
         """
         Initialize the web client
         
         Args:
             token: Discord user token or bot token
+            rate_limiter: Request limiter (defaults to the process-wide one)
         """
         self.token = token
         self.session = requests.Session()
+        self.rate_limiter = rate_limiter or get_shared_limiter()
         
         # Setup headers to mimic browser/official client
         self.session.headers.update({
@@ -69,6 +73,40 @@ class DiscordWebClient:
         }
         return base64.b64encode(json.dumps(props).encode()).decode()
     
+    def _get(self, path: str, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        GET a REST path through the rate limiter, retrying when rate limited
+        
+        Args:
+            path: Path below BASE_URL
+            endpoint: Rate limiter key (e.g. 'discord:messages')
+            params: Query parameters
+            
+        Returns:
+            The last response (still 429 if the retries ran out)
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(endpoint)
+            response = self.session.get(f"{self.BASE_URL}{path}", params=params)
+            
+            retry_after = None
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json().get('retry_after', 1)
+                except ValueError:
+                    retry_after = None
+            
+            delay = self.rate_limiter.record_response(
+                endpoint, response.status_code, response.headers, attempt, retry_after
+            )
+            if delay is None:
+                return response
+            
+            logger.warning(f"Rate limited on {endpoint}, waiting {delay:.2f} seconds...")
+            time.sleep(delay)
+            attempt += 1
+    
     def test_connection(self) -> bool:
         """
         Test if the token is valid
@@ -97,15 +135,9 @@ class DiscordWebClient:
             List of guild data
         """
         try:
-            response = self.session.get(f"{self.BASE_URL}/users/@me/guilds")
+            response = self._get("/users/@me/guilds", 'discord:guilds')
             if response.status_code == 200:
                 return response.json()
-            elif response.status_code == 429:
-                # Rate limited
-                retry_after = response.json().get('retry_after', 1)
-                logger.warning(f"Rate limited on get_guilds, waiting {retry_after} seconds...")
-                time.sleep(retry_after)
-                return self.get_guilds()
             else:
                 logger.error(f"Failed to get guilds: {response.status_code}")
                 return []
@@ -124,15 +156,9 @@ class DiscordWebClient:
             List of channel data
         """
         try:
-            response = self.session.get(f"{self.BASE_URL}/guilds/{guild_id}/channels")
+            response = self._get(f"/guilds/{guild_id}/channels", 'discord:channels')
             if response.status_code == 200:
                 return response.json()
-            elif response.status_code == 429:
-                # Rate limited
-                retry_after = response.json().get('retry_after', 1)
-                logger.warning(f"Rate limited on get_guild_channels, waiting {retry_after} seconds...")
-                time.sleep(retry_after)
-                return self.get_guild_channels(guild_id)
             else:
                 logger.error(f"Failed to get channels: {response.status_code}")
                 return []
@@ -158,19 +184,14 @@ class DiscordWebClient:
             if before:
                 params['before'] = before
             
-            response = self.session.get(
-                f"{self.BASE_URL}/channels/{channel_id}/messages",
+            response = self._get(
+                f"/channels/{channel_id}/messages",
+                'discord:messages',
                 params=params
             )
             
             if response.status_code == 200:
                 return response.json()
-            elif response.status_code == 429:
-                # Rate limited
-                retry_after = response.json().get('retry_after', 1)
-                logger.warning(f"Rate limited, waiting {retry_after} seconds...")
-                time.sleep(retry_after)
-                return self.get_channel_messages(channel_id, limit, before)
             else:
                 logger.error(f"Failed to get messages: {response.status_code} - {response.text}")
                 return []
@@ -203,9 +224,6 @@ class DiscordWebClient:
             before_id = messages[-1]['id']
             
             logger.info(f"Fetched {len(all_messages)}/{total_limit} messages...")
-            
-            # Small delay to avoid rate limits
-            time.sleep(0.5)
         
         return all_messages
     
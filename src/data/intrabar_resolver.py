@@ -0,0 +1,156 @@
+"""
+Intrabar Resolver
+
+Second-level klines for the few 1m candles where a signal's stop loss
+and one of its targets were both touched. The outcome engine checks the
+stop loss first within a candle, which is pessimistic when both levels
+lie inside the candle's range; the 1s candles of that minute show which
+level was actually reached first.
+
+Only the minutes that are asked for are fetched and cached, never whole
+days, so the cost grows with the number of ties rather than with the
+length of the signal windows.
+
+Layout:
+    {root}/{symbol}/{YYYYMMDD}.npz   fetched minutes with their 1s candles
+"""
+
+import os
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .kline_store import COLUMNS, day_index, day_key, temp_path, with_all_columns
+
+MINUTE_MS = 60_000
+
+# Interval the tied minutes are re-checked on
+RESOLUTION = '1s'
+
+
+def minute_runs(minutes: List[int]) -> List[List[int]]:
+    """Group sorted minute open times (epoch ms) into runs of consecutive minutes"""
+    runs = []
+    for minute in minutes:
+        if runs and minute == runs[-1][-1] + MINUTE_MS:
+            runs[-1].append(minute)
+        else:
+            runs.append([minute])
+    return runs
+
+
+class IntrabarCache:
+    """Minute-granular cache of 1s klines, filled on demand for tied exit candles"""
+
+    def __init__(self, root: str = "data/cache/intrabar"):
+        """
+        Initialize the cache
+
+        Args:
+            root: Directory holding the per-day minute files
+        """
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        self._days = {}  # (symbol, day) -> (minutes, timestamps, values)
+        self.pending = set()  # (symbol, minute_ms) asked for but not cached
+        self.misses = 0  # resolve calls that found their minute uncached
+
+    def _path(self, symbol: str, day: int) -> str:
+        return os.path.join(self.root, symbol, f"{day_key(day)}.npz")
+
+    def _load_day(self, symbol: str, day: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        key = (symbol, day)
+        if key not in self._days:
+            path = self._path(symbol, day)
+            if os.path.exists(path):
+                with np.load(path) as data:
+                    self._days[key] = (data['minutes'], data['ts'], with_all_columns(data['ohlcv']))
+            else:
+                self._days[key] = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                                   np.empty((len(COLUMNS), 0), dtype=np.float64))
+        return self._days[key]
+
+    def has_minute(self, symbol: str, minute_ms: int) -> bool:
+        """Check whether a minute was fetched (it may hold no candles)"""
+        minutes = self._load_day(symbol, day_index(minute_ms))[0]
+        pos = int(np.searchsorted(minutes, minute_ms))
+        return pos < len(minutes) and minutes[pos] == minute_ms
+
+    def read_minute(self, symbol: str, minute_ms: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Candles inside one minute
+
+        Returns:
+            Tuple of (timestamps, values), or None if the minute is not cached
+        """
+        if not self.has_minute(symbol, minute_ms):
+            return None
+        _, timestamps, values = self._load_day(symbol, day_index(minute_ms))
+        lo = np.searchsorted(timestamps, minute_ms, side='left')
+        hi = np.searchsorted(timestamps, minute_ms + MINUTE_MS, side='left')
+        return timestamps[lo:hi], values[:, lo:hi]
+
+    def write_minutes(self, symbol: str, minutes: List[int],
+                      timestamps: np.ndarray, values: np.ndarray):
+        """
+        Add fetched minutes to the cache
+
+        Args:
+            symbol: Trading pair
+            minutes: Minute open times that were fetched (minutes without
+                     candles are recorded too, so they are not fetched again)
+            timestamps: Sorted open times of the fetched 1s candles
+            values: OHLCV matrix aligned with timestamps
+        """
+        by_day = {}
+        for minute in minutes:
+            by_day.setdefault(day_index(minute), []).append(minute)
+
+        for day, day_minutes in by_day.items():
+            old_minutes, old_ts, old_values = self._load_day(symbol, day)
+            lo = np.searchsorted(timestamps, day_minutes[0], side='left')
+            hi = np.searchsorted(timestamps, day_minutes[-1] + MINUTE_MS, side='left')
+
+            all_minutes = np.union1d(old_minutes, np.asarray(day_minutes, dtype=np.int64))
+            all_ts, first = np.unique(np.concatenate([old_ts, timestamps[lo:hi]]), return_index=True)
+            all_values = np.concatenate([old_values, values[:, lo:hi]], axis=1)[:, first]
+
+            path = self._path(symbol, day)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = temp_path(path)
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, minutes=all_minutes, ts=all_ts, ohlcv=all_values)
+            os.replace(tmp_path, path)
+
+            self._days[(symbol, day)] = (all_minutes, all_ts, all_values)
+            self.pending.difference_update((symbol, minute) for minute in day_minutes)
+
+    def resolver(self, symbol: str) -> Callable[[int], Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]]:
+        """
+        Resolve callback for the outcome engine (see outcome_engine.resolve_tie)
+
+        Uncached minutes are added to pending and left unresolved, so a
+        whole batch of signals can be scanned before anything is fetched.
+
+        Args:
+            symbol: Trading pair of the evaluated signals
+
+        Returns:
+            Callback (minute_ms) -> (timestamps, highs, lows), or None
+        """
+        def resolve(minute_ms: int):
+            cached = self.read_minute(symbol, minute_ms)
+            if cached is None:
+                self.pending.add((symbol, minute_ms))
+                self.misses += 1
+                return None
+            timestamps, values = cached
+            return timestamps, values[COLUMNS.index('high')], values[COLUMNS.index('low')]
+
+        return resolve
+
+    def pending_runs(self) -> Dict[str, List[List[int]]]:
+        """Pending minutes grouped per symbol into runs of consecutive minutes"""
+        by_symbol = {}
+        for symbol, minute in self.pending:
+            by_symbol.setdefault(symbol, []).append(minute)
+        return {symbol: minute_runs(sorted(minutes)) for symbol, minutes in by_symbol.items()}
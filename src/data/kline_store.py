@@ -0,0 +1,669 @@
+"""
+Kline Store
+
+Persistent, range-aware cache for Binance klines.
+
+Candles are partitioned by symbol, interval and UTC day and stored in a
+binary columnar layout: one int64 array of open times (epoch ms) and one
+float64 matrix with a row per column (OHLCV and quote volume). Partitions
+written before quote volume was kept read back with a NaN row for it. Range reads stitch the day
+partitions together, so overlapping windows never fetch or store the
+same candles twice.
+
+For evaluation over many signals, the partitions of a symbol can be
+consolidated into one contiguous series that is memory-mapped read-only
+(see MappedKlines), so windows are NumPy views instead of copies.
+
+Day partitions of coarser intervals (5m, 1h, 4h, ...) are rolled up
+locally from cached 1m partitions where possible instead of being
+downloaded again.
+
+Every partition has a manifest entry with its expected and actual
+candle counts, duplicate timestamps and the spans of missing candles
+(see audit_timestamps). A partition with gaps is incomplete until the
+gaps have been fetched again once; candles still missing after that
+are gaps on the exchange itself and the partition is marked verified.
+
+Layout:
+    {root}/{symbol}/{interval}/{YYYYMMDD}.ts.npy
+    {root}/{symbol}/{interval}/{YYYYMMDD}.ohlcv.npy
+    {root}/{symbol}/{interval}/{YYYYMMDD}.meta.json
+    {root}/{symbol}/{interval}/series/{first}_{last}_{days}_{stamp}.{ts,ohlcv,days}.npy
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from .range_index import RangeExtremeIndex
+
+DAY_MS = 86_400_000
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'quote_volume')
+
+# Field positions of open time and COLUMNS in a REST kline row / archive CSV line
+KLINE_FIELDS = (0, 1, 2, 3, 4, 5, 7)
+
+# How each column is combined when candles are rolled up
+ROLLUP_AGGREGATION = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum',
+    'quote_volume': 'sum',
+}
+
+# Fixed-length Binance intervals ('1M' has no fixed length)
+INTERVAL_MS = {
+    '1s': 1_000,
+    '1m': 60_000,
+    '3m': 180_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000,
+    '2h': 7_200_000,
+    '4h': 14_400_000,
+    '6h': 21_600_000,
+    '8h': 28_800_000,
+    '12h': 43_200_000,
+    '1d': DAY_MS,
+    '3d': 3 * DAY_MS,
+    '1w': 7 * DAY_MS,
+}
+
+# Interval that coarser day-aligned intervals are rolled up from
+ROLLUP_SOURCE = '1m'
+
+
+def temp_path(path: str) -> str:
+    """Temporary file name for writing path, unique to this process"""
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def day_index(ms: int) -> int:
+    """UTC day number (days since epoch) containing epoch ms"""
+    return int(ms) // DAY_MS
+
+
+def day_key(day: int) -> str:
+    """Partition key (YYYYMMDD) for a UTC day number"""
+    return datetime.fromtimestamp(day * DAY_MS / 1000, tz=timezone.utc).strftime('%Y%m%d')
+
+
+def contiguous_runs(days: List[int]) -> List[List[int]]:
+    """Group sorted day numbers into runs of consecutive days"""
+    runs = []
+    for day in days:
+        if runs and day == runs[-1][-1] + 1:
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    return runs
+
+
+def klines_to_arrays(klines: List[List]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert raw Binance kline rows to columnar arrays
+
+    Args:
+        klines: Rows as returned by the klines endpoint
+
+    Returns:
+        Tuple of (int64 open times in ms, float64 matrix with a row per column)
+    """
+    if not klines:
+        return np.empty(0, dtype=np.int64), np.empty((len(COLUMNS), 0), dtype=np.float64)
+
+    rows = np.asarray([[k[i] for i in KLINE_FIELDS] for k in klines], dtype=object)
+    timestamps = rows[:, 0].astype(np.int64)
+    values = rows[:, 1:].astype(np.float64).T.copy()
+    return timestamps, values
+
+
+def with_all_columns(values: np.ndarray) -> np.ndarray:
+    """Pad a values matrix written before the last columns were added with NaN rows"""
+    if len(values) >= len(COLUMNS):
+        return values
+    padding = np.full((len(COLUMNS) - len(values), values.shape[1]), np.nan)
+    return np.concatenate([values, padding])
+
+
+def can_roll_up(interval: str) -> bool:
+    """Whether an interval can be built from ROLLUP_SOURCE day partitions"""
+    interval_ms = INTERVAL_MS.get(interval)
+    return (interval_ms is not None and interval_ms > INTERVAL_MS[ROLLUP_SOURCE]
+            and DAY_MS % interval_ms == 0)
+
+
+def resample_arrays(timestamps: np.ndarray, values: np.ndarray,
+                    interval: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate candles into a coarser fixed-length interval
+
+    Bars are aligned to multiples of the interval since the epoch, like
+    Binance's own day-aligned intervals: first open, highest high, lowest
+    low, last close and summed volumes of the candles in each bar.
+
+    Args:
+        timestamps: Sorted open times of the source candles
+        values: OHLCV matrix aligned with timestamps
+        interval: Target interval (e.g. '15m', '1h', '4h')
+
+    Returns:
+        Tuple of (bar open times, OHLCV matrix); bars without candles are left out
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((len(COLUMNS), 0), dtype=np.float64)
+
+    interval_ms = INTERVAL_MS[interval]
+    buckets = timestamps - timestamps % interval_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(timestamps)]
+
+    rolled = np.empty((len(COLUMNS), len(starts)), dtype=np.float64)
+    for row, column in enumerate(COLUMNS):
+        how = ROLLUP_AGGREGATION[column]
+        if how == 'first':
+            rolled[row] = values[row][starts]
+        elif how == 'last':
+            rolled[row] = values[row][ends - 1]
+        else:
+            reduce = {'max': np.maximum, 'min': np.minimum, 'sum': np.add}[how]
+            rolled[row] = reduce.reduceat(values[row], starts)
+    return buckets[starts], rolled
+
+
+def audit_timestamps(timestamps: np.ndarray, interval: str, day: int) -> Dict:
+    """
+    Check the candles of one day partition for completeness
+
+    Args:
+        timestamps: Open times stored in the partition
+        interval: Kline interval
+        day: Day number of the partition
+
+    Returns:
+        Dictionary with expected (None for intervals that do not divide a
+        day), actual (distinct candles), duplicates, and gaps as inclusive
+        [start_ms, end_ms] open-time spans of missing candles
+    """
+    unique = np.unique(timestamps)
+    report = {
+        'expected': None,
+        'actual': int(len(unique)),
+        'duplicates': int(len(timestamps) - len(unique)),
+        'gaps': []
+    }
+
+    interval_ms = INTERVAL_MS.get(interval)
+    if interval_ms is None or DAY_MS % interval_ms:
+        return report
+
+    grid = np.arange(day * DAY_MS, (day + 1) * DAY_MS, interval_ms, dtype=np.int64)
+    missing = np.setdiff1d(grid, unique)
+    report['expected'] = int(len(grid))
+    if len(missing):
+        breaks = np.flatnonzero(np.diff(missing) != interval_ms)
+        starts = np.r_[missing[0], missing[breaks + 1]]
+        ends = np.r_[missing[breaks], missing[-1]]
+        report['gaps'] = [[int(start), int(end)] for start, end in zip(starts, ends)]
+    return report
+
+
+def partition_complete(status: Dict) -> bool:
+    """Whether a manifest entry describes usable data (no open gaps or duplicates)"""
+    return status['verified'] or (not status['gaps'] and not status['duplicates'])
+
+
+def arrays_to_frame(timestamps: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    """Build the OHLCV DataFrame returned by BinanceDataFetcher.get_kline_data"""
+    df = pd.DataFrame({'timestamp': pd.to_datetime(timestamps, unit='ms')})
+    for row, col in enumerate(COLUMNS):
+        df[col] = values[row]
+    return df
+
+
+class MappedKlines:
+    """
+    Read-only memory-mapped kline series
+
+    Lightweight handle around the consolidated arrays of one symbol and
+    interval. Column accessors and windows are views into the mapped files,
+    so the same handle can be shared by many signals without copying.
+    """
+
+    def __init__(self, symbol: str, interval: str, timestamps: np.ndarray,
+                 values: np.ndarray, days: List[int]):
+        self.symbol = symbol
+        self.interval = interval
+        self.timestamps = timestamps
+        self.values = values
+        self.days = frozenset(int(day) for day in days)
+        self._range_index = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def covers(self, days: List[int]) -> bool:
+        """Check whether every given day partition is part of this series"""
+        return all(day in self.days for day in days)
+
+    def column(self, name: str) -> np.ndarray:
+        """View of one column (NaN for a column the series was built without)"""
+        row = COLUMNS.index(name)
+        if row >= len(self.values):
+            return np.full(len(self), np.nan)
+        return self.values[row]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.values[COLUMNS.index('high')]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.values[COLUMNS.index('low')]
+
+    def range_index(self) -> RangeExtremeIndex:
+        """Range max/min index over the whole series (built on first use)"""
+        if self._range_index is None:
+            self._range_index = RangeExtremeIndex(self.high, self.low)
+        return self._range_index
+
+    def window(self, start_ms: int, end_ms: int) -> Tuple[int, int]:
+        """Index bounds of candles with open time in [start_ms, end_ms)"""
+        lo = int(np.searchsorted(self.timestamps, start_ms, side='left'))
+        hi = int(np.searchsorted(self.timestamps, end_ms, side='left'))
+        return lo, hi
+
+    def slice(self, start_ms: int, end_ms: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Views of (timestamps, high, low) for candles in [start_ms, end_ms)"""
+        lo, hi = self.window(start_ms, end_ms)
+        return self.timestamps[lo:hi], self.high[lo:hi], self.low[lo:hi]
+
+
+class KlineStore:
+    """Day-partitioned columnar kline cache"""
+
+    def __init__(self, root: str = "data/cache/klines"):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding the partitions
+        """
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        self._manifest = {}  # (symbol, interval, day) -> manifest entry
+
+    def _partition_dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol, interval)
+
+    def _partition_paths(self, symbol: str, interval: str, day: int) -> Tuple[str, str]:
+        base = os.path.join(self._partition_dir(symbol, interval), day_key(day))
+        return f"{base}.ts.npy", f"{base}.ohlcv.npy"
+
+    def _manifest_path(self, symbol: str, interval: str, day: int) -> str:
+        return os.path.join(self._partition_dir(symbol, interval), f"{day_key(day)}.meta.json")
+
+    def has_partition(self, symbol: str, interval: str, day: int) -> bool:
+        """Check whether a day partition is cached"""
+        ts_path, values_path = self._partition_paths(symbol, interval, day)
+        return os.path.exists(ts_path) and os.path.exists(values_path)
+
+    def days_in_range(self, start_ms: int, end_ms: int) -> List[int]:
+        """UTC day numbers overlapping the half-open range [start_ms, end_ms)"""
+        if end_ms <= start_ms:
+            return []
+        return list(range(day_index(start_ms), day_index(end_ms - 1) + 1))
+
+    def cached_days(self, symbol: str, interval: str) -> List[int]:
+        """Sorted day numbers of all cached partitions for a symbol/interval"""
+        directory = self._partition_dir(symbol, interval)
+        if not os.path.isdir(directory):
+            return []
+
+        days = []
+        for name in os.listdir(directory):
+            if name.endswith('.ts.npy') and len(name) == len('YYYYMMDD.ts.npy'):
+                parsed = datetime.strptime(name[:8], '%Y%m%d').replace(tzinfo=timezone.utc)
+                days.append(day_index(int(parsed.timestamp() * 1000)))
+        return sorted(day for day in days if self.has_partition(symbol, interval, day))
+
+    def missing_days(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[int]:
+        """Day partitions in [start_ms, end_ms) that are not cached yet"""
+        return [day for day in self.days_in_range(start_ms, end_ms)
+                if not self.has_partition(symbol, interval, day)]
+
+    def read_partition(self, symbol: str, interval: str, day: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Load one day partition as (timestamps, values)"""
+        ts_path, values_path = self._partition_paths(symbol, interval, day)
+        return np.load(ts_path), with_all_columns(np.load(values_path))
+
+    def write_partition(self, symbol: str, interval: str, day: int,
+                        timestamps: np.ndarray, values: np.ndarray,
+                        verified: bool = False):
+        """
+        Persist one day partition and its manifest entry
+
+        Candles are sorted and duplicate open times dropped (the first one
+        is kept). Files are written to a temporary name of this process
+        first and then renamed, so neither a crash nor another process
+        writing the same day leaves a half-written partition behind.
+
+        Args:
+            symbol: Trading pair
+            interval: Kline interval
+            day: Day number
+            timestamps: Candle open times
+            values: OHLCV matrix aligned with timestamps
+            verified: The gaps left in the candles were confirmed by a
+                      repeated fetch and are not to be fetched again
+        """
+        os.makedirs(self._partition_dir(symbol, interval), exist_ok=True)
+        ts_path, values_path = self._partition_paths(symbol, interval, day)
+        meta_path = self._manifest_path(symbol, interval, day)
+
+        timestamps, first = np.unique(np.asarray(timestamps, dtype=np.int64), return_index=True)
+        values = np.asarray(values)[:, first]
+
+        # An entry left from the previous contents must not outlive them
+        self._manifest.pop((symbol, interval, day), None)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        # Values first: a partition only counts as cached once its ts file exists
+        for path, array in ((values_path, values), (ts_path, timestamps)):
+            tmp_path = temp_path(path)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, path)
+
+        self._write_manifest(symbol, interval, day,
+                             dict(audit_timestamps(timestamps, interval, day), verified=verified))
+
+    def _write_manifest(self, symbol: str, interval: str, day: int, status: Dict):
+        path = self._manifest_path(symbol, interval, day)
+        # Worker processes may audit the same legacy partition at once
+        tmp_path = temp_path(path)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, path)
+        self._manifest[(symbol, interval, day)] = status
+
+    def partition_status(self, symbol: str, interval: str, day: int) -> Optional[Dict]:
+        """
+        Manifest entry of a day partition
+
+        Partitions written before the manifest existed are audited on
+        first use and their entry is recorded.
+
+        Returns:
+            audit_timestamps result plus verified, or None if the day is not cached
+        """
+        key = (symbol, interval, day)
+        if key in self._manifest:
+            return self._manifest[key]
+        if not self.has_partition(symbol, interval, day):
+            return None
+
+        meta_path = self._manifest_path(symbol, interval, day)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self._manifest[key] = json.load(f)
+            return self._manifest[key]
+
+        timestamps, _ = self.read_partition(symbol, interval, day)
+        status = dict(audit_timestamps(timestamps, interval, day), verified=False)
+        self._write_manifest(symbol, interval, day, status)
+        return status
+
+    def incomplete_days(self, symbol: str, interval: str, days: List[int]) -> List[int]:
+        """Cached days among days whose partition has open gaps or duplicates"""
+        incomplete = []
+        for day in days:
+            status = self.partition_status(symbol, interval, day)
+            if status is not None and not partition_complete(status):
+                incomplete.append(day)
+        return incomplete
+
+    def audit(self, symbol: str, interval: str) -> Dict:
+        """
+        Summarize the manifest of every cached partition of a symbol/interval
+
+        Returns:
+            Dictionary with days, complete and incomplete day counts, the
+            incomplete day keys, missing candles (open and verified) and
+            duplicate timestamps
+        """
+        summary = {'days': 0, 'complete': 0, 'incomplete': 0, 'incomplete_days': [],
+                   'missing_candles': 0, 'verified_missing': 0, 'duplicates': 0}
+        for day in self.cached_days(symbol, interval):
+            status = self.partition_status(symbol, interval, day)
+            missing = (status['expected'] - status['actual']) if status['expected'] is not None else 0
+            summary['days'] += 1
+            summary['duplicates'] += status['duplicates']
+            if status['verified']:
+                summary['verified_missing'] += missing
+            else:
+                summary['missing_candles'] += missing
+            if partition_complete(status):
+                summary['complete'] += 1
+            else:
+                summary['incomplete'] += 1
+                summary['incomplete_days'].append(day_key(day))
+        return summary
+
+    def drop_series(self, symbol: str, interval: str):
+        """
+        Retire the consolidated series of a symbol/interval
+
+        Called after cached partitions were rewritten in place: the days
+        file marks a series as complete, so without it the stale series is
+        neither reused nor mapped again.
+        """
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return
+        for name in os.listdir(series_dir):
+            if name.endswith('.days.npy'):
+                try:
+                    os.remove(os.path.join(series_dir, name))
+                except OSError:
+                    pass
+
+    def write_days(self, symbol: str, interval: str, timestamps: np.ndarray,
+                   values: np.ndarray, days: List[int]):
+        """
+        Split a fetched span into day partitions and persist them
+
+        Args:
+            symbol: Trading pair
+            interval: Kline interval
+            timestamps: Sorted open times covering the given days
+            values: OHLCV matrix aligned with timestamps
+            days: Day numbers to write (days without candles are stored empty)
+        """
+        for day in days:
+            lo = np.searchsorted(timestamps, day * DAY_MS, side='left')
+            hi = np.searchsorted(timestamps, (day + 1) * DAY_MS, side='left')
+            self.write_partition(symbol, interval, day, timestamps[lo:hi], values[:, lo:hi])
+
+    def materialize_rollups(self, symbol: str, interval: str, days: List[int]) -> List[int]:
+        """
+        Build day partitions of a coarser interval from cached 1m partitions
+
+        Args:
+            symbol: Trading pair
+            interval: Target interval (see can_roll_up)
+            days: Day numbers wanted for the target interval
+
+        Returns:
+            Day numbers that were written (days without a 1m partition are skipped)
+        """
+        if not can_roll_up(interval):
+            return []
+
+        written = []
+        for day in days:
+            source = self.partition_status(symbol, ROLLUP_SOURCE, day)
+            if source is None:
+                continue
+            timestamps, values = resample_arrays(*self.read_partition(symbol, ROLLUP_SOURCE, day), interval)
+            # Bars missing because of verified 1m gaps are missing on the exchange as well
+            self.write_partition(symbol, interval, day, timestamps, values,
+                                 verified=partition_complete(source))
+            written.append(day)
+        return written
+
+    def read_range(self, symbol: str, interval: str, start_ms: int, end_ms: int,
+                   extra: Optional[Dict[int, Tuple[np.ndarray, np.ndarray]]] = None
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read candles with open time in [start_ms, end_ms) by stitching partitions
+
+        Args:
+            symbol: Trading pair
+            interval: Kline interval
+            start_ms: Inclusive range start (epoch ms)
+            end_ms: Exclusive range end (epoch ms)
+            extra: In-memory day partitions that take precedence over disk
+                   (e.g. the current, still incomplete day)
+
+        Returns:
+            Tuple of (timestamps, values); days that are not available are skipped
+        """
+        extra = extra or {}
+        ts_parts, value_parts = [], []
+
+        for day in self.days_in_range(start_ms, end_ms):
+            if day in extra:
+                timestamps, values = extra[day]
+            elif self.has_partition(symbol, interval, day):
+                timestamps, values = self.read_partition(symbol, interval, day)
+            else:
+                continue
+            ts_parts.append(timestamps)
+            value_parts.append(values)
+
+        if not ts_parts:
+            return np.empty(0, dtype=np.int64), np.empty((len(COLUMNS), 0), dtype=np.float64)
+
+        timestamps = np.concatenate(ts_parts)
+        values = np.concatenate(value_parts, axis=1)
+
+        lo = np.searchsorted(timestamps, start_ms, side='left')
+        hi = np.searchsorted(timestamps, end_ms, side='left')
+        return timestamps[lo:hi], values[:, lo:hi]
+
+    def _series_dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self._partition_dir(symbol, interval), 'series')
+
+    def _series_base(self, symbol: str, interval: str, days: List[int]) -> str:
+        # The newest partition write is part of the name, so rewritten partitions give a new series
+        stamp = max(os.stat(self._partition_paths(symbol, interval, day)[0]).st_mtime_ns for day in days)
+        name = f"{day_key(days[0])}_{day_key(days[-1])}_{len(days)}_{stamp // 1_000_000}"
+        return os.path.join(self._series_dir(symbol, interval), name)
+
+    def _latest_series_base(self, symbol: str, interval: str) -> Optional[str]:
+        """Most recently built consolidated series, if any"""
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return None
+
+        bases = [os.path.join(series_dir, name[:-len('.days.npy')])
+                 for name in os.listdir(series_dir) if name.endswith('.days.npy')]
+        if not bases:
+            return None
+        return max(bases, key=lambda base: os.path.getmtime(f"{base}.days.npy"))
+
+    def consolidate(self, symbol: str, interval: str) -> Optional[str]:
+        """
+        Stitch all cached day partitions into one contiguous series
+
+        The series file name encodes the partition set it was built from, so
+        an up-to-date series is reused and a stale one is simply superseded
+        (files that are still mapped elsewhere are never overwritten).
+        Processes that build the same series at once each write their own
+        temporary files, and whichever rename lands last wins.
+
+        Returns:
+            Base path of the series files, or None if nothing is cached
+        """
+        days = self.cached_days(symbol, interval)
+        if not days:
+            return None
+
+        base = self._series_base(symbol, interval, days)
+        if os.path.exists(f"{base}.days.npy"):
+            return base
+
+        series_dir = self._series_dir(symbol, interval)
+        os.makedirs(series_dir, exist_ok=True)
+
+        ts_parts, value_parts = [], []
+        for day in days:
+            timestamps, values = self.read_partition(symbol, interval, day)
+            ts_parts.append(timestamps)
+            value_parts.append(values)
+
+        # The days file is written last and marks the series as complete
+        for suffix, array in (('ohlcv', np.concatenate(value_parts, axis=1)),
+                              ('ts', np.concatenate(ts_parts)),
+                              ('days', np.asarray(days, dtype=np.int64))):
+            path = f"{base}.{suffix}.npy"
+            tmp_path = temp_path(path)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                # Another process built the same series first (and may have it
+                # mapped already); its file holds the same candles
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                if not os.path.exists(path):
+                    raise
+
+        # Best-effort cleanup of superseded series (may still be mapped on Windows)
+        current = os.path.basename(base) + '.'
+        for name in os.listdir(series_dir):
+            if not name.startswith(current) and not name.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(series_dir, name))
+                except OSError:
+                    pass
+
+        return base
+
+    def open_mapped(self, symbol: str, interval: str, refresh: bool = True) -> Optional[MappedKlines]:
+        """
+        Memory-map the consolidated series of a symbol/interval read-only
+
+        Args:
+            symbol: Trading pair
+            interval: Kline interval
+            refresh: Rebuild the series first if partitions were added since
+                     it was built; otherwise map the latest existing series
+
+        Returns:
+            MappedKlines handle, or None if no series is available
+        """
+        if refresh:
+            base = self.consolidate(symbol, interval)
+        else:
+            base = self._latest_series_base(symbol, interval)
+        if base is None:
+            return None
+
+        return MappedKlines(
+            symbol,
+            interval,
+            np.load(f"{base}.ts.npy", mmap_mode='r'),
+            np.load(f"{base}.ohlcv.npy", mmap_mode='r'),
+            np.load(f"{base}.days.npy")
+        )
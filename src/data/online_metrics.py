@@ -0,0 +1,376 @@
+"""
+Online Metrics
+
+Backtest metrics accumulated one outcome at a time in constant memory.
+Every state can be merged with another, so worker shards (or batches)
+summarize their own outcomes and the partial states combine into the
+metrics of the whole run without keeping the outcome list around:
+
+    total = OnlineMetrics()
+    for shard in shards:
+        total.merge(OnlineMetrics.from_results(evaluate(shard)))
+
+Memory grows with the number of symbols and sketch buckets, not with
+the number of outcomes.
+
+Counts, extremes and sketch buckets merge exactly; means and variances
+merge with Chan's parallel form of Welford's update, so they agree with a
+single pass up to float rounding.
+
+The summary keys shared with result_metrics.comprehensive_metrics carry
+the same numbers: average and best max profit are taken over positive
+profits only, and average and worst max drawdown over the absolute values
+of negative drawdowns. The signed moments of every outcome are reported
+separately under 'excursions'.
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+# Levels with a time-to-hit column ({level}_minutes)
+TIME_LEVELS = ('target1', 'target2', 'target3', 'stop_loss')
+
+# Per-outcome excursion columns
+EXCURSION_COLUMNS = ('max_profit_pct', 'max_drawdown_pct')
+
+
+class RunningMoments:
+    """Count, mean, variance and extremes of a stream (Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, value: float):
+        """Add one value"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """Add the values summarized by another state"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two values)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation"""
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (DDSketch)
+
+    Values fall into logarithmic buckets whose bounds grow by a factor of
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy), so every
+    quantile estimate is within relative_accuracy of a true value at that
+    rank. Memory grows with the log of the value range, not the number of
+    values, and merging adds bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Create an empty sketch
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, bucket: int) -> float:
+        """Value with the smallest relative error to everything in a bucket"""
+        return 2 * self.gamma ** bucket / (self.gamma + 1)
+
+    def update(self, value: float):
+        """Add one value"""
+        if value > 0:
+            bucket = self._bucket(value)
+            self.positive[bucket] = self.positive.get(bucket, 0) + 1
+        elif value < 0:
+            bucket = self._bucket(-value)
+            self.negative[bucket] = self.negative.get(bucket, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Add the values summarized by another sketch
+
+        Raises:
+            ValueError: If the sketches use different accuracies
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy "
+                             f"({self.relative_accuracy} vs {other.relative_accuracy})")
+        if other.count == 0:
+            return self
+
+        for bucket, count in other.positive.items():
+            self.positive[bucket] = self.positive.get(bucket, 0) + count
+        for bucket, count in other.negative.items():
+            self.negative[bucket] = self.negative.get(bucket, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile between 0 and 1 (0.5 = median)
+
+        Returns:
+            Estimated value, None if the sketch is empty
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be between 0 and 1, got {q}")
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        # Ascending order: most negative buckets first, then zero, then positive
+        for bucket in sorted(self.negative, reverse=True):
+            seen += self.negative[bucket]
+            if seen > rank:
+                return max(-self._value(bucket), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for bucket in sorted(self.positive):
+            seen += self.positive[bucket]
+            if seen > rank:
+                return min(self._value(bucket), self.max)
+        return self.max
+
+
+class OnlineMetrics:
+    """Mergeable outcome metrics: counts, win rate, time-to-hit, excursions and per-symbol counts"""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Create an empty state
+
+        Args:
+            relative_accuracy: Accuracy of the time-to-hit quantile sketches
+        """
+        self.relative_accuracy = relative_accuracy
+        self.total = 0
+        self.valid = 0
+        self.wins = 0
+        self.losses = 0
+        self.outcomes = {}
+        self.hits = {level: 0 for level in TIME_LEVELS}
+        self.times = {level: RunningMoments() for level in TIME_LEVELS}
+        self.time_sketches = {level: QuantileSketch(relative_accuracy) for level in TIME_LEVELS}
+        self.excursions = {column: RunningMoments() for column in EXCURSION_COLUMNS}
+        self.profits = RunningMoments()  # max profits above zero
+        self.drawdowns = RunningMoments()  # absolute max drawdowns below zero
+        self.symbols = {}
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict], relative_accuracy: float = 0.01) -> 'OnlineMetrics':
+        """
+        Summarize outcome dictionaries into a new state
+
+        Args:
+            results: Outcome dictionaries
+            relative_accuracy: Accuracy of the time-to-hit quantile sketches
+
+        Returns:
+            OnlineMetrics of the results
+        """
+        metrics = cls(relative_accuracy)
+        for result in results:
+            metrics.update(result)
+        return metrics
+
+    def update(self, result: Dict):
+        """Add one outcome dictionary (results without final_outcome count as NO_DATA)"""
+        self.total += 1
+        final_outcome = result.get('final_outcome', 'NO_DATA')
+        if final_outcome == 'NO_DATA':
+            return
+
+        self.valid += 1
+        self.outcomes[final_outcome] = self.outcomes.get(final_outcome, 0) + 1
+        win = final_outcome.startswith('TARGET')
+        loss = final_outcome == 'STOP_LOSS'
+        self.wins += win
+        self.losses += loss
+
+        stats = self.symbols.setdefault(result.get('symbol'), {'total': 0, 'wins': 0, 'losses': 0})
+        stats['total'] += 1
+        stats['wins'] += win
+        stats['losses'] += loss
+
+        for level in TIME_LEVELS:
+            if not result.get(f'hit_{level}'):
+                continue
+            self.hits[level] += 1
+            minutes = result.get(f'{level}_minutes')
+            # None/NaN: hit without a recorded time
+            if minutes is not None and minutes == minutes:
+                self.times[level].update(minutes)
+                self.time_sketches[level].update(minutes)
+
+        for column in EXCURSION_COLUMNS:
+            value = result.get(column)
+            if value is not None and value == value:
+                self.excursions[column].update(value)
+
+        profit = result.get('max_profit_pct')
+        if profit is not None and profit > 0:
+            self.profits.update(profit)
+        drawdown = result.get('max_drawdown_pct')
+        if drawdown is not None and drawdown < 0:
+            self.drawdowns.update(-drawdown)
+
+    def merge(self, other: 'OnlineMetrics') -> 'OnlineMetrics':
+        """
+        Add the outcomes summarized by another state
+
+        Args:
+            other: Partial state, e.g. of another batch or worker shard
+
+        Returns:
+            This state, for chaining
+        """
+        self.total += other.total
+        self.valid += other.valid
+        self.wins += other.wins
+        self.losses += other.losses
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+        for level in TIME_LEVELS:
+            self.hits[level] += other.hits[level]
+            self.times[level].merge(other.times[level])
+            self.time_sketches[level].merge(other.time_sketches[level])
+        for column in EXCURSION_COLUMNS:
+            self.excursions[column].merge(other.excursions[column])
+        self.profits.merge(other.profits)
+        self.drawdowns.merge(other.drawdowns)
+        for symbol, other_stats in other.symbols.items():
+            stats = self.symbols.setdefault(symbol, {'total': 0, 'wins': 0, 'losses': 0})
+            for key, count in other_stats.items():
+                stats[key] += count
+        return self
+
+    @property
+    def ongoing(self) -> int:
+        """Valid outcomes that neither hit a target nor the stop loss"""
+        return self.valid - self.wins - self.losses
+
+    @property
+    def winrate(self) -> float:
+        """Share of valid outcomes that hit a target (%)"""
+        return (self.wins / self.valid) * 100 if self.valid else 0
+
+    def median_minutes(self, level: str = 'target1') -> Optional[float]:
+        """Estimated median time to hit a level (None without hits)"""
+        return self.time_sketches[level].quantile(0.5)
+
+    def summary(self) -> Dict:
+        """
+        Summary of everything seen so far
+
+        Returns:
+            Dictionary with counts, win rate, target hits, profit/drawdown
+            aggregates (as in comprehensive_metrics), time-to-hit
+            statistics per level, signed excursion moments and per-symbol
+            counts
+        """
+        time_to_hit = {}
+        for level in TIME_LEVELS:
+            moments = self.times[level]
+            sketch = self.time_sketches[level]
+            time_to_hit[level] = {
+                'hits': self.hits[level],
+                'count': moments.count,
+                'mean_minutes': moments.mean if moments.count else 0,
+                'std_minutes': moments.std,
+                'min_minutes': moments.min,
+                'median_minutes': sketch.quantile(0.5),
+                'p90_minutes': sketch.quantile(0.9),
+                'max_minutes': moments.max
+            }
+
+        excursions = {}
+        for column in EXCURSION_COLUMNS:
+            moments = self.excursions[column]
+            excursions[column] = {
+                'mean': moments.mean if moments.count else 0,
+                'std': moments.std,
+                'min': moments.min,
+                'max': moments.max
+            }
+
+        valid = self.valid
+        return {
+            'total_signals': self.total,
+            'valid_signals': valid,
+            'data_coverage_pct': (valid / self.total) * 100 if self.total else 0,
+            'overall_winrate_pct': self.winrate,
+            'total_wins': self.wins,
+            'total_losses': self.hits['stop_loss'],
+            'ongoing': self.ongoing,
+            'outcome_counts': dict(self.outcomes),
+            'target1_hits': self.hits['target1'],
+            'target2_hits': self.hits['target2'],
+            'target3_hits': self.hits['target3'],
+            'avg_max_profit_pct': self.profits.mean if self.profits.count else 0,
+            'best_profit_pct': self.profits.max or 0,
+            'avg_max_drawdown_pct': self.drawdowns.mean if self.drawdowns.count else 0,
+            'worst_drawdown_pct': self.drawdowns.max or 0,
+            'time_to_hit': time_to_hit,
+            'excursions': excursions,
+            'symbol_performance': {
+                symbol: dict(stats, winrate_pct=(stats['wins'] / stats['total']) * 100)
+                for symbol, stats in self.symbols.items()
+            }
+        }
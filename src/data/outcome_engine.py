@@ -0,0 +1,742 @@
+"""
+Signal Outcome Engine
+
+Array kernel for evaluating trading signals against kline data.
+Works on NumPy timestamp/high/low arrays instead of iterating DataFrame
+rows, while producing the same outcome dictionary as the original
+candle-by-candle loop in BinanceDataFetcher.check_signal_outcome.
+
+Within a candle the stop loss is checked before the targets. Scans flag
+an exit candle that touched both as ambiguous, and an optional resolve
+callback can re-decide it on finer (e.g. 1s) candles of that minute
+(see resolve_tie).
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+TARGET_LEVELS = ('target1', 'target2', 'target3')
+
+# Outcome fields that describe the signal itself rather than its result
+SIGNAL_FIELDS = ('signal_id', 'symbol', 'action', 'signal_time', 'entry_price',
+                 'stop_loss', 'target1', 'target2', 'target3')
+
+
+def parse_signal(signal: Dict) -> Dict:
+    """
+    Normalize a raw signal row into numeric levels and a tz-aware time
+
+    Args:
+        signal: Signal dictionary with entry, targets, stop loss
+
+    Returns:
+        Dictionary with pair, levels, action and signal_time
+    """
+    # Only add USDT if not already present
+    pair = signal['symbol'] if signal['symbol'].endswith('USDT') else signal['symbol'] + 'USDT'
+
+    # Parse signal timestamp (ensure timezone-aware)
+    signal_time = pd.to_datetime(signal['timestamp'])
+    if signal_time.tz is None:
+        signal_time = signal_time.tz_localize('UTC')
+
+    return {
+        'signal_id': signal['message_id'],
+        'symbol': signal['symbol'],
+        'pair': pair,
+        'action': signal['action'],
+        'entry_price': float(signal['entry_price']),
+        'stop_loss': float(signal['stop_loss']) if signal['stop_loss'] else None,
+        'target1': float(signal['target1']) if signal['target1'] else None,
+        'target2': float(signal['target2']) if signal['target2'] else None,
+        'target3': float(signal['target3']) if signal['target3'] else None,
+        'signal_time': signal_time
+    }
+
+
+def to_epoch_ms(timestamps) -> np.ndarray:
+    """
+    Convert datetime-like values to int64 epoch milliseconds
+
+    Args:
+        timestamps: Series, index or array of datetimes (naive values are UTC)
+
+    Returns:
+        int64 array of epoch milliseconds
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True))
+    return index.as_unit('ms').asi8
+
+
+def first_candle_at_or_after(timestamps_ms: np.ndarray, when: pd.Timestamp) -> int:
+    """Index of the first candle whose open time is >= when"""
+    # Ceil to whole milliseconds so sub-millisecond signal times compare like pandas
+    when_ms = -(-when.value // 1_000_000)
+    return int(np.searchsorted(timestamps_ms, when_ms, side='left'))
+
+
+def _first_true(mask: np.ndarray) -> int:
+    """Index of the first True value in mask, or -1"""
+    if mask.size == 0:
+        return -1
+    idx = int(np.argmax(mask))
+    return idx if mask[idx] else -1
+
+
+def _running_extreme(values: np.ndarray, maximum: bool):
+    """Max (or min) of values against a starting value of 0, ignoring NaN"""
+    if maximum:
+        peak = np.fmax.reduce(values, initial=0.0)
+        return float(peak) if peak > 0 else 0
+    trough = np.fmin.reduce(values, initial=0.0)
+    return float(trough) if trough < 0 else 0
+
+
+def _level_masks(highs: np.ndarray, lows: np.ndarray, action: str,
+                 entry_price: float, stop_loss: Optional[float],
+                 targets: Sequence[Optional[float]]):
+    """Stop/target touch masks and per-candle profit/drawdown percentages"""
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+
+    if action == 'LONG':
+        stop_mask = (lows <= stop_loss) if stop_loss else None
+        target_masks = [(highs >= t) if t else None for t in targets]
+        profit = ((highs - entry_price) / entry_price) * 100
+        drawdown = ((lows - entry_price) / entry_price) * 100
+    else:  # SHORT
+        stop_mask = (highs >= stop_loss) if stop_loss else None
+        target_masks = [(lows <= t) if t else None for t in targets]
+        profit = ((entry_price - lows) / entry_price) * 100
+        drawdown = ((entry_price - highs) / entry_price) * 100
+
+    return stop_mask, target_masks, profit, drawdown
+
+
+def _resolve_exit(stop_index: int, target_indexes: Sequence[int], limit: int):
+    """Exit candle among first hits that fall before limit, what was hit there, and whether it is a tie"""
+    candidates = [i for i in [stop_index] + list(target_indexes) if 0 <= i < limit]
+    exit_index = min(candidates) if candidates else -1
+
+    # A target touched on the exit candle cannot have been touched earlier,
+    # so it was hit there exactly when its first hit is the exit candle
+    stop_loss_hit = exit_index >= 0 and stop_index == exit_index
+    if exit_index >= 0 and not stop_loss_hit:
+        targets_hit = tuple(i == exit_index for i in target_indexes)
+    else:
+        targets_hit = tuple(False for _ in target_indexes)
+
+    # The stop loss wins a candle that also touched a target, whatever the true order was
+    ambiguous = stop_loss_hit and any(i == exit_index for i in target_indexes)
+    return exit_index, stop_loss_hit, targets_hit, ambiguous
+
+
+def scan_first_hits(highs: np.ndarray, lows: np.ndarray, action: str,
+                    entry_price: float, stop_loss: Optional[float],
+                    targets: Sequence[Optional[float]]) -> Dict:
+    """
+    Find the exit candle of a signal and its excursions up to that candle
+
+    The stop loss is checked before the targets within a candle, and the
+    position closes on the first candle that touches any level.
+
+    Args:
+        highs: Candle highs starting at the first candle after the signal
+        lows: Candle lows aligned with highs
+        action: 'LONG' or 'SHORT'
+        entry_price: Signal entry price
+        stop_loss: Stop loss level (None or 0 when absent)
+        targets: Target levels in order (None or 0 when absent)
+
+    Returns:
+        Dictionary with exit_index (-1 if still open), stop_loss_hit,
+        targets_hit, ambiguous, max_profit_pct and max_drawdown_pct; an
+        ambiguous scan also has prior_profit_pct and prior_drawdown_pct,
+        the excursions before the exit candle
+    """
+    stop_mask, target_masks, profit, drawdown = _level_masks(
+        highs, lows, action, entry_price, stop_loss, targets)
+
+    stop_index = _first_true(stop_mask) if stop_mask is not None else -1
+    target_indexes = [_first_true(m) if m is not None else -1 for m in target_masks]
+
+    exit_index, stop_loss_hit, targets_hit, ambiguous = _resolve_exit(
+        stop_index, target_indexes, len(profit))
+
+    scanned = slice(0, exit_index + 1) if exit_index >= 0 else slice(None)
+
+    scan = {
+        'exit_index': exit_index,
+        'stop_loss_hit': stop_loss_hit,
+        'targets_hit': targets_hit,
+        'ambiguous': ambiguous,
+        'max_profit_pct': _running_extreme(profit[scanned], maximum=True),
+        'max_drawdown_pct': _running_extreme(drawdown[scanned], maximum=False)
+    }
+    if ambiguous:
+        scan['prior_profit_pct'] = _running_extreme(profit[:exit_index], maximum=True)
+        scan['prior_drawdown_pct'] = _running_extreme(drawdown[:exit_index], maximum=False)
+    return scan
+
+
+def _prefix_extreme(running: np.ndarray, index: int, maximum: bool):
+    """Value of _running_extreme over the first index + 1 candles, from a running fmax/fmin"""
+    if index < 0:
+        return 0
+    value = running[index]
+    if maximum:
+        return float(value) if value > 0 else 0
+    return float(value) if value < 0 else 0
+
+
+def scan_first_hits_horizons(highs: np.ndarray, lows: np.ndarray, action: str,
+                             entry_price: float, stop_loss: Optional[float],
+                             targets: Sequence[Optional[float]],
+                             lengths: Sequence[int]) -> list:
+    """
+    scan_first_hits for several window lengths in one pass
+
+    First-hit indexes and running max/min excursions are computed once
+    over the longest window; each shorter window then only needs the
+    first hits that fall inside it and a prefix lookup.
+
+    Args:
+        highs: Candle highs of the longest window
+        lows: Candle lows aligned with highs
+        action: 'LONG' or 'SHORT'
+        entry_price: Signal entry price
+        stop_loss: Stop loss level (None or 0 when absent)
+        targets: Target levels in order (None or 0 when absent)
+        lengths: Number of candles in each window (each <= len(highs))
+
+    Returns:
+        One scan_first_hits result per length, in order
+    """
+    stop_mask, target_masks, profit, drawdown = _level_masks(
+        highs, lows, action, entry_price, stop_loss, targets)
+
+    stop_index = _first_true(stop_mask) if stop_mask is not None else -1
+    target_indexes = [_first_true(m) if m is not None else -1 for m in target_masks]
+    running_profit = np.fmax.accumulate(profit) if len(profit) else profit
+    running_drawdown = np.fmin.accumulate(drawdown) if len(drawdown) else drawdown
+
+    scans = []
+    for length in lengths:
+        exit_index, stop_loss_hit, targets_hit, ambiguous = _resolve_exit(
+            stop_index, target_indexes, length)
+        last = exit_index if exit_index >= 0 else length - 1
+        scan = {
+            'exit_index': exit_index,
+            'stop_loss_hit': stop_loss_hit,
+            'targets_hit': targets_hit,
+            'ambiguous': ambiguous,
+            'max_profit_pct': _prefix_extreme(running_profit, last, maximum=True),
+            'max_drawdown_pct': _prefix_extreme(running_drawdown, last, maximum=False)
+        }
+        if ambiguous:
+            scan['prior_profit_pct'] = _prefix_extreme(running_profit, exit_index - 1, maximum=True)
+            scan['prior_drawdown_pct'] = _prefix_extreme(running_drawdown, exit_index - 1, maximum=False)
+        scans.append(scan)
+    return scans
+
+
+def scan_first_hits_indexed(index, start: int, stop: int, action: str,
+                            entry_price: float, stop_loss: Optional[float],
+                            targets: Sequence[Optional[float]]) -> Dict:
+    """
+    scan_first_hits on candles [start, stop) of a series with a RangeExtremeIndex
+
+    First hits are found by binary lifting and excursions by O(1) range
+    queries, so the cost does not grow with the window length.
+
+    Args:
+        index: RangeExtremeIndex over the whole series
+        start: First candle of the window
+        stop: End of the window (exclusive)
+        action: 'LONG' or 'SHORT'
+        entry_price: Signal entry price
+        stop_loss: Stop loss level (None or 0 when absent)
+        targets: Target levels in order (None or 0 when absent)
+
+    Returns:
+        Same dictionary as scan_first_hits, with exit_index relative to start
+    """
+    if action == 'LONG':
+        stop_hit, target_hit = index.first_low_at_or_below, index.first_high_at_or_above
+    else:  # SHORT
+        stop_hit, target_hit = index.first_high_at_or_above, index.first_low_at_or_below
+
+    def relative(position: int) -> int:
+        return position - start if position >= 0 else -1
+
+    stop_index = relative(stop_hit(stop_loss, start, stop)) if stop_loss else -1
+    target_indexes = [relative(target_hit(t, start, stop)) if t else -1 for t in targets]
+
+    exit_index, stop_loss_hit, targets_hit, ambiguous = _resolve_exit(
+        stop_index, target_indexes, stop - start)
+
+    last = start + exit_index + 1 if exit_index >= 0 else stop
+    profit, drawdown = _indexed_excursions(index, start, last, action, entry_price)
+
+    scan = {
+        'exit_index': exit_index,
+        'stop_loss_hit': stop_loss_hit,
+        'targets_hit': targets_hit,
+        'ambiguous': ambiguous,
+        'max_profit_pct': profit,
+        'max_drawdown_pct': drawdown
+    }
+    if ambiguous:
+        scan['prior_profit_pct'], scan['prior_drawdown_pct'] = _indexed_excursions(
+            index, start, start + exit_index, action, entry_price)
+    return scan
+
+
+def _indexed_excursions(index, lo: int, hi: int, action: str, entry_price: float):
+    """Max profit and drawdown percentages over candles [lo, hi) from range queries"""
+    high = index.max_high(lo, hi)
+    low = index.min_low(lo, hi)
+    if action == 'LONG':
+        profit = ((high - entry_price) / entry_price) * 100
+        drawdown = ((low - entry_price) / entry_price) * 100
+    else:
+        profit = ((entry_price - low) / entry_price) * 100
+        drawdown = ((entry_price - high) / entry_price) * 100
+    return float(profit) if profit > 0 else 0, float(drawdown) if drawdown < 0 else 0
+
+
+def resolve_tie(levels: Dict, scan: Dict, timestamps_ms: np.ndarray,
+                resolve: Optional[Callable[[int], Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]]]) -> Dict:
+    """
+    Re-decide an ambiguous exit candle on finer candles
+
+    When the exit candle touched both the stop loss and a target, the
+    finer candles inside it are scanned to find which level was reached
+    first, and the excursions are cut off at that finer candle. Ties
+    within one finer candle are still decided for the stop loss.
+
+    Args:
+        levels: Parsed signal from parse_signal
+        scan: Result of a first-hit scan
+        timestamps_ms: Candle open times aligned with the scanned arrays
+        resolve: Callback (candle_open_ms) -> (timestamps, highs, lows) of
+                 the finer candles inside that candle, or None if they are
+                 not available
+
+    Returns:
+        The scan, updated when the finer candles decide the tie
+    """
+    if resolve is None or not scan.get('ambiguous'):
+        return scan
+
+    fine = resolve(int(timestamps_ms[scan['exit_index']]))
+    if fine is None or len(fine[0]) == 0:
+        return scan
+
+    targets = [levels[name] for name in TARGET_LEVELS]
+    fine_scan = scan_first_hits(fine[1], fine[2], levels['action'],
+                                levels['entry_price'], levels['stop_loss'], targets)
+    if fine_scan['exit_index'] < 0:
+        # The finer candles do not reproduce the touch; keep the candle-level result
+        return scan
+
+    return dict(scan,
+                stop_loss_hit=fine_scan['stop_loss_hit'],
+                targets_hit=fine_scan['targets_hit'],
+                ambiguous=fine_scan['ambiguous'],
+                max_profit_pct=_merge_extreme(scan['prior_profit_pct'], fine_scan['max_profit_pct'], True),
+                max_drawdown_pct=_merge_extreme(scan['prior_drawdown_pct'], fine_scan['max_drawdown_pct'], False))
+
+
+def no_data_outcome(levels: Dict, status: str) -> Dict:
+    """Outcome returned when no candles are available for a signal"""
+    return {
+        'signal_id': levels['signal_id'],
+        'symbol': levels['symbol'],
+        'status': status,
+        'entry_price': levels['entry_price'],
+        'outcome': 'NO_DATA'
+    }
+
+
+def build_outcome(levels: Dict, timestamps_ms: np.ndarray, scan: Dict) -> Dict:
+    """
+    Build the outcome dictionary from a first-hit scan
+
+    Args:
+        levels: Parsed signal from parse_signal
+        timestamps_ms: Candle open times aligned with the scanned arrays
+        scan: Result of scan_first_hits
+
+    Returns:
+        Outcome dictionary (same fields as check_signal_outcome)
+    """
+    signal_time = levels['signal_time']
+
+    outcome = {
+        'signal_id': levels['signal_id'],
+        'symbol': levels['symbol'],
+        'action': levels['action'],
+        'signal_time': signal_time,
+        'entry_price': levels['entry_price'],
+        'stop_loss': levels['stop_loss'],
+        'target1': levels['target1'],
+        'target2': levels['target2'],
+        'target3': levels['target3'],
+        'status': 'ACTIVE',
+        'outcome': 'ONGOING',
+        'hit_target1': False,
+        'hit_target2': False,
+        'hit_target3': False,
+        'hit_stop_loss': False,
+        'target1_time': None,
+        'target2_time': None,
+        'target3_time': None,
+        'stop_loss_time': None,
+        'target1_minutes': None,
+        'target2_minutes': None,
+        'target3_minutes': None,
+        'stop_loss_minutes': None,
+        'max_profit_pct': scan['max_profit_pct'],
+        'max_drawdown_pct': scan['max_drawdown_pct'],
+        'final_outcome': 'ONGOING',
+        'last_candle_time': None
+    }
+
+    exit_index = scan['exit_index']
+    if len(timestamps_ms):
+        last_ms = int(timestamps_ms[exit_index if exit_index >= 0 else -1])
+        outcome['last_candle_time'] = pd.Timestamp(last_ms, unit='ms', tz='UTC')
+    if exit_index < 0:
+        return outcome
+
+    exit_time = pd.Timestamp(int(timestamps_ms[exit_index]), unit='ms', tz='UTC')
+    minutes_elapsed = (exit_time - signal_time).total_seconds() / 60
+
+    if scan['stop_loss_hit']:
+        hits = ['stop_loss']
+        outcome['final_outcome'] = 'STOP_LOSS'
+    else:
+        hits = [name for name, hit in zip(TARGET_LEVELS, scan['targets_hit']) if hit]
+        outcome['final_outcome'] = hits[-1].upper()
+
+    for name in hits:
+        outcome[f'hit_{name}'] = True
+        outcome[f'{name}_time'] = exit_time
+        outcome[f'{name}_minutes'] = minutes_elapsed
+
+    outcome['status'] = 'CLOSED'
+    return outcome
+
+
+def evaluate_signal_horizons(levels: Dict, timestamps_ms: np.ndarray,
+                             highs: np.ndarray, lows: np.ndarray,
+                             horizons_hours: Sequence[float],
+                             index=None, resolve=None) -> Dict[float, Dict]:
+    """
+    Evaluate one signal for several lookforward horizons in a single scan
+
+    Each horizon's outcome equals evaluate_signal with that horizon's
+    inclusive end time.
+
+    Args:
+        levels: Parsed signal from parse_signal
+        timestamps_ms: Sorted candle open times covering the longest horizon
+        highs: Candle highs aligned with timestamps_ms
+        lows: Candle lows aligned with timestamps_ms
+        horizons_hours: Lookforward horizons in hours
+        index: Optional RangeExtremeIndex built over highs/lows; each
+               horizon is then answered by range queries
+        resolve: Optional finer-candle callback for ambiguous exit candles
+                 (see resolve_tie)
+
+    Returns:
+        Outcome dictionary per horizon
+    """
+    if len(timestamps_ms) == 0:
+        return {h: no_data_outcome(levels, 'NO_DATA') for h in horizons_hours}
+
+    start = first_candle_at_or_after(timestamps_ms, levels['signal_time'])
+    stops = {
+        h: int(np.searchsorted(timestamps_ms,
+                               (levels['signal_time'] + pd.Timedelta(hours=h)).value // 1_000_000,
+                               side='right'))
+        for h in horizons_hours
+    }
+    longest = max(stops.values())
+
+    outcomes = {h: no_data_outcome(levels, 'NO_DATA_AFTER_SIGNAL')
+                for h, stop in stops.items() if start >= stop}
+    open_horizons = [h for h in horizons_hours if h not in outcomes]
+    if not open_horizons:
+        return outcomes
+
+    targets = [levels[name] for name in TARGET_LEVELS]
+    if index is not None:
+        scans = [scan_first_hits_indexed(index, start, stops[h], levels['action'],
+                                         levels['entry_price'], levels['stop_loss'], targets)
+                 for h in open_horizons]
+    else:
+        scans = scan_first_hits_horizons(highs[start:longest], lows[start:longest], levels['action'],
+                                         levels['entry_price'], levels['stop_loss'], targets,
+                                         [stops[h] - start for h in open_horizons])
+    for h, scan in zip(open_horizons, scans):
+        window_ms = timestamps_ms[start:stops[h]]
+        outcomes[h] = build_outcome(levels, window_ms, resolve_tie(levels, scan, window_ms, resolve))
+
+    return {h: outcomes[h] for h in horizons_hours}
+
+
+def evaluate_signal_coarse(levels: Dict, coarse_ms: np.ndarray, coarse_highs: np.ndarray,
+                           coarse_lows: np.ndarray, bar_ms: int,
+                           load_fine: Callable[[int, int], Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                           end_ms: int, previous: Optional[Dict] = None,
+                           resolve=None) -> Dict:
+    """
+    Evaluate one signal on coarse bars, refining to fine candles only where needed
+
+    A fine candle can only touch a level if the coarse bar containing it
+    does, so fine candles are loaded just for coarse bars whose range
+    reaches a level, plus the partial bars at both ends of the window.
+    Bars in between only contribute their high/low to the excursions.
+    The result equals evaluate_signal on the fine candles of the window.
+
+    Args:
+        levels: Parsed signal from parse_signal
+        coarse_ms: Sorted open times of coarse bars covering the window
+        coarse_highs: Coarse bar highs aligned with coarse_ms
+        coarse_lows: Coarse bar lows aligned with coarse_ms
+        bar_ms: Coarse bar length in milliseconds
+        load_fine: Callback (start_ms, end_ms) -> (timestamps, highs, lows)
+                   of fine candles with open time in [start_ms, end_ms]
+        end_ms: Inclusive upper bound on candle open time
+        previous: Outcome of an earlier evaluation of the same signal
+        resolve: Optional finer-candle callback for an ambiguous exit candle
+                 (see resolve_tie)
+
+    Returns:
+        Outcome dictionary
+    """
+    resume_ms = resume_point(previous)
+    if resume_ms is None:
+        start_ms = -(-levels['signal_time'].value // 1_000_000)
+    else:
+        start_ms = resume_ms + 1
+
+    lo = int(np.searchsorted(coarse_ms, start_ms - bar_ms, side='right'))
+    hi = int(np.searchsorted(coarse_ms, end_ms, side='right'))
+    if lo >= hi:
+        if resume_ms is not None:
+            return dict(previous)
+        return no_data_outcome(levels, 'NO_DATA_AFTER_SIGNAL')
+
+    bars = coarse_ms[lo:hi]
+    targets = [levels[name] for name in TARGET_LEVELS]
+    stop_mask, target_masks, profit, drawdown = _level_masks(
+        coarse_highs[lo:hi], coarse_lows[lo:hi], levels['action'],
+        levels['entry_price'], levels['stop_loss'], targets)
+
+    refine = np.zeros(len(bars), dtype=bool)
+    for mask in [stop_mask] + target_masks:
+        if mask is not None:
+            refine |= mask
+    refine[0] |= bars[0] < start_ms
+    # The last bar is always refined so the last fine candle is known
+    refine[-1] = True
+
+    peak, trough = 0.0, 0.0
+    done = 0
+    last_ms = None
+    for i in np.flatnonzero(refine):
+        peak = np.fmax.reduce(profit[done:i], initial=peak)
+        trough = np.fmin.reduce(drawdown[done:i], initial=trough)
+        done = i + 1
+
+        fine_ms, fine_highs, fine_lows = load_fine(max(int(bars[i]), start_ms),
+                                                   min(int(bars[i]) + bar_ms - 1, end_ms))
+        if len(fine_ms) == 0:
+            continue
+
+        scan = scan_first_hits(fine_highs, fine_lows, levels['action'],
+                               levels['entry_price'], levels['stop_loss'], targets)
+        if scan['ambiguous']:
+            scan['prior_profit_pct'] = max(peak, scan['prior_profit_pct'])
+            scan['prior_drawdown_pct'] = min(trough, scan['prior_drawdown_pct'])
+        peak = max(peak, scan['max_profit_pct'])
+        trough = min(trough, scan['max_drawdown_pct'])
+        if scan['exit_index'] >= 0:
+            last_ms, exit_scan = fine_ms, scan
+            break
+        last_ms, exit_scan = fine_ms, None
+
+    if last_ms is None:
+        if resume_ms is not None:
+            return dict(previous)
+        return no_data_outcome(levels, 'NO_DATA_AFTER_SIGNAL')
+
+    if exit_scan is None:
+        exit_scan = {'exit_index': -1, 'stop_loss_hit': False,
+                     'targets_hit': tuple(False for _ in targets)}
+    scan = resolve_tie(levels, dict(exit_scan,
+                                    max_profit_pct=float(peak) if peak > 0 else 0,
+                                    max_drawdown_pct=float(trough) if trough < 0 else 0),
+                       last_ms, resolve)
+    if resume_ms is not None:
+        scan['max_profit_pct'] = _merge_extreme(previous['max_profit_pct'], scan['max_profit_pct'], True)
+        scan['max_drawdown_pct'] = _merge_extreme(previous['max_drawdown_pct'], scan['max_drawdown_pct'], False)
+    return build_outcome(levels, last_ms, scan)
+
+
+def flatten_horizons(outcomes: Dict[float, Dict]) -> Dict:
+    """
+    Merge per-horizon outcomes into one row with per-horizon columns
+
+    Signal fields (id, symbol, levels, ...) appear once; outcome fields
+    are suffixed with the horizon, e.g. final_outcome_24h.
+    """
+    row = {}
+    for horizon, outcome in outcomes.items():
+        for key in SIGNAL_FIELDS:
+            if key in outcome and key not in row:
+                row[key] = outcome[key]
+    for horizon, outcome in outcomes.items():
+        label = f"{horizon:g}h"
+        for key, value in outcome.items():
+            if key not in SIGNAL_FIELDS:
+                row[f"{key}_{label}"] = value
+    return row
+
+
+def resume_point(previous: Optional[Dict]) -> Optional[int]:
+    """
+    Open time (epoch ms) of the last candle an ONGOING outcome was evaluated on
+
+    Returns:
+        The timestamp, or None if the outcome cannot be continued
+        (closed, no data, or written before last_candle_time existed)
+    """
+    if not previous or previous.get('final_outcome') != 'ONGOING':
+        return None
+    last_candle_time = previous.get('last_candle_time')
+    if last_candle_time is None or pd.isna(last_candle_time):
+        return None
+    return pd.Timestamp(last_candle_time).value // 1_000_000
+
+
+def is_settled(previous: Optional[Dict], end_ms: int, candle_ms: int = 60_000) -> bool:
+    """
+    Whether an earlier outcome can be reused without looking at new candles
+
+    Closed outcomes are final, and so are ONGOING ones whose last
+    evaluated candle is the last candle of the lookforward window.
+
+    Args:
+        previous: Earlier outcome of the signal
+        end_ms: Inclusive end of the lookforward window (epoch ms)
+        candle_ms: Candle length in milliseconds
+    """
+    if not previous:
+        return False
+    if previous.get('final_outcome') in ('STOP_LOSS',) + tuple(name.upper() for name in TARGET_LEVELS):
+        return True
+    resume_ms = resume_point(previous)
+    return resume_ms is not None and resume_ms + candle_ms > end_ms
+
+
+def _merge_extreme(previous, current, maximum: bool):
+    """Combine a carried-over excursion with the one from newer candles"""
+    if previous is None or pd.isna(previous):
+        return current
+    value = max(previous, current) if maximum else min(previous, current)
+    return float(value) if value != 0 else 0
+
+
+def evaluate_signal(levels: Dict, timestamps_ms: np.ndarray,
+                    highs: np.ndarray, lows: np.ndarray,
+                    end_ms: Optional[int] = None,
+                    previous: Optional[Dict] = None,
+                    index=None, resolve=None) -> Dict:
+    """
+    Evaluate one signal against sorted kline arrays
+
+    When previous is an ONGOING outcome with a last_candle_time, only the
+    candles after it are scanned and its max profit/drawdown carry over,
+    which gives the same result as scanning the whole window again.
+
+    Args:
+        levels: Parsed signal from parse_signal
+        timestamps_ms: Sorted candle open times (epoch ms)
+        highs: Candle highs aligned with timestamps_ms
+        lows: Candle lows aligned with timestamps_ms
+        end_ms: Optional inclusive upper bound on candle open time
+        previous: Outcome of an earlier evaluation of the same signal
+        index: Optional RangeExtremeIndex built over highs/lows, used
+               instead of scanning the window
+        resolve: Optional finer-candle callback for an ambiguous exit candle
+                 (see resolve_tie)
+
+    Returns:
+        Outcome dictionary
+    """
+    resume_ms = resume_point(previous)
+
+    if resume_ms is None and len(timestamps_ms) == 0:
+        return no_data_outcome(levels, 'NO_DATA')
+
+    if resume_ms is None:
+        start = first_candle_at_or_after(timestamps_ms, levels['signal_time'])
+    else:
+        start = int(np.searchsorted(timestamps_ms, resume_ms, side='right'))
+    stop = len(timestamps_ms) if end_ms is None else int(
+        np.searchsorted(timestamps_ms, end_ms, side='right'))
+
+    if start >= stop:
+        if resume_ms is not None:
+            return dict(previous)
+        return no_data_outcome(levels, 'NO_DATA_AFTER_SIGNAL')
+
+    targets = [levels[name] for name in TARGET_LEVELS]
+    if index is not None:
+        scan = scan_first_hits_indexed(index, start, stop, levels['action'],
+                                       levels['entry_price'], levels['stop_loss'], targets)
+    else:
+        scan = scan_first_hits(highs[start:stop], lows[start:stop], levels['action'],
+                               levels['entry_price'], levels['stop_loss'], targets)
+    scan = resolve_tie(levels, scan, timestamps_ms[start:stop], resolve)
+    if resume_ms is not None:
+        scan['max_profit_pct'] = _merge_extreme(previous['max_profit_pct'], scan['max_profit_pct'], True)
+        scan['max_drawdown_pct'] = _merge_extreme(previous['max_drawdown_pct'], scan['max_drawdown_pct'], False)
+    return build_outcome(levels, timestamps_ms[start:stop], scan)
+
+
+def evaluate_klines(levels: Dict, klines, end_ms: int,
+                    previous: Optional[Dict] = None, resolve=None) -> Dict:
+    """
+    Evaluate one signal against a kline container
+
+    Only the signal's window is sliced out of the container, so compact
+    (int32 offset / float32) containers are never expanded as a whole.
+
+    Args:
+        levels: Parsed signal from parse_signal
+        klines: CompactKlines or MappedKlines of the signal's pair
+        end_ms: Inclusive upper bound on candle open time
+        previous: Outcome of an earlier evaluation of the same signal
+        resolve: Optional finer-candle callback for an ambiguous exit candle
+                 (see resolve_tie)
+
+    Returns:
+        Outcome dictionary (same as evaluate_signal on the window's arrays)
+    """
+    resume_ms = resume_point(previous)
+    if resume_ms is None:
+        start_ms = -(-levels['signal_time'].value // 1_000_000)
+    else:
+        start_ms = resume_ms + 1
+    timestamps_ms, highs, lows = klines.slice(start_ms, end_ms + 1)
+    if resume_ms is None and len(timestamps_ms) == 0 and len(klines):
+        # The container has candles, just none inside this signal's window
+        return no_data_outcome(levels, 'NO_DATA_AFTER_SIGNAL')
+    return evaluate_signal(levels, timestamps_ms, highs, lows, end_ms,
+                           previous=previous, resolve=resolve)
@@ -0,0 +1,150 @@
+"""
+Prefetch Planner
+
+Turns the kline windows a backtest needs into a minimal fetch plan.
+Overlapping windows of a symbol are merged, the days they touch are
+compared with the kline store, and only uncached days remain, grouped
+into contiguous runs that are each one paginated download. The plan
+reports request count, request weight and byte estimates up front, so
+the cold-start cost of a backtest is known before anything is fetched.
+"""
+
+import time
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .kline_store import KlineStore, COLUMNS, DAY_MS, INTERVAL_MS, contiguous_runs, day_index
+from .async_kline_fetcher import AsyncKlineFetcher
+from .rate_limiter import DEFAULT_LIMITS
+
+# Inclusive (start_ms, end_ms) window of candle open times
+Window = Tuple[int, int]
+
+# Approximate size of one kline row in a REST JSON response
+KLINE_JSON_BYTES = 150
+
+
+def merge_windows(windows: Iterable[Window]) -> List[Window]:
+    """
+    Merge overlapping or touching inclusive windows
+
+    Returns:
+        Sorted, non-overlapping windows
+    """
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def window_days(windows: Iterable[Window]) -> List[int]:
+    """Sorted UTC day numbers touched by inclusive windows"""
+    days = set()
+    for start, end in windows:
+        days.update(range(day_index(start), day_index(end) + 1))
+    return sorted(days)
+
+
+class FetchPlan:
+    """Uncached day runs per symbol, with request and size estimates"""
+
+    def __init__(self, interval: str, jobs: List[Dict], windows: Dict[str, List[Window]],
+                 days_needed: int, days_cached: int, days_pending: int):
+        self.interval = interval
+        self.jobs = jobs
+        self.windows = windows
+        self.days_needed = days_needed
+        self.days_cached = days_cached
+        self.days_pending = days_pending
+
+    @classmethod
+    def build(cls, windows: Dict[str, Iterable[Window]], store: KlineStore,
+              interval: str = "1m", now_ms: Optional[int] = None) -> 'FetchPlan':
+        """
+        Plan the downloads needed to cover windows
+
+        Args:
+            windows: Symbol -> inclusive (start_ms, end_ms) windows (may overlap)
+            store: Kline store checked for cached day partitions
+            interval: Kline interval
+            now_ms: Current time; days that have not ended are left to the
+                    regular fetch path, since they cannot be cached yet
+
+        Returns:
+            FetchPlan
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        candles_per_day = DAY_MS // INTERVAL_MS.get(interval, DAY_MS) or 1
+        merged = {symbol: merge_windows(symbol_windows) for symbol, symbol_windows in windows.items()}
+
+        jobs = []
+        days_needed = days_cached = days_pending = 0
+        for symbol, symbol_windows in merged.items():
+            days = window_days(symbol_windows)
+            days_needed += len(days)
+            missing = [day for day in days if not store.has_partition(symbol, interval, day)]
+            days_cached += len(days) - len(missing)
+            complete = [day for day in missing if (day + 1) * DAY_MS <= now_ms]
+            days_pending += len(missing) - len(complete)
+
+            for run in contiguous_runs(complete):
+                candles = len(run) * candles_per_day
+                requests = -(-candles // AsyncKlineFetcher.PAGE_LIMIT)
+                jobs.append({
+                    'symbol': symbol,
+                    'days': run,
+                    'start_ms': run[0] * DAY_MS,
+                    'end_ms': (run[-1] + 1) * DAY_MS - 1,
+                    'candles': candles,
+                    'requests': requests,
+                    'weight': requests * AsyncKlineFetcher.KLINES_WEIGHT
+                })
+
+        return cls(interval, jobs, merged, days_needed, days_cached, days_pending)
+
+    def summary(self) -> Dict:
+        """
+        Totals of the plan
+
+        Returns:
+            Dictionary with symbol/day counts, requests, request weight,
+            the minimum time the weight budget allows, and estimated
+            download and cache sizes in bytes
+        """
+        capacity, period = DEFAULT_LIMITS[AsyncKlineFetcher.ENDPOINT]
+        candles = sum(job['candles'] for job in self.jobs)
+        weight = sum(job['weight'] for job in self.jobs)
+        row_bytes = np.dtype(np.int64).itemsize + len(COLUMNS) * np.dtype(np.float64).itemsize
+        return {
+            'interval': self.interval,
+            'symbols': len(self.windows),
+            'windows': sum(len(windows) for windows in self.windows.values()),
+            'days_needed': self.days_needed,
+            'days_cached': self.days_cached,
+            'days_to_fetch': sum(len(job['days']) for job in self.jobs),
+            'days_pending': self.days_pending,
+            'runs': len(self.jobs),
+            'requests': sum(job['requests'] for job in self.jobs),
+            'weight': weight,
+            'min_seconds': max(0.0, (weight - capacity) / capacity * period),
+            'download_bytes': candles * KLINE_JSON_BYTES,
+            'cache_bytes': candles * row_bytes
+        }
+
+    def print_summary(self):
+        """Print the plan in the style of the backtest progress output"""
+        s = self.summary()
+        print(f"🗺️ Fetch plan ({s['interval']}): {s['symbols']} symbol(s), {s['windows']} merged window(s), "
+              f"{s['days_needed']} day(s) needed, {s['days_cached']} cached")
+        if not self.jobs:
+            print("💾 Everything is cached - no downloads needed")
+        else:
+            print(f"🌐 {s['days_to_fetch']} day(s) in {s['runs']} run(s): {s['requests']:,} request(s), "
+                  f"weight {s['weight']:,} (≥ {s['min_seconds']:.0f}s at the rate limit)")
+            print(f"📦 ~{s['download_bytes'] / 1e6:,.1f} MB to download, "
+                  f"~{s['cache_bytes'] / 1e6:,.1f} MB added to the cache")
+        if s['days_pending']:
+            print(f"⏳ {s['days_pending']} day(s) still in progress will be fetched during evaluation")
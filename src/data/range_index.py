@@ -0,0 +1,131 @@
+"""
+Range Extreme Index
+
+Sparse tables over a kline series' highs and lows. Built once per
+series in O(n log n), they answer "highest high / lowest low between two
+candles" in O(1) and "first candle at or beyond a price level" in
+O(log n), so excursions and first hits of many signal windows (and of
+several horizons per signal) do not need a linear scan each.
+
+All positions are half-open index ranges [lo, hi) into the series.
+Queries accept scalars or arrays (broadcast together) and return the
+same shape.
+"""
+
+import numpy as np
+from typing import List
+
+
+def _sparse_table(values: np.ndarray, reduce) -> List[np.ndarray]:
+    """Level k holds reduce over the 2**k values starting at each position"""
+    table = [values]
+    span = 1
+    while 2 * span <= len(values):
+        previous = table[-1]
+        table.append(reduce(previous[:-span], previous[span:]))
+        span *= 2
+    return table
+
+
+class RangeExtremeIndex:
+    """O(1) window max/min and O(log n) first-crossing queries on highs and lows"""
+
+    def __init__(self, highs: np.ndarray, lows: np.ndarray):
+        """
+        Build the sparse tables
+
+        Missing values (NaN) never count as a touch and never set an extreme.
+
+        Args:
+            highs: Candle highs
+            lows: Candle lows aligned with highs
+        """
+        highs = np.nan_to_num(np.asarray(highs, dtype=np.float64), nan=-np.inf)
+        lows = np.nan_to_num(np.asarray(lows, dtype=np.float64), nan=np.inf)
+        self.size = len(highs)
+        self._max = _sparse_table(highs, np.maximum)
+        self._min = _sparse_table(lows, np.minimum)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by both tables"""
+        return sum(level.nbytes for level in self._max + self._min)
+
+    def _range_query(self, table: List[np.ndarray], reduce, empty: float, lo, hi):
+        lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=np.int64), np.asarray(hi, dtype=np.int64))
+        length = hi - lo
+        result = np.full(lo.shape, empty)
+        valid = length > 0
+        if valid.any():
+            lo_v, hi_v = lo[valid], hi[valid]
+            levels = np.floor(np.log2(length[valid])).astype(np.int64)
+            values = np.empty(len(lo_v))
+            for k in np.unique(levels):
+                rows = levels == k
+                level = table[k]
+                values[rows] = reduce(level[lo_v[rows]], level[hi_v[rows] - (1 << k)])
+            result[valid] = values
+        return result if result.ndim else float(result)
+
+    def max_high(self, lo, hi):
+        """
+        Highest high of candles [lo, hi)
+
+        Returns:
+            The maximum, or -inf for an empty range
+        """
+        return self._range_query(self._max, np.maximum, -np.inf, lo, hi)
+
+    def min_low(self, lo, hi):
+        """
+        Lowest low of candles [lo, hi)
+
+        Returns:
+            The minimum, or inf for an empty range
+        """
+        return self._range_query(self._min, np.minimum, np.inf, lo, hi)
+
+    def _first_crossing(self, table: List[np.ndarray], not_reached, level, lo, hi):
+        """Binary lifting: skip blocks whose extreme does not reach the level yet"""
+        if np.ndim(level) == 0 and np.ndim(lo) == 0 and np.ndim(hi) == 0:
+            pos, hi = int(lo), int(hi)
+            for k in range(min(len(table), max(hi - pos, 1).bit_length()) - 1, -1, -1):
+                span = 1 << k
+                if pos + span <= hi and not_reached(table[k][pos], level):
+                    pos += span
+            return pos if pos < hi else -1
+
+        level, lo, hi = np.broadcast_arrays(np.asarray(level, dtype=np.float64),
+                                            np.asarray(lo, dtype=np.int64),
+                                            np.asarray(hi, dtype=np.int64))
+        pos = lo.copy()
+        for k in range(len(table) - 1, -1, -1):
+            span = 1 << k
+            fits = pos + span <= hi
+            if not fits.any():
+                continue
+            block = table[k][np.where(fits, pos, 0)]
+            pos = pos + np.where(fits & not_reached(block, level), span, 0)
+        result = np.where(pos < hi, pos, -1)
+        return result if result.ndim else int(result)
+
+    def first_high_at_or_above(self, level, lo, hi):
+        """
+        First candle in [lo, hi) whose high is >= level
+
+        Returns:
+            Candle index, or -1 if the level is not reached
+        """
+        return self._first_crossing(self._max, np.less, level, lo, hi)
+
+    def first_low_at_or_below(self, level, lo, hi):
+        """
+        First candle in [lo, hi) whose low is <= level
+
+        Returns:
+            Candle index, or -1 if the level is not reached
+        """
+        return self._first_crossing(self._min, np.greater, level, lo, hi)
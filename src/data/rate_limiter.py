@@ -0,0 +1,238 @@
+"""
+Rate Limiter
+
+Request-weight-aware token buckets shared by the market data and chat
+clients. Each endpoint key (e.g. 'binance:klines', 'discord:messages')
+gets its own bucket, and a request is also charged against the bucket of
+every configured prefix key, so 'discord:guilds' and 'discord:messages'
+share the 'discord' global limit on top of their own. Callers reserve
+weight before a request and report the response afterwards so that
+Retry-After and rate-limit headers are honoured with jittered backoff
+instead of fixed sleeps or recursion.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# endpoint -> (capacity in weight units, refill period in seconds)
+DEFAULT_LIMITS = {
+    'binance:klines': (6000, 60.0),
+    'discord': (50, 1.0),
+    'discord:messages': (5, 5.0),
+}
+
+THROTTLE_STATUSES = (418, 429)
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations in FIFO order"""
+
+    def __init__(self, capacity: float, period: float):
+        """
+        Initialize the bucket
+
+        Args:
+            capacity: Maximum weight available at once
+            period: Seconds needed to refill a full bucket
+        """
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, weight: float, now: float) -> float:
+        """
+        Reserve weight and return how long the caller must wait before using it
+
+        Tokens may go negative; later callers then queue behind earlier ones.
+        """
+        self._refill(now)
+        self.tokens -= weight
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def block(self, seconds: float, now: float):
+        """Stop handing out tokens for the given number of seconds"""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def set_remaining(self, remaining: float, now: float):
+        """Align the bucket with the server's view of the remaining budget"""
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiter:
+    """Token buckets keyed by endpoint, with counters and throttle handling"""
+
+    def __init__(self, limits: Optional[Mapping[str, Tuple[float, float]]] = None,
+                 max_retries: int = 5, base_backoff: float = 1.0,
+                 max_backoff: float = 60.0, jitter: float = 0.25):
+        """
+        Initialize the limiter
+
+        Args:
+            limits: Endpoint -> (capacity, period seconds); keys match by
+                    prefix, so 'discord' also limits 'discord:messages'
+            max_retries: Retries allowed per request when throttled
+            base_backoff: First backoff delay when no Retry-After is given
+            max_backoff: Upper bound for backoff delays
+            jitter: Random fraction added to every backoff delay
+        """
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._buckets = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _prefixes(self, endpoint: str) -> List[str]:
+        """Configured keys that cover an endpoint, most general first"""
+        return sorted((key for key in self.limits
+                       if endpoint == key or endpoint.startswith(key + ':')), key=len)
+
+    def _limit_for(self, endpoint: str) -> Tuple[float, float]:
+        """Most specific configured limit for an endpoint"""
+        matches = self._prefixes(endpoint)
+        if not matches:
+            return self.limits.get('default', (10, 1.0))
+        return self.limits[matches[-1]]
+
+    def _scopes(self, endpoint: str) -> List[str]:
+        """Bucket keys a request to endpoint is charged against: its prefixes and itself"""
+        scopes = self._prefixes(endpoint)
+        if endpoint not in scopes:
+            scopes.append(endpoint)
+        return scopes
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        if endpoint not in self._buckets:
+            self._buckets[endpoint] = TokenBucket(*self._limit_for(endpoint))
+            self._counters[endpoint] = {
+                'requests': 0, 'weight': 0, 'waits': 0, 'wait_seconds': 0.0,
+                'throttled': 0, 'retries': 0
+            }
+        return self._buckets[endpoint]
+
+    def _reserve(self, endpoint: str, weight: float) -> float:
+        with self._lock:
+            buckets = [(scope, self._bucket(scope)) for scope in self._scopes(endpoint)]
+            now = time.monotonic()
+            wait = 0.0
+            # Every scope is charged, so the request waits for the slowest one
+            for scope, bucket in buckets:
+                scope_wait = bucket.reserve(weight, now)
+                counters = self._counters[scope]
+                counters['requests'] += 1
+                counters['weight'] += weight
+                if scope_wait > 0:
+                    counters['waits'] += 1
+                    counters['wait_seconds'] += scope_wait
+                wait = max(wait, scope_wait)
+            return wait
+
+    def acquire(self, endpoint: str, weight: float = 1):
+        """Block until `weight` units of the endpoint's budget are available"""
+        wait = self._reserve(endpoint, weight)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: str, weight: float = 1):
+        """Async variant of acquire"""
+        wait = self._reserve(endpoint, weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next retry
+
+        Uses the server's Retry-After when given, otherwise exponential
+        backoff; both get random jitter so parallel clients do not retry
+        in lockstep.
+        """
+        if retry_after is None:
+            delay = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        else:
+            delay = max(0.0, float(retry_after))
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    def record_response(self, endpoint: str, status: int, headers: Optional[Mapping] = None,
+                        attempt: int = 0, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Report a response so the endpoint's bucket follows the server
+
+        Understands Retry-After, Binance X-MBX-USED-WEIGHT-1M and Discord
+        X-RateLimit-Remaining / X-RateLimit-Reset-After headers. Headers
+        describe the endpoint's own bucket; a throttled response blocks
+        the prefix buckets too when Discord marks it as global.
+
+        Args:
+            endpoint: Endpoint key used for acquire
+            status: HTTP status code
+            headers: Response headers
+            attempt: Zero-based retry attempt of this request
+            retry_after: Retry delay from the response body, if any
+
+        Returns:
+            Seconds to wait before retrying if the request was throttled
+            and may be retried, otherwise None
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._bucket(endpoint)
+            counters = self._counters[endpoint]
+
+            used_weight = headers.get('x-mbx-used-weight-1m')
+            if used_weight is not None:
+                bucket.set_remaining(bucket.capacity - float(used_weight), now)
+
+            remaining = headers.get('x-ratelimit-remaining')
+            reset_after = headers.get('x-ratelimit-reset-after')
+            if remaining is not None and float(remaining) <= 0 and reset_after is not None:
+                bucket.block(float(reset_after), now)
+
+            if status not in THROTTLE_STATUSES:
+                return None
+
+            counters['throttled'] += 1
+            if 'retry-after' in headers:
+                retry_after = float(headers['retry-after'])
+            delay = self.backoff_delay(attempt, retry_after)
+            bucket.block(delay, now)
+            if (str(headers.get('x-ratelimit-global', '')).lower() == 'true'
+                    or headers.get('x-ratelimit-scope') == 'global'):
+                for scope in self._scopes(endpoint):
+                    self._bucket(scope).block(delay, now)
+
+            if attempt >= self.max_retries:
+                return None
+            counters['retries'] += 1
+            return delay
+
+    def stats(self) -> Dict[str, Dict]:
+        """Snapshot of the per-bucket counters (prefix buckets count every request charged to them)"""
+        with self._lock:
+            return {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+
+
+_shared_limiter = None
+
+
+def get_shared_limiter() -> RateLimiter:
+    """Process-wide limiter shared by all clients that are not given their own"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter()
+    return _shared_limiter
@@ -0,0 +1,380 @@
+"""
+Result Metrics
+
+Headline and per-group metrics of a backtest's outcome dictionaries,
+computed from one columnar table instead of a separate scan of the
+result list per metric.
+
+ResultTable extracts every column the metrics need in one pass. Groups
+(symbol, timeframe, strategy, action) are factorized in order of first
+appearance and split with one stable sort, so counts are bincounts and
+only the per-group means and value lists touch each group. The numbers,
+key order and float rounding match the loop-based metrics they replace:
+means are taken over the same values in result order and the profit
+factor uses a sequential sum like Python's sum().
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence, Tuple, Union
+
+TARGET_LEVELS = ('target1', 'target2', 'target3')
+
+# Columns grouped on (missing values read as 'Unknown', like r.get(column, 'Unknown'))
+CATEGORY_COLUMNS = ('timeframe', 'strategy_version', 'action')
+
+
+def _column(results: Union[List[Dict], pd.DataFrame], name: str, default=None) -> np.ndarray:
+    """Object array of one field of every result (missing DataFrame cells read as default)"""
+    if isinstance(results, pd.DataFrame):
+        if name not in results:
+            return np.full(len(results), default, dtype=object)
+        values = results[name].to_numpy(dtype=object, copy=True)
+        values[pd.isna(values)] = default
+        return values
+
+    values = np.empty(len(results), dtype=object)
+    values[:] = [result.get(name, default) for result in results]
+    return values
+
+
+def _truthy(values: np.ndarray) -> np.ndarray:
+    """Python truthiness of every value (None, 0 and False are falsy)"""
+    return values.astype(bool)
+
+
+def _floats(values: np.ndarray) -> np.ndarray:
+    """Values as float64, None as NaN"""
+    return values.astype(np.float64)
+
+
+def _mean(values: np.ndarray):
+    return np.mean(values) if len(values) else 0
+
+
+def _sequential_sum(values: np.ndarray) -> float:
+    """Left-to-right sum, rounding like Python's sum() rather than NumPy's pairwise sum"""
+    return float(np.cumsum(values)[-1]) if len(values) else 0
+
+
+class ResultTable:
+    """Columnar view of outcome dictionaries (or a detailed results DataFrame)"""
+
+    def __init__(self, results: Union[List[Dict], pd.DataFrame],
+                 categories: Sequence[str] = CATEGORY_COLUMNS):
+        """
+        Extract the metric columns
+
+        Args:
+            results: Outcome dictionaries or a detailed results DataFrame;
+                     results without final_outcome count as NO_DATA
+            categories: Fields that can be grouped on besides symbol
+        """
+        self.size = len(results)
+
+        final_outcome = _column(results, 'final_outcome', 'NO_DATA')
+        codes, outcomes = pd.factorize(final_outcome, use_na_sentinel=False)
+        outcomes = ['NO_DATA' if pd.isna(outcome) else str(outcome) for outcome in outcomes]
+        self.valid = np.array([outcome != 'NO_DATA' for outcome in outcomes], dtype=bool)[codes]
+        self.win = np.array([outcome.startswith('TARGET') for outcome in outcomes], dtype=bool)[codes]
+        self.loss = np.array([outcome == 'STOP_LOSS' for outcome in outcomes], dtype=bool)[codes]
+        self.outcome_is = {outcome: codes == code for code, outcome in enumerate(outcomes)}
+
+        self.hit = {}
+        self.minutes = {}
+        self.has_minutes = {}
+        for name in TARGET_LEVELS + ('stop_loss',):
+            self.hit[name] = _truthy(_column(results, f'hit_{name}', False))
+            minutes = _column(results, f'{name}_minutes')
+            self.minutes[name] = _floats(minutes)
+            self.has_minutes[name] = _truthy(minutes)
+
+        self.rr = {}
+        self.has_rr = {}
+        for name in TARGET_LEVELS:
+            rr = _column(results, f'rr_{name}')
+            self.rr[name] = _floats(rr)
+            self.has_rr[name] = _truthy(rr)
+
+        self.max_profit = _floats(_column(results, 'max_profit_pct', 0))
+        self.max_drawdown = _floats(_column(results, 'max_drawdown_pct', 0))
+
+        self.keys = {'symbol': _column(results, 'symbol')}
+        for category in categories:
+            self.keys[category] = _column(results, category, 'Unknown')
+
+    def count(self, name: str, mask: np.ndarray = None) -> int:
+        """Number of rows of one final outcome (within mask)"""
+        rows = self.outcome_is.get(name)
+        if rows is None:
+            return 0
+        return int(np.count_nonzero(rows if mask is None else rows & mask))
+
+    def interleaved(self, values: Dict[str, np.ndarray], present: Dict[str, np.ndarray],
+                    names: Sequence[str], mask: np.ndarray) -> np.ndarray:
+        """
+        Values of several fields in row order (row 1 field 1, row 1 field 2, ...),
+        keeping only truthy values of rows in mask
+        """
+        stacked = np.column_stack([values[name] for name in names])
+        keep = np.column_stack([present[name] & mask for name in names])
+        return stacked[keep]
+
+    def groups(self, key: str, mask: np.ndarray) -> Tuple[list, np.ndarray, List[np.ndarray]]:
+        """
+        Rows in mask grouped by a key column
+
+        Returns:
+            Tuple of (keys in order of first appearance, group code of every
+            selected row, row indices of each group in result order)
+        """
+        rows = np.flatnonzero(mask)
+        codes, keys = pd.factorize(self.keys[key][rows], use_na_sentinel=False)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1]
+        # factorize reports a None key as NaN
+        keys = [None if pd.isna(group) else group for group in keys]
+        return keys, codes, np.split(rows[order], bounds)
+
+
+def _group_counts(table: ResultTable, key: str, mask: np.ndarray, winrate_key: str) -> Dict:
+    """total/wins/losses/win rate per group"""
+    keys, codes, _ = table.groups(key, mask)
+    rows = np.flatnonzero(mask)
+    totals = np.bincount(codes, minlength=len(keys)).tolist()
+    wins = np.bincount(codes, weights=table.win[rows], minlength=len(keys)).astype(np.int64).tolist()
+    losses = np.bincount(codes, weights=table.loss[rows], minlength=len(keys)).astype(np.int64).tolist()
+
+    stats = {}
+    for group, total, won, lost in zip(keys, totals, wins, losses):
+        stats[group] = {'total': total, 'wins': won, 'losses': lost,
+                        winrate_key: (won / total) * 100}
+    return stats
+
+
+def comprehensive_metrics(results: Union[List[Dict], pd.DataFrame]) -> Dict:
+    """
+    Metrics of a full backtest run (the *_metrics_*.json layout of full_backtest.py)
+
+    Args:
+        results: Outcome dictionaries or a detailed results DataFrame
+
+    Returns:
+        Metrics dictionary ({} without results, an error entry without valid results)
+    """
+    if len(results) == 0:
+        return {}
+
+    table = ResultTable(results)
+    valid = table.valid
+    total_signals = table.size
+    total_valid = int(np.count_nonzero(valid))
+    if total_valid == 0:
+        return {'error': 'No valid results to analyze'}
+
+    target1_hits, target2_hits, target3_hits, stop_loss_hits = (
+        int(np.count_nonzero(table.hit[name] & valid)) for name in TARGET_LEVELS + ('stop_loss',))
+    any_target_wins = int(np.count_nonzero(table.win & valid))
+
+    target_times = table.interleaved(table.minutes, table.has_minutes, TARGET_LEVELS, valid)
+    target_level_times = [table.minutes[name][table.has_minutes[name] & valid] for name in TARGET_LEVELS]
+    sl_times = table.minutes['stop_loss'][table.has_minutes['stop_loss'] & valid]
+
+    all_profits = table.max_profit[valid]
+    all_drawdowns = table.max_drawdown[valid]
+    profits = all_profits[all_profits > 0]
+    drawdowns = np.abs(all_drawdowns[all_drawdowns < 0])
+
+    return {
+        # Dataset info
+        'total_signals': total_signals,
+        'valid_signals': total_valid,
+        'data_coverage_pct': (total_valid / total_signals) * 100,
+
+        # Win rates
+        'overall_winrate_pct': (any_target_wins / total_valid) * 100,
+        'target1_hit_rate_pct': (target1_hits / total_valid) * 100,
+        'target2_hit_rate_pct': (target2_hits / total_valid) * 100,
+        'target3_hit_rate_pct': (target3_hits / total_valid) * 100,
+        'stop_loss_rate_pct': (stop_loss_hits / total_valid) * 100,
+
+        # Outcome counts
+        'total_wins': any_target_wins,
+        'total_losses': stop_loss_hits,
+        'target1_only_wins': table.count('TARGET1', valid),
+        'target2_wins': table.count('TARGET2', valid),
+        'target3_wins': table.count('TARGET3', valid),
+        'target1_hits': target1_hits,
+        'target2_hits': target2_hits,
+        'target3_hits': target3_hits,
+
+        # Timing metrics (minutes)
+        'avg_target_time_min': _mean(target_times),
+        'median_target_time_min': np.median(target_times) if len(target_times) else 0,
+        'avg_target1_time_min': _mean(target_level_times[0]),
+        'avg_target2_time_min': _mean(target_level_times[1]),
+        'avg_target3_time_min': _mean(target_level_times[2]),
+        'avg_sl_time_min': _mean(sl_times),
+        'median_sl_time_min': np.median(sl_times) if len(sl_times) else 0,
+        'fastest_target_min': float(target_times.min()) if len(target_times) else 0,
+        'slowest_target_min': float(target_times.max()) if len(target_times) else 0,
+
+        # Profit/Loss metrics
+        'avg_max_profit_pct': _mean(profits),
+        'median_max_profit_pct': np.median(profits) if len(profits) else 0,
+        'best_profit_pct': float(profits.max()) if len(profits) else 0,
+        'avg_max_drawdown_pct': _mean(drawdowns),
+        'median_max_drawdown_pct': np.median(drawdowns) if len(drawdowns) else 0,
+        'worst_drawdown_pct': float(drawdowns.max()) if len(drawdowns) else 0,
+
+        # Risk metrics
+        'profit_factor': (_sequential_sum(profits) / abs(_sequential_sum(all_drawdowns[all_drawdowns < 0])))
+                         if len(drawdowns) else float('inf'),
+        'sharpe_estimate': np.mean(all_profits) / np.std(all_profits)
+                           if len(all_profits) > 1 and np.std(all_profits) > 0 else 0,
+
+        # Performance by categories
+        'symbol_performance': _symbol_performance(table, valid),
+        'timeframe_performance': _group_counts(table, 'timeframe', valid, 'winrate_pct'),
+        'strategy_performance': _group_counts(table, 'strategy_version', valid, 'winrate_pct'),
+        'action_performance': _group_counts(table, 'action', valid, 'winrate_pct')
+    }
+
+
+def _symbol_performance(table: ResultTable, mask: np.ndarray) -> Dict:
+    """Per-symbol counts, profit/drawdown lists and averages of comprehensive_metrics"""
+    stats = {}
+    keys, _, groups = table.groups('symbol', mask)
+    for symbol, rows in zip(keys, groups):
+        win = table.win[rows]
+        profit = table.max_profit[rows]
+        drawdown = table.max_drawdown[rows]
+        profits = profit[profit > 0]
+        drawdowns = np.abs(drawdown[drawdown < 0])
+        target_times = table.minutes['target1'][rows][win & table.has_minutes['target1'][rows]]
+
+        total = len(rows)
+        wins = int(np.count_nonzero(win))
+        stats[symbol] = {
+            'total': total,
+            'wins': wins,
+            'losses': int(np.count_nonzero(table.loss[rows])),
+            'profits': profits.tolist(),
+            'drawdowns': drawdowns.tolist(),
+            'target_times': target_times.tolist(),
+            'winrate_pct': (wins / total) * 100,
+            'avg_profit_pct': _mean(profits),
+            'avg_drawdown_pct': _mean(drawdowns),
+            'avg_target_time_min': _mean(target_times)
+        }
+    return stats
+
+
+def signal_metrics(results: Union[List[Dict], pd.DataFrame]) -> Dict:
+    """
+    Metrics of a SignalBacktester run (its calculate_metrics layout)
+
+    Per-group statistics cover all results, including NO_DATA ones.
+
+    Args:
+        results: Outcome dictionaries or a detailed results DataFrame
+
+    Returns:
+        Metrics dictionary ({} without results)
+    """
+    if len(results) == 0:
+        return {}
+
+    table = ResultTable(results)
+    valid = table.valid
+    total_signals = table.size
+    total_valid = int(np.count_nonzero(valid))
+
+    target1_hits, target2_hits, target3_hits, stop_loss_hits = (
+        int(np.count_nonzero(table.hit[name] & valid)) for name in TARGET_LEVELS + ('stop_loss',))
+    wins = int(np.count_nonzero(table.win & valid))
+
+    if total_valid > 0:
+        target1_rate = (target1_hits / total_valid) * 100
+        target2_rate = (target2_hits / total_valid) * 100
+        target3_rate = (target3_hits / total_valid) * 100
+        stop_loss_rate = (stop_loss_hits / total_valid) * 100
+        overall_winrate = (wins / total_valid) * 100
+    else:
+        target1_rate = target2_rate = target3_rate = stop_loss_rate = overall_winrate = 0
+
+    target_times = table.interleaved(table.minutes, table.has_minutes, TARGET_LEVELS, valid)
+    sl_times = table.minutes['stop_loss'][table.has_minutes['stop_loss'] & valid]
+    profits = table.max_profit[valid & (table.max_profit > 0)]
+    drawdowns = np.abs(table.max_drawdown[valid & (table.max_drawdown < 0)])
+    rr_ratios = table.interleaved(table.rr, table.has_rr, TARGET_LEVELS, valid)
+    every_row = np.ones(table.size, dtype=bool)
+
+    return {
+        'total_signals': total_signals,
+        'valid_signals': total_valid,
+        'data_coverage': (total_valid / total_signals) * 100 if total_signals > 0 else 0,
+
+        # Win rates
+        'overall_winrate': overall_winrate,
+        'target1_rate': target1_rate,
+        'target2_rate': target2_rate,
+        'target3_rate': target3_rate,
+        'stop_loss_rate': stop_loss_rate,
+
+        # Counts
+        'target1_hits': target1_hits,
+        'target2_hits': target2_hits,
+        'target3_hits': target3_hits,
+        'stop_loss_hits': stop_loss_hits,
+        'wins': wins,
+        'losses': stop_loss_hits,
+
+        # Timing (in minutes)
+        'avg_target_time': _mean(target_times),
+        'median_target_time': np.median(target_times) if len(target_times) else 0,
+        'avg_sl_time': _mean(sl_times),
+        'median_sl_time': np.median(sl_times) if len(sl_times) else 0,
+        'fastest_target': float(target_times.min()) if len(target_times) else 0,
+        'slowest_target': float(target_times.max()) if len(target_times) else 0,
+
+        # Profit/Loss
+        'avg_max_profit': _mean(profits),
+        'max_profit_achieved': float(profits.max()) if len(profits) else 0,
+        'avg_max_drawdown': _mean(drawdowns),
+        'worst_drawdown': float(drawdowns.max()) if len(drawdowns) else 0,
+
+        # Risk/Reward
+        'avg_risk_reward': _mean(rr_ratios),
+        'best_risk_reward': float(rr_ratios.max()) if len(rr_ratios) else 0,
+
+        # Symbol performance
+        'symbol_performance': _signal_symbol_performance(table, every_row),
+        'timeframe_performance': _group_counts(table, 'timeframe', every_row, 'winrate'),
+        'strategy_performance': _group_counts(table, 'strategy_version', every_row, 'winrate')
+    }
+
+
+def _signal_symbol_performance(table: ResultTable, mask: np.ndarray) -> Dict:
+    """Per-symbol counts and exit times of signal_metrics"""
+    stats = {}
+    keys, _, groups = table.groups('symbol', mask)
+    for symbol, rows in zip(keys, groups):
+        win = table.win[rows]
+        loss = table.loss[rows]
+        target_times = table.minutes['target1'][rows][win & table.has_minutes['target1'][rows]]
+        sl_times = table.minutes['stop_loss'][rows][loss & table.has_minutes['stop_loss'][rows]]
+
+        total = len(rows)
+        wins = int(np.count_nonzero(win))
+        stats[symbol] = {
+            'total': total,
+            'wins': wins,
+            'losses': int(np.count_nonzero(loss)),
+            'target_times': target_times.tolist(),
+            'sl_times': sl_times.tolist(),
+            'winrate': (wins / total) * 100,
+            'avg_target_time': _mean(target_times),
+            'avg_sl_time': _mean(sl_times)
+        }
+    return stats
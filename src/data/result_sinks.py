@@ -0,0 +1,214 @@
+"""
+Streaming Result Sinks
+
+Write backtest outcomes incrementally instead of building one DataFrame
+at the end. Rows are buffered into fixed-size row groups and flushed to
+CSV or Parquet, while running aggregates (an OnlineMetrics of outcome
+counts, hit counts and profit/drawdown moments) are kept on the side so
+summaries do not need the full result list in memory.
+"""
+
+import os
+import pandas as pd
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+from .online_metrics import OnlineMetrics
+
+# Outcome fields in the order produced by outcome_engine.build_outcome
+OUTCOME_COLUMNS = [
+    'signal_id', 'symbol', 'action', 'signal_time', 'entry_price', 'stop_loss',
+    'target1', 'target2', 'target3', 'status', 'outcome',
+    'hit_target1', 'hit_target2', 'hit_target3', 'hit_stop_loss',
+    'target1_time', 'target2_time', 'target3_time', 'stop_loss_time',
+    'target1_minutes', 'target2_minutes', 'target3_minutes', 'stop_loss_minutes',
+    'max_profit_pct', 'max_drawdown_pct', 'final_outcome', 'last_candle_time'
+]
+
+FLOAT_COLUMNS = {
+    'entry_price', 'stop_loss', 'target1', 'target2', 'target3',
+    'target1_minutes', 'target2_minutes', 'target3_minutes', 'stop_loss_minutes',
+    'max_profit_pct', 'max_drawdown_pct', 'rr_target1', 'rr_target2', 'rr_target3'
+}
+BOOL_COLUMNS = {'hit_target1', 'hit_target2', 'hit_target3', 'hit_stop_loss'}
+TIME_COLUMNS = {'signal_time', 'target1_time', 'target2_time', 'target3_time', 'stop_loss_time',
+                'last_candle_time'}
+STRING_COLUMNS = {'symbol', 'action', 'status', 'outcome', 'final_outcome'}
+
+
+def result_columns(results: Iterable[Dict]) -> List[str]:
+    """Standard outcome columns followed by any extra keys, in order of first appearance"""
+    columns = list(OUTCOME_COLUMNS)
+    seen = set(columns)
+    for result in results:
+        for key in result:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    return columns
+
+
+def results_frame(results: List[Dict], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Outcome dictionaries as a DataFrame with a fixed column layout
+
+    Used by the sinks and by in-memory saves alike, so a streamed CSV has
+    the same columns (and float formatting) as one written at the end.
+
+    Args:
+        results: Outcome dictionaries
+        columns: Column list (defaults to result_columns(results))
+
+    Returns:
+        DataFrame with float columns cast to float64
+    """
+    frame = pd.DataFrame(results, columns=columns or result_columns(results))
+    for column in FLOAT_COLUMNS.intersection(frame.columns):
+        frame[column] = frame[column].astype('float64')
+    return frame
+
+
+class ResultSink(ABC):
+    """
+    Base class for streaming result writers
+
+    Subclasses implement _write_group; rows are buffered and handed over
+    in groups of row_group_size. The column list is fixed when the first
+    group is flushed: result_columns of that group, i.e. the standard
+    outcome columns followed by any extra keys seen in it (e.g.
+    timeframe, rr_target1).
+    """
+
+    def __init__(self, path: str, row_group_size: int = 1000,
+                 columns: Optional[List[str]] = None):
+        """
+        Initialize the sink
+
+        Args:
+            path: Output file
+            row_group_size: Rows buffered before each write
+            columns: Fixed column list (defaults to outcome columns plus extras)
+        """
+        self.path = path
+        self.row_group_size = row_group_size
+        self.columns = list(columns) if columns else None
+        self.aggregates = OnlineMetrics()
+        self.rows_written = 0
+        self._buffer = []
+        self._dropped = set()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def write(self, result: Dict):
+        """Add one result, flushing a row group when the buffer is full"""
+        self._buffer.append(result)
+        self.aggregates.update(result)
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, results: Iterable[Dict]):
+        for result in results:
+            self.write(result)
+
+    def flush(self):
+        """Write buffered rows as one row group"""
+        if not self._buffer:
+            return
+
+        if self.columns is None:
+            self.columns = result_columns(self._buffer)
+
+        unknown = {key for row in self._buffer for key in row} - set(self.columns) - self._dropped
+        if unknown:
+            print(f"⚠️ Dropping columns not in {os.path.basename(self.path)}: {sorted(unknown)}")
+            self._dropped.update(unknown)
+
+        self._write_group(results_frame(self._buffer, self.columns))
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    @abstractmethod
+    def _write_group(self, frame: pd.DataFrame):
+        """Write one row group"""
+
+    def close(self):
+        """Flush remaining rows and close the file"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CSVResultSink(ResultSink):
+    """Append row groups to a CSV file (same layout as DataFrame.to_csv)"""
+
+    def __init__(self, path: str, row_group_size: int = 1000,
+                 columns: Optional[List[str]] = None):
+        super().__init__(path, row_group_size, columns)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+
+    def _write_group(self, frame: pd.DataFrame):
+        frame.to_csv(self._file, header=self.rows_written == 0, index=False)
+        self._file.flush()
+
+    def close(self):
+        super().close()
+        if self.rows_written == 0 and self.columns:
+            pd.DataFrame(columns=self.columns).to_csv(self._file, index=False)
+        self._file.close()
+
+
+class ParquetResultSink(ResultSink):
+    """Write row groups to a Parquet file (requires pyarrow)"""
+
+    def __init__(self, path: str, row_group_size: int = 1000,
+                 columns: Optional[List[str]] = None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetResultSink requires pyarrow (pip install pyarrow)")
+
+        super().__init__(path, row_group_size, columns)
+        self._pa = pyarrow
+        self._writer = None
+        self._schema = None
+
+    def _build_schema(self, frame: pd.DataFrame):
+        """Declared types for outcome columns, inferred types for the rest"""
+        pa = self._pa
+        fields = []
+        for column in self.columns:
+            if column in FLOAT_COLUMNS:
+                pa_type = pa.float64()
+            elif column in BOOL_COLUMNS:
+                pa_type = pa.bool_()
+            elif column in TIME_COLUMNS:
+                pa_type = pa.timestamp('ns', tz='UTC')
+            elif column in STRING_COLUMNS:
+                pa_type = pa.string()
+            else:
+                pa_type = pa.Array.from_pandas(frame[column]).type
+                if pa.types.is_null(pa_type):
+                    pa_type = pa.string()
+            fields.append(pa.field(column, pa_type))
+        return pa.schema(fields)
+
+    def _write_group(self, frame: pd.DataFrame):
+        import pyarrow.parquet as pq
+
+        for column in TIME_COLUMNS.intersection(self.columns):
+            frame[column] = pd.to_datetime(frame[column], utc=True)
+        if self._schema is None:
+            self._schema = self._build_schema(frame)
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+
+        table = self._pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table, row_group_size=len(frame))
+
+    def close(self):
+        super().close()
+        if self._writer is not None:
+            self._writer.close()
@@ -0,0 +1,138 @@
+"""
+Results Journal
+
+Append-only JSONL checkpoint of backtest outcomes. Every evaluated signal
+is written as one line keyed by its signal_id and the run parameters
+(every option that changes outcomes, e.g. lookforward_hours), so an
+interrupted run can be resumed by skipping signals that already have an
+outcome for the same parameters. A journal written with other parameters
+is refused instead of being mixed into the run.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Optional
+
+
+def _encode(value: Any):
+    """JSON fallback for values found in outcome dictionaries"""
+    if isinstance(value, pd.Timestamp):
+        return {'$ts': value.isoformat(), 'tz': str(value.tz) if value.tz else None, 'unit': value.unit}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot journal value of type {type(value).__name__}")
+
+
+def _decode(obj: Dict):
+    """Restore values encoded by _encode"""
+    if '$ts' in obj:
+        timestamp = pd.Timestamp(obj['$ts'])
+        if obj.get('unit'):
+            timestamp = timestamp.as_unit(obj['unit'])
+        return timestamp.tz_convert(obj['tz']) if obj.get('tz') else timestamp
+    return obj
+
+
+def digest(value: Any) -> str:
+    """Short stable digest of a value, e.g. the previous outcomes of an incremental run"""
+    encoded = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+class JournalMismatchError(Exception):
+    """The journal holds outcomes of a run with other parameters"""
+
+
+class ResultsJournal:
+    """Append-only outcome log keyed by signal_id and run parameters"""
+
+    def __init__(self, path: str, params: Optional[Dict] = None):
+        """
+        Initialize the journal
+
+        Args:
+            path: JSONL file to append to
+            params: Run parameters that must match for an entry to be reused
+        """
+        self.path = path
+        self.params = dict(params or {})
+        self._params_key = json.dumps(self.params, sort_keys=True, default=str)
+        self._file = None
+
+    def key(self, signal_id: Any) -> str:
+        """Journal key of a signal under this journal's parameters"""
+        return f"{signal_id}|{self._params_key}"
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Read completed outcomes for this journal's parameters
+
+        A torn last line (e.g. from a crash mid-write) is ignored.
+
+        Returns:
+            Mapping of journal key to outcome dictionary
+
+        Raises:
+            JournalMismatchError: If entries were written with other parameters
+        """
+        completed = {}
+        other_params = None
+        if not os.path.exists(self.path):
+            return completed
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line, object_hook=_decode)
+                except ValueError:
+                    continue
+                if json.dumps(entry.get('params'), sort_keys=True, default=str) != self._params_key:
+                    other_params = entry.get('params')
+                    continue
+                completed[self.key(entry['signal_id'])] = entry['outcome']
+
+        if other_params is not None:
+            raise JournalMismatchError(f"{self.path} was written with {other_params}, "
+                                       f"this run uses {self.params}")
+        return completed
+
+    def open(self, resume: bool = True):
+        """
+        Open the journal for appending
+
+        Args:
+            resume: Keep existing entries (otherwise start a new journal)
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        return self
+
+    def append(self, signal_id: Any, outcome: Dict):
+        """Write one outcome and flush it to disk"""
+        entry = {
+            'signal_id': _encode(signal_id) if isinstance(signal_id, np.generic) else signal_id,
+            'params': self.params,
+            'outcome': outcome
+        }
+        self._file.write(json.dumps(entry, default=_encode) + '\n')
+        self._file.flush()
+
+    def extend(self, entries: Iterable):
+        """Write several (signal_id, outcome) pairs"""
+        for signal_id, outcome in entries:
+            self.append(signal_id, outcome)
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
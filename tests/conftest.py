@@ -0,0 +1,50 @@
+"""
+Shared fixtures for the offline test suite
+
+Puts the repository root and src on sys.path the same way the root
+scripts do, and provides deterministic synthetic klines so no test
+needs network access.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+
+def synthetic_klines(start_ms: int, count: int, interval_ms: int = 60_000, seed: int = 0):
+    """
+    Random-walk klines in the REST row layout
+
+    Prices are rounded to 8 decimals and serialized as strings, like the
+    klines endpoint, so parsing them gives exactly the same floats.
+
+    Returns:
+        List of 12-field kline rows
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, count)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.001, count)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.001, count)))
+    volume = rng.uniform(1, 50, count)
+
+    rows = []
+    for i in range(count):
+        open_time = start_ms + i * interval_ms
+        o, h, l, c, v = (round(float(x[i]), 8) for x in (open_, high, low, close, volume))
+        rows.append([open_time, f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}",
+                     open_time + interval_ms - 1, f"{round(v * c, 8):.8f}", 10 + i % 7,
+                     "0", "0", "0"])
+    return rows
+
+
+@pytest.fixture
+def make_klines():
+    """Factory for synthetic REST kline rows (see synthetic_klines)"""
+    return synthetic_klines
@@ -0,0 +1,163 @@
+"""
+Ingestion of Binance kline archives into the kline store
+
+Builds daily and monthly zip archives in the data.binance.vision layout
+(with and without a header row, millisecond and microsecond open times)
+and checks every stored day partition against the rows that went in.
+"""
+
+import calendar
+import zipfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from data.archive_ingest import find_archives, ingest_archives, parse_archive_name, read_archive
+from data.kline_store import COLUMNS, KLINE_FIELDS, KlineStore, day_index
+
+HEADER = ("open_time,open,high,low,close,volume,close_time,quote_volume,count,"
+          "taker_buy_volume,taker_buy_quote_volume,ignore")
+
+
+def day_ms(year: int, month: int, day: int) -> int:
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def write_archive(directory, name: str, rows, header: bool, micros: bool):
+    """Zip rows as one CSV member, the way the public data dump ships them"""
+    lines = [HEADER] if header else []
+    for row in rows:
+        fields = list(row)
+        if micros:
+            fields[0], fields[6] = fields[0] * 1000, fields[6] * 1000 + 999
+        lines.append(','.join(str(field) for field in fields))
+
+    path = directory / f"{name}.zip"
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(f"{name}.csv", '\n'.join(lines) + '\n')
+    return path
+
+
+def expected_arrays(rows):
+    """Open times and the COLUMNS matrix a partition should hold for rows"""
+    timestamps = np.array([row[0] for row in rows], dtype=np.int64)
+    values = np.array([[float(row[i]) for i in KLINE_FIELDS[1:]] for row in rows]).T
+    return timestamps, values.reshape(len(COLUMNS), len(rows))
+
+
+@pytest.fixture
+def archives(tmp_path, make_klines):
+    """
+    Archive directory covering four symbol/month combinations
+
+    Returns:
+        (directory, {(symbol, day): rows}) with the source rows per day
+    """
+    directory = tmp_path / 'downloads'
+    (directory / 'daily').mkdir(parents=True)
+    (directory / 'monthly').mkdir(parents=True)
+    source = {}
+
+    def add(symbol, rows):
+        for row in rows:
+            source.setdefault((symbol, day_index(row[0])), []).append(row)
+
+    # Daily, headerless, millisecond open times
+    rows = make_klines(day_ms(2024, 1, 15), 1440, seed=1)
+    write_archive(directory / 'daily', 'BTCUSDT-1m-2024-01-15', rows, header=False, micros=False)
+    add('BTCUSDT', rows)
+
+    # Daily, header row, microsecond open times (newer spot archives)
+    rows = make_klines(day_ms(2025, 1, 2), 1440, seed=2)
+    write_archive(directory / 'daily', 'ETHUSDT-1m-2025-01-02', rows, header=True, micros=True)
+    add('ETHUSDT', rows)
+
+    # Monthly, header row, milliseconds, rows out of order and a gap on the 10th
+    rows = make_klines(day_ms(2024, 2, 1), 29 * 1440, seed=3)
+    rows = [row for row in rows if not day_ms(2024, 2, 10) <= row[0] < day_ms(2024, 2, 10) + 3_600_000]
+    shuffled = [rows[i] for i in np.random.default_rng(0).permutation(len(rows))]
+    write_archive(directory / 'monthly', 'SOLUSDT-1m-2024-02', shuffled, header=True, micros=False)
+    add('SOLUSDT', rows)
+
+    # Monthly, headerless, microseconds; a daily file of the same month must be skipped
+    rows = make_klines(day_ms(2025, 3, 1), 31 * 1440, seed=4)
+    write_archive(directory / 'monthly', 'BTCUSDT-1m-2025-03', rows, header=False, micros=True)
+    write_archive(directory / 'daily', 'BTCUSDT-1m-2025-03-05',
+                  make_klines(day_ms(2025, 3, 5), 1440, seed=99), header=False, micros=False)
+    add('BTCUSDT', rows)
+
+    return directory, source
+
+
+def test_parse_archive_name():
+    daily = parse_archive_name('BTCUSDT-1m-2024-01-15.zip')
+    assert daily == {'symbol': 'BTCUSDT', 'interval': '1m',
+                     'days': [day_index(day_ms(2024, 1, 15))], 'monthly': False}
+
+    monthly = parse_archive_name('ETHUSDT-1h-2024-02.csv')
+    assert monthly['monthly'] and monthly['interval'] == '1h'
+    assert monthly['days'] == list(range(day_index(day_ms(2024, 2, 1)),
+                                         day_index(day_ms(2024, 2, 1)) + 29))
+
+    assert parse_archive_name('BTCUSDT-7m-2024-01-15.zip') is None
+    assert parse_archive_name('BTCUSDT-1m-2024-01-15.zip.CHECKSUM') is None
+
+
+def test_find_archives_skips_days_covered_by_monthly(archives):
+    directory, _ = archives
+    names = sorted(path.rsplit('/', 1)[-1] for path in find_archives(str(directory)))
+    assert names == ['BTCUSDT-1m-2024-01-15.zip', 'BTCUSDT-1m-2025-03.zip',
+                     'ETHUSDT-1m-2025-01-02.zip', 'SOLUSDT-1m-2024-02.zip']
+    assert len(find_archives(str(directory), symbols=['BTCUSDT'])) == 2
+
+
+@pytest.mark.parametrize('micros', [False, True])
+@pytest.mark.parametrize('header', [False, True])
+def test_read_archive_normalizes_rows(tmp_path, make_klines, header, micros):
+    rows = make_klines(day_ms(2024, 5, 1), 300, seed=5)
+    path = write_archive(tmp_path, 'XRPUSDT-1m-2024-05-01', rows[::-1], header, micros)
+
+    timestamps, values = read_archive(str(path))
+    expected_ts, expected_values = expected_arrays(rows)
+    np.testing.assert_array_equal(timestamps, expected_ts)
+    np.testing.assert_array_equal(values, expected_values)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_ingested_partitions_match_source_rows(archives, tmp_path, workers, capsys):
+    directory, source = archives
+    root = str(tmp_path / 'klines')
+
+    summary = ingest_archives(str(directory), root=root, workers=workers)
+
+    month_days = calendar.monthrange(2025, 3)[1]
+    assert summary['failed'] == []
+    assert summary['files'] == 4
+    assert summary['days_written'] == 1 + 1 + 29 + month_days
+    assert summary['rows'] == sum(len(rows) for rows in source.values())
+    assert summary['symbols'] == {'BTCUSDT 1m': 1 + month_days, 'ETHUSDT 1m': 1, 'SOLUSDT 1m': 29}
+
+    store = KlineStore(root)
+    for (symbol, day), rows in source.items():
+        assert store.has_partition(symbol, '1m', day)
+        timestamps, values = store.read_partition(symbol, '1m', day)
+        expected_ts, expected_values = expected_arrays(rows)
+        np.testing.assert_array_equal(timestamps, expected_ts)
+        np.testing.assert_array_equal(values, expected_values)
+
+    # The hour missing from the monthly archive is recorded as a gap
+    gap_day = day_index(day_ms(2024, 2, 10))
+    status = store.partition_status('SOLUSDT', '1m', gap_day)
+    assert status['actual'] == 1440 - 60
+    assert status['gaps'] == [[day_ms(2024, 2, 10), day_ms(2024, 2, 10) + 3_540_000]]
+
+    # Range reads across days stitch the partitions back together
+    start, end = day_ms(2025, 3, 4) + 600_000, day_ms(2025, 3, 6) + 600_000
+    timestamps, _ = store.read_range('BTCUSDT', '1m', start, end)
+    assert timestamps[0] == start and timestamps[-1] == end - 60_000
+    assert len(timestamps) == (end - start) // 60_000
+
+    # Nothing is rewritten on a second run
+    again = ingest_archives(str(directory), root=root, workers=workers)
+    assert again['days_written'] == 0 and again['rows'] == 0
@@ -0,0 +1,171 @@
+"""
+AsyncKlineFetcher against a local stub of the klines endpoint
+
+The stub serves paged klines from a fixed synthetic series, throttles
+the first request of every page with HTTP 429 + Retry-After and reports
+the used request weight in X-MBX-USED-WEIGHT-1M, like the exchange.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+from aiohttp import web
+
+from data import binance_data
+from data.async_kline_fetcher import AsyncKlineFetcher, fetch_klines_concurrently
+from data.kline_store import DAY_MS
+from data.rate_limiter import RateLimiter
+
+START_MS = 19_723 * DAY_MS  # 2024-01-01 00:00 UTC
+CANDLES = 2 * 1440
+
+
+class StubKlineServer:
+    """Minimal /api/v3/klines with paging, throttling and weight headers"""
+
+    def __init__(self, rows, throttle_first: bool = True, always_throttle: bool = False):
+        self.rows = rows
+        self.throttle_first = throttle_first
+        self.always_throttle = always_throttle
+        self.requests = []
+        self.throttled = 0
+        self.used_weight = 0
+        self._seen = set()
+        self._runner = None
+        self.url = None
+
+    async def klines(self, request: web.Request) -> web.Response:
+        query = request.query
+        start_ms, end_ms = int(query['startTime']), int(query['endTime'])
+        limit = int(query.get('limit', 500))
+        self.requests.append((query['symbol'], query['interval'], start_ms, end_ms, limit))
+        self.used_weight += AsyncKlineFetcher.KLINES_WEIGHT
+        headers = {'X-MBX-USED-WEIGHT-1M': str(self.used_weight)}
+
+        first_attempt = (start_ms, end_ms) not in self._seen
+        self._seen.add((start_ms, end_ms))
+        if self.always_throttle or (self.throttle_first and first_attempt):
+            self.throttled += 1
+            headers['Retry-After'] = '0'
+            return web.json_response({'code': -1003, 'msg': 'Too many requests'},
+                                     status=429, headers=headers)
+
+        page = [row for row in self.rows if start_ms <= row[0] <= end_ms][:limit]
+        return web.json_response(page, headers=headers)
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get(AsyncKlineFetcher.KLINES_PATH, self.klines)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+
+
+class StubClient:
+    """Stand-in for binance.client.Client serving the same rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str):
+        return [row for row in self.rows if start_str <= row[0] <= end_str]
+
+
+def fetch(server_kwargs, requests, limiter=None, **fetcher_kwargs):
+    """Start a stub server, fetch the requests as frames, return (frames, server)"""
+    async def run():
+        async with StubKlineServer(**server_kwargs) as server:
+            async with AsyncKlineFetcher(base_url=server.url, rate_limiter=limiter,
+                                         **fetcher_kwargs) as fetcher:
+                frames = await fetcher.fetch_many(requests)
+        return frames, server
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def rows(make_klines):
+    return make_klines(START_MS, CANDLES)
+
+
+def test_paged_fetch_matches_get_kline_data(rows, tmp_path, monkeypatch):
+    limiter = RateLimiter({AsyncKlineFetcher.ENDPOINT: (6000, 60.0)}, max_retries=3)
+    end_ms = START_MS + CANDLES * 60_000 - 1
+    frames, server = fetch({'rows': rows}, [('BTCUSDT', '1m', START_MS, end_ms)], limiter)
+
+    # 2880 candles -> three pages of at most PAGE_LIMIT, each throttled once and retried
+    pages = sorted(request[2:4] for request in server.requests)
+    assert len(set(pages)) == 3
+    assert server.throttled == 3 and len(server.requests) == 6
+    assert all(request[4] == AsyncKlineFetcher.PAGE_LIMIT for request in server.requests)
+    stats = limiter.stats()[AsyncKlineFetcher.ENDPOINT]
+    assert stats['throttled'] == 3 and stats['retries'] == 3
+    # Bucket follows the server's used weight header
+    bucket = limiter._buckets[AsyncKlineFetcher.ENDPOINT]
+    assert bucket.tokens <= bucket.capacity - server.used_weight + 1
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(binance_data, 'Client', lambda: StubClient(rows))
+    fetcher = binance_data.BinanceDataFetcher(async_fetch=False, rate_limiter=RateLimiter())
+    expected = fetcher.get_kline_data(
+        'BTCUSDT',
+        datetime.fromtimestamp(START_MS / 1000, tz=timezone.utc),
+        datetime.fromtimestamp(end_ms / 1000, tz=timezone.utc)
+    )
+
+    frame = frames[0]
+    assert len(frame) == CANDLES
+    assert frame['timestamp'].is_monotonic_increasing and frame['timestamp'].is_unique
+    pd.testing.assert_frame_equal(frame, expected)
+
+
+def test_partial_ranges_and_many_symbols(rows):
+    requests = [
+        ('BTCUSDT', '1m', START_MS + 90 * 60_000, START_MS + 1500 * 60_000),
+        ('ETHUSDT', '1m', START_MS, START_MS + 59 * 60_000),
+        ('SOLUSDT', '1m', START_MS + CANDLES * 60_000, START_MS + (CANDLES + 10) * 60_000),
+    ]
+    frames, server = fetch({'rows': rows, 'throttle_first': False}, requests, max_concurrency=2)
+
+    assert server.throttled == 0
+    assert len(frames[0]) == 1411
+    assert frames[0]['timestamp'].iloc[0] == pd.Timestamp(START_MS + 90 * 60_000, unit='ms')
+    assert frames[0]['timestamp'].iloc[-1] == pd.Timestamp(START_MS + 1500 * 60_000, unit='ms')
+    assert len(frames[1]) == 60
+    # Past the end of the series: empty frame, like get_kline_data
+    assert frames[2].empty
+
+
+def test_gives_up_after_max_retries(rows, capsys):
+    limiter = RateLimiter({AsyncKlineFetcher.ENDPOINT: (6000, 60.0)}, max_retries=2)
+    frames, server = fetch({'rows': rows, 'always_throttle': True},
+                           [('BTCUSDT', '1m', START_MS, START_MS + 59 * 60_000)], limiter,
+                           max_retries=2)
+
+    assert frames[0].empty
+    assert len(server.requests) == 3
+    assert 'Error fetching BTCUSDT' in capsys.readouterr().out
+
+
+def test_fetch_klines_concurrently_returns_arrays(rows):
+    async def serve_and_fetch():
+        async with StubKlineServer(rows, throttle_first=False) as server:
+            # asyncio.run cannot nest, so call the sync entry point off the loop
+            return await asyncio.to_thread(
+                fetch_klines_concurrently, [('BTCUSDT', '1m', START_MS, START_MS + 9 * 60_000)],
+                as_frames=False, base_url=server.url
+            )
+
+    (timestamps, values), = asyncio.run(serve_and_fetch())
+    assert timestamps.tolist() == [START_MS + i * 60_000 for i in range(10)]
+    assert values.shape == (6, 10)
+    assert values[3].tolist() == [float(row[4]) for row in rows[:10]]
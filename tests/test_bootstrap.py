@@ -0,0 +1,57 @@
+"""
+Bootstrap intervals of the BacktestAnalyzer group statistics
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import BacktestAnalyzer, bootstrap_group_stats, wilson_interval
+
+
+def make_analyzer(count: int, seed: int = 0) -> BacktestAnalyzer:
+    """Analyzer over random outcomes, some with missing excursions"""
+    rng = np.random.default_rng(seed)
+    outcomes = rng.choice(['TARGET1', 'TARGET2', 'STOP_LOSS', 'ONGOING'], size=count)
+    profit = rng.normal(1.5, 1, count)
+    drawdown = rng.normal(-1, 0.5, count)
+    profit[::7] = np.nan
+    drawdown[::5] = np.nan
+    return BacktestAnalyzer(pd.DataFrame({
+        'signal_time': pd.date_range('2024-01-01', periods=count, freq='37min', tz='UTC'),
+        'symbol': rng.choice(['BTC', 'ETH', 'SOL'], size=count),
+        'final_outcome': outcomes, 'max_profit_pct': profit, 'max_drawdown_pct': drawdown
+    }))
+
+
+def test_wilson_interval_known_answer():
+    low, high = wilson_interval(4, 4)
+    assert float(low) == pytest.approx(51.0, abs=0.05)
+    assert float(high) == 100.0
+    # Empty groups say nothing
+    assert [float(bound) for bound in wilson_interval(0, 0)] == [0.0, 100.0]
+
+
+def test_point_estimates_match_overall_stats():
+    analyzer = make_analyzer(500)
+    stats = analyzer.bootstrap_stats(by='symbol', n_resamples=50, seed=1)
+
+    for _, row in stats.iterrows():
+        expected = analyzer.get_overall_stats(analyzer.df[analyzer.df['symbol'] == row['symbol']])
+        for name in ('total', 'wins', 'losses'):
+            assert row[name] == expected[name]
+        for name in ('win_rate', 'avg_profit', 'profit_factor'):
+            assert row[name] == pytest.approx(expected[name], rel=1e-12), name
+
+
+def test_intervals_do_not_depend_on_workers(monkeypatch):
+    df = make_analyzer(300, seed=2).df
+    # Small blocks, so every group is split across several of them
+    monkeypatch.setattr('analytics.bootstrap.MAX_BLOCK_ELEMENTS', 5_000)
+
+    serial = bootstrap_group_stats(df, by='symbol', n_resamples=400, workers=1, seed=3)
+    parallel = bootstrap_group_stats(df, by='symbol', n_resamples=400, workers=2, seed=3)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert (serial['win_rate_low'] <= serial['win_rate']).all()
+    assert (serial['win_rate'] <= serial['win_rate_high']).all()
@@ -0,0 +1,103 @@
+"""
+Batch evaluation against resident compact kline containers
+
+check_signal_outcomes(..., klines=...) evaluates every signal through
+evaluate_klines on containers from load_compact_klines; the outcomes
+must match the regular path that loads the cached windows itself.
+"""
+
+import pandas as pd
+import pytest
+
+from data import binance_data
+from data.compact_klines import CompactKlines
+from data.kline_store import DAY_MS
+
+START_MS = 19_723 * DAY_MS  # 2024-01-01 00:00 UTC
+CANDLES = 6 * 1440
+SYMBOLS = ('BTC', 'ETH')
+
+
+class StubClient:
+    """Stand-in for binance.client.Client with one synthetic series per pair"""
+
+    def __init__(self, series):
+        self.series = series
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str):
+        return [row for row in self.series.get(symbol, []) if start_str <= row[0] <= end_str]
+
+
+def make_signals(series, count: int):
+    """LONG/SHORT signals at evenly spread candles, levels around the open price"""
+    signals = []
+    for k in range(count):
+        symbol = SYMBOLS[k % len(SYMBOLS)]
+        row = series[f"{symbol}USDT"][(k * 97) % (CANDLES - 1440)]
+        entry = float(row[1])
+        side = 1 if k % 2 == 0 else -1
+        signals.append({
+            'message_id': k,
+            'symbol': symbol,
+            'action': 'LONG' if side == 1 else 'SHORT',
+            'entry_price': entry,
+            'stop_loss': entry * (1 - side * 0.004 * (1 + k % 3)),
+            'target1': entry * (1 + side * 0.003),
+            'target2': entry * (1 + side * 0.008),
+            'target3': None if k % 5 == 0 else entry * (1 + side * 0.015),
+            'timestamp': str(pd.Timestamp(row[0] + (k * 7_919) % 60_000, unit='ms'))
+        })
+    # A pair nobody trades and a signal past the end of the data
+    signals.append(dict(signals[0], message_id=count, symbol='DOGE'))
+    signals.append(dict(signals[1], message_id=count + 1,
+                        timestamp=str(pd.Timestamp(START_MS + (CANDLES + 60) * 60_000, unit='ms'))))
+    return signals
+
+
+@pytest.fixture
+def fetcher(make_klines, tmp_path, monkeypatch):
+    series = {f"{symbol}USDT": make_klines(START_MS, CANDLES, seed=seed)
+              for seed, symbol in enumerate(SYMBOLS)}
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(binance_data, 'Client', lambda: StubClient(series))
+    return binance_data.BinanceDataFetcher(async_fetch=False), series
+
+
+@pytest.mark.parametrize('hours', [6, 24])
+def test_resident_containers_match_cached_path(fetcher, hours):
+    fetcher, series = fetcher
+    signals = make_signals(series, 120)
+
+    klines = fetcher.load_compact_klines(signals, lookforward_hours=hours, float32=False)
+    assert sorted(klines) == ['BTCUSDT', 'ETHUSDT']
+    assert all(isinstance(compact, CompactKlines) for compact in klines.values())
+
+    expected = fetcher.check_signal_outcomes(signals, lookforward_hours=hours)
+    outcomes = fetcher.check_signal_outcomes(signals, lookforward_hours=hours, klines=klines)
+    assert outcomes == expected
+    assert outcomes[-2]['status'] == 'NO_DATA'
+
+
+def test_resident_containers_resume_previous_outcomes(fetcher):
+    fetcher, series = fetcher
+    signals = make_signals(series, 60)
+    klines = fetcher.load_compact_klines(signals, lookforward_hours=24, float32=False)
+
+    short = fetcher.check_signal_outcomes(signals, lookforward_hours=2, klines=klines)
+    resumed = fetcher.check_signal_outcomes(signals, lookforward_hours=24,
+                                            previous=short, klines=klines)
+    assert resumed == fetcher.check_signal_outcomes(signals, lookforward_hours=24, klines=klines)
+
+
+def test_float32_containers_agree_on_outcomes(fetcher):
+    fetcher, series = fetcher
+    signals = make_signals(series, 120)
+    exact = fetcher.check_signal_outcomes(
+        signals, klines=fetcher.load_compact_klines(signals, 24, float32=False), lookforward_hours=24
+    )
+    compact = fetcher.check_signal_outcomes(
+        signals, klines=fetcher.load_compact_klines(signals, 24), lookforward_hours=24
+    )
+
+    same = sum(a.get('final_outcome') == b.get('final_outcome') for a, b in zip(exact, compact))
+    assert same >= len(signals) - 2
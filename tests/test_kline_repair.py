@@ -0,0 +1,114 @@
+"""
+Repair of incomplete cached days and strict mode
+
+Cached partitions with gaps are refetched span by span; with --strict a
+day that cannot be repaired stops the run instead of being evaluated on
+incomplete data.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import full_backtest
+from data import binance_data
+from data.binance_data import KlineFetchError
+from data.kline_store import DAY_MS, klines_to_arrays
+
+DAY = 19_723  # 2024-01-01
+START_MS = DAY * DAY_MS
+
+
+class StubClient:
+    """Stand-in for binance.client.Client that records every request"""
+
+    rows = []
+    fail = False
+    requests = []
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str):
+        StubClient.requests.append((symbol, start_str, end_str))
+        if StubClient.fail:
+            raise ConnectionError("exchange unavailable")
+        return [row for row in self.rows if start_str <= row[0] <= end_str]
+
+
+@pytest.fixture
+def cached_with_gaps(make_klines, tmp_path, monkeypatch):
+    """One cached day of BTCUSDT with two missing spans, the exchange has all but one candle"""
+    rows = make_klines(START_MS, 1440)
+    StubClient.rows = rows[:1300] + rows[1301:]
+    StubClient.fail = False
+    StubClient.requests = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(binance_data, 'Client', StubClient)
+
+    def make_fetcher(strict: bool = False):
+        fetcher = binance_data.BinanceDataFetcher(async_fetch=False, strict=strict)
+        kept = rows[:100] + rows[110:1290] + rows[1310:]
+        fetcher.kline_store.write_partition('BTCUSDT', '1m', DAY, *klines_to_arrays(kept))
+        return fetcher
+
+    return make_fetcher, rows
+
+
+def test_repair_refetches_only_missing_spans(cached_with_gaps):
+    make_fetcher, rows = cached_with_gaps
+    fetcher = make_fetcher()
+
+    summary = fetcher.repair_klines('BTCUSDT')
+
+    # Gaps more than a page apart are separate requests for exactly their candles
+    assert StubClient.requests == [('BTCUSDT', rows[100][0], rows[109][0]),
+                                   ('BTCUSDT', rows[1290][0], rows[1309][0])]
+    assert summary == {'days_repaired': 1, 'requests': 2, 'candles_filled': 29, 'failed': []}
+
+    store = fetcher.kline_store
+    status = store.partition_status('BTCUSDT', '1m', DAY)
+    # The candle the exchange does not have stays a verified gap
+    assert status['verified'] and status['gaps'] == [[rows[1300][0], rows[1300][0]]]
+    timestamps, values = store.read_partition('BTCUSDT', '1m', DAY)
+    expected_ts, expected_values = klines_to_arrays(StubClient.rows)
+    np.testing.assert_array_equal(timestamps, expected_ts)
+    np.testing.assert_array_equal(values, expected_values)
+
+    # Verified days are not fetched again
+    assert fetcher.repair_klines('BTCUSDT')['requests'] == 0
+    assert len(StubClient.requests) == 2
+
+
+def test_failed_repair_keeps_data_unless_strict(cached_with_gaps):
+    make_fetcher, _ = cached_with_gaps
+    StubClient.fail = True
+    start = pd.Timestamp(START_MS, unit='ms', tz='UTC')
+    end = start + pd.Timedelta(hours=23, minutes=59)
+
+    frame = make_fetcher().get_kline_data('BTCUSDT', start, end)
+    assert len(frame) == 1440 - 30
+
+    with pytest.raises(KlineFetchError, match='still have gaps'):
+        make_fetcher(strict=True).get_kline_data('BTCUSDT', start, end)
+
+
+def test_strict_run_refuses_incomplete_data(cached_with_gaps, monkeypatch, capsys):
+    make_fetcher, rows = cached_with_gaps
+    make_fetcher()
+    StubClient.fail = True
+
+    entry = float(rows[60][4])
+    pd.DataFrame([{
+        'message_id': 1, 'symbol': 'BTC', 'action': 'LONG', 'timeframe': '1h',
+        'entry_price': entry, 'stop_loss': entry * 0.99, 'target1': entry * 1.01,
+        'target2': None, 'target3': None,
+        'timestamp': str(pd.Timestamp(rows[60][0], unit='ms'))
+    }]).to_csv('signals.csv', index=False)
+
+    monkeypatch.setattr(sys, 'argv', ['full_backtest.py', 'signals.csv', '--strict'])
+    monkeypatch.setattr('builtins.input', lambda prompt='': 'y')
+    with pytest.raises(SystemExit) as exit_info:
+        full_backtest.main()
+
+    assert exit_info.value.code == 1
+    assert 'Refusing to report results on incomplete kline data' in capsys.readouterr().out
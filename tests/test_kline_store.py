@@ -0,0 +1,75 @@
+"""
+Kline store partitions, consolidated series and their manifest
+"""
+
+import os
+
+import numpy as np
+
+from data.kline_store import DAY_MS, KlineStore, audit_timestamps, klines_to_arrays, partition_complete
+
+START_MS = 19_723 * DAY_MS  # 2024-01-01 00:00 UTC
+
+
+def test_consolidate_tolerates_a_concurrent_builder(tmp_path, make_klines, monkeypatch):
+    store = KlineStore(str(tmp_path / 'klines'))
+    timestamps, values = klines_to_arrays(make_klines(START_MS, 2 * 1440))
+    store.write_days('BTCUSDT', '1m', timestamps, values, [19_723, 19_724])
+
+    # Another process renames the same series file into place first, and
+    # ours then fails like a replace of a file mapped on Windows
+    replace = os.replace
+
+    def racing_replace(src, dst):
+        replace(src, dst)
+        if '/series/' in dst:
+            raise PermissionError(dst)
+
+    monkeypatch.setattr(os, 'replace', racing_replace)
+    base = store.consolidate('BTCUSDT', '1m')
+    monkeypatch.undo()
+
+    assert base is not None
+    series_dir = os.path.dirname(base)
+    assert not [name for name in os.listdir(series_dir) if name.endswith('.tmp')]
+    handle = store.open_mapped('BTCUSDT', '1m', refresh=False)
+    np.testing.assert_array_equal(handle.timestamps, timestamps)
+    np.testing.assert_array_equal(handle.values, values)
+
+
+def test_audit_reports_gaps_and_duplicates():
+    day = 19_723
+    grid = START_MS + np.arange(1440, dtype=np.int64) * 60_000
+    missing = np.r_[0:3, 500:510, 1439]
+    timestamps = np.concatenate([np.delete(grid, missing), grid[[20, 20, 700]]])
+
+    report = audit_timestamps(np.sort(timestamps), '1m', day)
+    assert report['expected'] == 1440
+    assert report['actual'] == 1440 - len(missing)
+    assert report['duplicates'] == 3
+    assert report['gaps'] == [[int(grid[0]), int(grid[2])], [int(grid[500]), int(grid[509])],
+                              [int(grid[1439]), int(grid[1439])]]
+
+    complete = audit_timestamps(grid, '1m', day)
+    assert complete['gaps'] == [] and complete['duplicates'] == 0
+    # Intervals that do not divide a day have no expected grid
+    assert audit_timestamps(grid, '7m', day)['expected'] is None
+
+
+def test_partition_manifest_tracks_gaps(tmp_path, make_klines):
+    store = KlineStore(str(tmp_path / 'klines'))
+    rows = make_klines(START_MS, 1440)
+    timestamps, values = klines_to_arrays(rows[:100] + rows[160:])
+    store.write_partition('BTCUSDT', '1m', 19_723, timestamps, values)
+
+    status = store.partition_status('BTCUSDT', '1m', 19_723)
+    assert status['gaps'] == [[rows[100][0], rows[159][0]]] and not status['verified']
+    assert not partition_complete(status)
+    assert store.incomplete_days('BTCUSDT', '1m', [19_723]) == [19_723]
+    # No temporary files are left next to the partition
+    directory = os.path.join(store.root, 'BTCUSDT', '1m')
+    assert sorted(os.listdir(directory)) == ['20240101.meta.json', '20240101.ohlcv.npy',
+                                             '20240101.ts.npy']
+
+    # A fresh store reads the same entry back from the manifest file
+    assert KlineStore(store.root).partition_status('BTCUSDT', '1m', 19_723) == status
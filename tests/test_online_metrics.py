@@ -0,0 +1,88 @@
+"""
+OnlineMetrics agrees with the batch metrics of a full backtest run
+"""
+
+import numpy as np
+import pytest
+
+from data.online_metrics import OnlineMetrics, QuantileSketch, RunningMoments
+from data.result_metrics import comprehensive_metrics
+
+OUTCOMES = ('TARGET1', 'TARGET2', 'TARGET3', 'STOP_LOSS', 'ONGOING', 'NO_DATA')
+
+
+def make_results(count: int, seed: int = 0):
+    """Outcome dictionaries with NO_DATA rows, NaN excursions and hits without a time"""
+    rng = np.random.default_rng(seed)
+    results = []
+    for k in range(count):
+        final_outcome = OUTCOMES[rng.integers(len(OUTCOMES))]
+        result = {'signal_id': k, 'symbol': ('BTC', 'ETH', 'SOL')[k % 3],
+                  'action': 'LONG', 'timeframe': '1h', 'final_outcome': final_outcome}
+        if final_outcome == 'NO_DATA':
+            results.append(result)
+            continue
+        result['max_profit_pct'] = float(rng.normal(1, 2)) if k % 13 else float('nan')
+        result['max_drawdown_pct'] = float(rng.normal(-1, 2)) if k % 17 else None
+        for level, reached in (('target1', final_outcome.startswith('TARGET')),
+                               ('target2', final_outcome in ('TARGET2', 'TARGET3')),
+                               ('target3', final_outcome == 'TARGET3'),
+                               ('stop_loss', final_outcome == 'STOP_LOSS')):
+            result[f'hit_{level}'] = reached
+            result[f'{level}_minutes'] = float(rng.uniform(1, 4000)) if reached and k % 11 else None
+        results.append(result)
+    return results
+
+
+def assert_matches_batch(summary, batch):
+    shared = set(summary).intersection(batch) - {'symbol_performance'}
+    assert shared >= {'avg_max_profit_pct', 'avg_max_drawdown_pct', 'best_profit_pct',
+                      'worst_drawdown_pct', 'total_wins', 'total_losses', 'overall_winrate_pct'}
+    for key in shared:
+        assert summary[key] == pytest.approx(batch[key], rel=1e-12), key
+
+    assert set(summary['symbol_performance']) == set(batch['symbol_performance'])
+    for symbol, stats in summary['symbol_performance'].items():
+        expected = batch['symbol_performance'][symbol]
+        assert stats == pytest.approx({key: expected[key] for key in stats}, rel=1e-12)
+
+
+def test_summary_matches_comprehensive_metrics():
+    results = make_results(2000)
+    summary = OnlineMetrics.from_results(results).summary()
+    batch = comprehensive_metrics(results)
+
+    assert_matches_batch(summary, batch)
+    # Same sign convention as the batch report
+    assert summary['avg_max_drawdown_pct'] > 0 and summary['worst_drawdown_pct'] > 0
+
+
+def test_merged_partial_states_match_comprehensive_metrics():
+    results = make_results(1500, seed=1)
+    merged = OnlineMetrics.from_results(results[:400]).merge(OnlineMetrics.from_results(results[400:]))
+
+    assert_matches_batch(merged.summary(), comprehensive_metrics(results))
+    single = OnlineMetrics.from_results(results).summary()
+    for column, moments in merged.summary()['excursions'].items():
+        assert moments == pytest.approx(single['excursions'][column], rel=1e-9)
+
+
+def test_running_moments_and_sketch_merge():
+    values = np.random.default_rng(2).lognormal(3, 1, 5000)
+    left, right = RunningMoments(), RunningMoments()
+    sketch, other = QuantileSketch(0.01), QuantileSketch(0.01)
+    for value in values[:1234]:
+        left.update(value)
+        sketch.update(value)
+    for value in values[1234:]:
+        right.update(value)
+        other.update(value)
+    left.merge(right)
+    sketch.merge(other)
+
+    assert left.count == len(values)
+    assert left.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert left.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert (left.min, left.max) == (values.min(), values.max())
+    for q in (0.1, 0.5, 0.9):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
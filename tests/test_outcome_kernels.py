@@ -0,0 +1,175 @@
+"""
+Equivalence of the outcome kernels
+
+The vectorized first-hit kernel (evaluate_signal) is checked against a
+candle-by-candle loop with the semantics of the original
+check_signal_outcome; the range-index, multi-horizon, coarse-to-fine
+and resumed evaluations are checked against evaluate_signal itself.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.outcome_engine import (
+    TARGET_LEVELS, evaluate_signal, evaluate_signal_coarse, evaluate_signal_horizons, parse_signal
+)
+from data.range_index import RangeExtremeIndex
+
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+MINUTE_MS = 60_000
+HOUR_MS = 3_600_000
+CANDLES = 10 * 1440
+
+
+@pytest.fixture(scope='module')
+def series():
+    """Ten days of 1m candles with bursts of volatility"""
+    rng = np.random.default_rng(11)
+    scale = np.where(rng.random(CANDLES) < 0.05, 0.008, 0.0015)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, scale)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    highs = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.001, CANDLES)))
+    lows = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.001, CANDLES)))
+    timestamps = START_MS + np.arange(CANDLES, dtype=np.int64) * MINUTE_MS
+    return timestamps, highs, lows
+
+
+def make_signals(series, count: int, seed: int):
+    """Random LONG/SHORT signals, some without a stop loss or upper targets"""
+    timestamps, highs, _ = series
+    rng = np.random.default_rng(seed)
+    signals = []
+    for k in range(count):
+        position = int(rng.integers(0, CANDLES - 3 * 1440))
+        action = 'LONG' if rng.random() < 0.5 else 'SHORT'
+        side = 1 if action == 'LONG' else -1
+        entry = float(highs[position])
+        steps = np.sort(rng.uniform(0.002, 0.06, 3))
+        signal = {
+            'message_id': k,
+            'symbol': 'BTC',
+            'action': action,
+            'entry_price': entry,
+            'stop_loss': entry * (1 - side * rng.uniform(0.003, 0.04)),
+            'target1': entry * (1 + side * steps[0]),
+            'target2': entry * (1 + side * steps[1]),
+            'target3': entry * (1 + side * steps[2]),
+            'timestamp': str(pd.Timestamp(int(timestamps[position]) + int(rng.integers(0, MINUTE_MS)),
+                                          unit='ms'))
+        }
+        if k % 7 == 0:
+            signal['stop_loss'] = None
+        if k % 11 == 0:
+            signal['target2'] = signal['target3'] = None
+        signals.append(parse_signal(signal))
+    return signals
+
+
+def end_of_window(levels, hours: float) -> int:
+    return (levels['signal_time'] + pd.Timedelta(hours=hours)).value // 1_000_000
+
+
+def reference_outcome(levels, timestamps, highs, lows, end_ms):
+    """Candle loop of the original check_signal_outcome (stop loss first, exit on any level)"""
+    signal_time = levels['signal_time']
+    entry, stop_loss, action = levels['entry_price'], levels['stop_loss'], levels['action']
+    outcome = {'final_outcome': 'ONGOING', 'status': 'ACTIVE',
+               'max_profit_pct': 0, 'max_drawdown_pct': 0}
+    for name in TARGET_LEVELS + ('stop_loss',):
+        outcome[f'hit_{name}'] = False
+        outcome[f'{name}_minutes'] = None
+
+    start_ms = -(-signal_time.value // 1_000_000)
+    for timestamp, high, low in zip(timestamps, highs, lows):
+        if timestamp < start_ms or timestamp > end_ms:
+            continue
+        minutes = (pd.Timestamp(int(timestamp), unit='ms', tz='UTC') - signal_time).total_seconds() / 60
+
+        if action == 'LONG':
+            profit, drawdown = (high - entry) / entry * 100, (low - entry) / entry * 100
+            stop_hit = stop_loss and low <= stop_loss
+            target_hit = [bool(levels[name]) and high >= levels[name] for name in TARGET_LEVELS]
+        else:
+            profit, drawdown = (entry - low) / entry * 100, (entry - high) / entry * 100
+            stop_hit = stop_loss and high >= stop_loss
+            target_hit = [bool(levels[name]) and low <= levels[name] for name in TARGET_LEVELS]
+        outcome['max_profit_pct'] = max(outcome['max_profit_pct'], profit)
+        outcome['max_drawdown_pct'] = min(outcome['max_drawdown_pct'], drawdown)
+
+        if stop_hit:
+            outcome.update(hit_stop_loss=True, stop_loss_minutes=minutes,
+                           final_outcome='STOP_LOSS', status='CLOSED')
+            break
+        for name, hit in zip(TARGET_LEVELS, target_hit):
+            if hit:
+                outcome.update({f'hit_{name}': True, f'{name}_minutes': minutes,
+                                'final_outcome': name.upper(), 'status': 'CLOSED'})
+        if outcome['status'] == 'CLOSED':
+            break
+    return outcome
+
+
+@pytest.mark.parametrize('hours', [4, 24, 72])
+def test_vectorized_kernel_matches_candle_loop(series, hours):
+    timestamps, highs, lows = series
+    for levels in make_signals(series, 300, seed=hours):
+        end_ms = end_of_window(levels, hours)
+        outcome = evaluate_signal(levels, timestamps, highs, lows, end_ms)
+        expected = reference_outcome(levels, timestamps, highs, lows, end_ms)
+        assert {key: outcome[key] for key in expected} == pytest.approx(expected, rel=1e-12)
+
+
+def test_indexed_kernel_matches_scan(series):
+    timestamps, highs, lows = series
+    index = RangeExtremeIndex(highs, lows)
+    for levels in make_signals(series, 400, seed=1):
+        end_ms = end_of_window(levels, 72)
+        assert (evaluate_signal(levels, timestamps, highs, lows, end_ms, index=index)
+                == evaluate_signal(levels, timestamps, highs, lows, end_ms))
+
+
+def test_horizon_kernel_matches_one_evaluation_per_horizon(series):
+    timestamps, highs, lows = series
+    horizons = [1, 6, 24, 72]
+    index = RangeExtremeIndex(highs, lows)
+    for levels in make_signals(series, 150, seed=2):
+        expected = {h: evaluate_signal(levels, timestamps, highs, lows, end_of_window(levels, h))
+                    for h in horizons}
+        assert evaluate_signal_horizons(levels, timestamps, highs, lows, horizons) == expected
+        assert evaluate_signal_horizons(levels, timestamps, highs, lows, horizons, index=index) == expected
+
+
+@pytest.mark.parametrize('bar_hours', [1, 4])
+def test_coarse_kernel_matches_fine_scan(series, bar_hours):
+    timestamps, highs, lows = series
+    bar_ms = bar_hours * HOUR_MS
+    per_bar = bar_ms // MINUTE_MS
+    coarse_ms = timestamps[::per_bar]
+    coarse_highs = highs.reshape(-1, per_bar).max(axis=1)
+    coarse_lows = lows.reshape(-1, per_bar).min(axis=1)
+    loaded = []
+
+    def load_fine(start_ms, end_ms):
+        lo = np.searchsorted(timestamps, start_ms, side='left')
+        hi = np.searchsorted(timestamps, end_ms, side='right')
+        loaded.append(hi - lo)
+        return timestamps[lo:hi], highs[lo:hi], lows[lo:hi]
+
+    for levels in make_signals(series, 300, seed=3 + bar_hours):
+        end_ms = end_of_window(levels, 72)
+        outcome = evaluate_signal_coarse(levels, coarse_ms, coarse_highs, coarse_lows,
+                                         bar_ms, load_fine, end_ms)
+        assert outcome == evaluate_signal(levels, timestamps, highs, lows, end_ms)
+
+    # Only bars that reach a level (and the window edges) are loaded at 1m
+    assert sum(loaded) < 300 * 72 * 60 / 2
+
+
+def test_resumed_evaluation_matches_full_window(series):
+    timestamps, highs, lows = series
+    for levels in make_signals(series, 300, seed=5):
+        short_end, end_ms = end_of_window(levels, 6), end_of_window(levels, 72)
+        previous = evaluate_signal(levels, timestamps, highs, lows, short_end)
+        full = evaluate_signal(levels, timestamps, highs, lows, end_ms)
+        assert evaluate_signal(levels, timestamps, highs, lows, end_ms, previous=previous) == full
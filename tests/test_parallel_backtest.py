@@ -0,0 +1,86 @@
+"""
+Parallel evaluation in full_backtest gives the same rows as a serial run
+
+More signals than SHARD_WINDOW put every pair into shards of several
+windows, so worker processes evaluate the same pair at the same time.
+"""
+
+import pandas as pd
+import pytest
+
+import full_backtest
+from data import binance_data
+from data.kline_store import DAY_MS
+from data.result_sinks import results_frame
+
+START_MS = 19_723 * DAY_MS  # 2024-01-01 00:00 UTC
+DAYS = 8
+SYMBOLS = ('BTC', 'ETH', 'SOL')
+SIGNALS = full_backtest.SHARD_WINDOW + 1500
+
+
+class StubClient:
+    """Stand-in for binance.client.Client with one synthetic series per pair"""
+
+    series = {}
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str):
+        return [row for row in self.series.get(symbol, []) if start_str <= row[0] <= end_str]
+
+
+def signals_frame(series) -> pd.DataFrame:
+    """LONG/SHORT signals spread over the first days of every pair, in time order"""
+    rows = []
+    for k in range(SIGNALS):
+        symbol = SYMBOLS[k % len(SYMBOLS)]
+        candle = series[f"{symbol}USDT"][(k * 3) % ((DAYS - 2) * 1440)]
+        entry = float(candle[4])
+        side = 1 if k % 2 == 0 else -1
+        rows.append({
+            'message_id': k,
+            'symbol': symbol,
+            'action': 'LONG' if side == 1 else 'SHORT',
+            'timeframe': '1h',
+            'entry_price': entry,
+            'stop_loss': entry * (1 - side * 0.005),
+            'target1': entry * (1 + side * 0.004),
+            'target2': entry * (1 + side * 0.01),
+            'target3': entry * (1 + side * 0.02),
+            'timestamp': str(pd.Timestamp(candle[0] + 30_000, unit='ms'))
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def backtester(make_klines, tmp_path, monkeypatch):
+    StubClient.series = {f"{symbol}USDT": make_klines(START_MS, DAYS * 1440, seed=seed)
+                         for seed, symbol in enumerate(SYMBOLS)}
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(binance_data, 'Client', StubClient)
+
+    # Fill the day partitions only; the mapped series are built by the run
+    fetcher = binance_data.BinanceDataFetcher(async_fetch=False)
+    for pair in StubClient.series:
+        fetcher.get_kline_data(pair, pd.Timestamp(START_MS, unit='ms', tz='UTC'),
+                               pd.Timestamp(START_MS + DAYS * DAY_MS - 1, unit='ms', tz='UTC'))
+
+    def run(workers: int) -> pd.DataFrame:
+        tester = full_backtest.MetaSignalsBacktester()
+        tester.binance.async_fetch = False
+        tester.signals_df = signals_frame(StubClient.series)
+        results = tester.run_full_backtest(lookforward_hours=24, batch_size=1000, workers=workers,
+                                           journal_path=str(tmp_path / f"journal_{workers}.jsonl"))
+        return results_frame(results)
+
+    return run
+
+
+def test_workers_match_serial_run(backtester, capsys):
+    # Parallel first, while no mapped series exists yet
+    parallel = backtester(2)
+    assert '❌' not in capsys.readouterr().out
+
+    serial = backtester(1)
+    assert len(serial) == SIGNALS
+    assert (serial['final_outcome'] != 'NO_DATA').all()
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,82 @@
+"""
+PortfolioSimulator replaying signal outcomes as one account
+"""
+
+import pandas as pd
+import pytest
+
+from src.backtesting.portfolio import PortfolioSimulator
+
+T0 = pd.Timestamp('2024-01-01 00:00', tz='UTC')
+
+
+def outcome(signal_id, minutes_in: int, minutes_out: int, final_outcome: str = 'TARGET1',
+            action: str = 'LONG', entry: float = 100.0):
+    """Outcome dictionary entering minutes_in and closing minutes_out after T0"""
+    side = 1 if action == 'LONG' else -1
+    result = {
+        'signal_id': signal_id, 'symbol': 'BTC', 'action': action,
+        'entry_price': entry, 'stop_loss': entry * (1 - side * 0.05),
+        'target1': entry * (1 + side * 0.05), 'target2': None, 'target3': None,
+        'final_outcome': final_outcome,
+        'signal_time': T0 + pd.Timedelta(minutes=minutes_in),
+        'last_candle_time': T0 + pd.Timedelta(minutes=minutes_out),
+        'target1_time': None, 'stop_loss_time': None
+    }
+    if final_outcome == 'TARGET1':
+        result['target1_time'] = result['last_candle_time']
+    elif final_outcome == 'STOP_LOSS':
+        result['stop_loss_time'] = result['last_candle_time']
+    return result
+
+
+def simulator(**kwargs):
+    settings = dict(initial_capital=10_000, commission=0.0, slippage=0.0,
+                    risk_per_trade=1.0, max_positions=5)
+    settings.update(kwargs)
+    return PortfolioSimulator(**settings)
+
+
+def test_position_limit_skips_signals_while_slots_are_full():
+    outcomes = [outcome(1, 0, 60), outcome(2, 10, 60), outcome(3, 20, 30), outcome(4, 70, 80)]
+    result = simulator(max_positions=2).run(outcomes)
+
+    assert result['trades']['signal_id'].tolist() == [1, 2, 4]
+    assert result['summary']['skipped_signals']['max_positions'] == 1
+    assert result['equity_curve']['open_positions'].max() == 2
+
+
+def test_capital_limits_size_and_rejects_entries_without_cash():
+    # Half of every notional goes to fees, so the fourth entry is capped by
+    # the cash left and the fifth finds none, although a slot is free
+    outcomes = [outcome(k, k, 100) for k in range(1, 6)]
+    result = simulator(commission=0.5, max_positions=5).run(outcomes)
+
+    trades = result['trades']
+    assert trades['signal_id'].tolist() == [1, 2, 3, 4]
+    assert result['summary']['skipped_signals']['insufficient_capital'] == 1
+    assert result['summary']['skipped_signals']['max_positions'] == 0
+    # Never more invested than the account holds
+    assert (result['equity_curve']['cash'] >= -1e-9).all()
+    assert trades['size'].iloc[3] * 100 * 1.5 == pytest.approx(10_000 - 1.5 * (2_000 + 1_800 + 1_620))
+
+
+def test_exit_at_the_same_time_frees_the_slot_first():
+    outcomes = [outcome(1, 0, 30, 'STOP_LOSS'), outcome(2, 30, 90)]
+    result = simulator(max_positions=1).run(outcomes)
+
+    trades = result['trades']
+    assert trades['signal_id'].tolist() == [1, 2]
+    assert trades['exit_time'].iloc[0] == trades['entry_time'].iloc[1]
+    assert result['summary']['skipped_signals']['max_positions'] == 0
+
+
+def test_ongoing_trades_close_at_last_candle_at_entry_price():
+    outcomes = [outcome(1, 0, 720, 'ONGOING', action='SHORT'), outcome(2, 5, 50, 'NO_DATA')]
+    result = simulator(commission=0.001).run(outcomes)
+
+    trade = result['trades'].iloc[0]
+    assert trade['exit_time'] == T0 + pd.Timedelta(minutes=720)
+    assert trade['exit_price'] == trade['entry_price'] == 100.0
+    assert trade['pnl'] == pytest.approx(-2 * trade['size'] * 100 * 0.001)
+    assert result['summary']['skipped_signals']['no_data'] == 1
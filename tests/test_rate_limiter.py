@@ -0,0 +1,77 @@
+"""
+RateLimiter bucket scoping and throttle handling
+"""
+
+import pytest
+
+from data import rate_limiter as rate_limiter_module
+from data.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the waits acquire would sleep for instead of sleeping"""
+    waits = []
+    monkeypatch.setattr(rate_limiter_module.time, 'sleep', waits.append)
+    return waits
+
+
+def test_request_is_charged_against_every_prefix_bucket(sleeps):
+    limiter = RateLimiter({'discord': (4, 400.0), 'discord:messages': (100, 1.0)})
+
+    for _ in range(2):
+        limiter.acquire('discord:guilds')
+    for _ in range(2):
+        limiter.acquire('discord:messages')
+    assert sleeps == []
+
+    # Global budget of 4 is used up although no route bucket is empty
+    limiter.acquire('discord:messages')
+    assert len(sleeps) == 1 and sleeps[0] == pytest.approx(100.0, rel=0.01)
+
+    stats = limiter.stats()
+    assert stats['discord']['requests'] == 5 and stats['discord']['waits'] == 1
+    assert stats['discord:guilds']['requests'] == 2
+    assert stats['discord:messages']['requests'] == 3 and stats['discord:messages']['waits'] == 0
+
+
+def test_route_limit_still_applies_below_the_global_one(sleeps):
+    limiter = RateLimiter({'discord': (50, 1.0), 'discord:messages': (2, 20.0)})
+
+    for _ in range(3):
+        limiter.acquire('discord:messages')
+    assert len(sleeps) == 1 and sleeps[0] == pytest.approx(10.0, rel=0.01)
+    # Other routes only wait for the global bucket
+    limiter.acquire('discord:channels')
+    assert len(sleeps) == 1
+
+
+def test_exact_key_without_prefix_uses_one_bucket(sleeps):
+    limiter = RateLimiter({'binance:klines': (10, 60.0)})
+    limiter.acquire('binance:klines', weight=10)
+    assert sleeps == [] and list(limiter.stats()) == ['binance:klines']
+    # Unconfigured endpoints fall back to the default limit
+    limiter.acquire('telegram:history')
+    assert limiter._buckets['telegram:history'].capacity == 10
+
+
+def test_global_throttle_blocks_prefix_buckets(sleeps):
+    limiter = RateLimiter({'discord': (50, 1.0)}, jitter=0)
+
+    delay = limiter.record_response('discord:guilds', 429, {'Retry-After': '3'})
+    assert delay == 3
+    limiter.acquire('discord:channels')
+    assert sleeps == []
+
+    limiter.record_response('discord:guilds', 429, {'Retry-After': '3', 'X-RateLimit-Global': 'true'})
+    limiter.acquire('discord:channels')
+    assert len(sleeps) == 1 and sleeps[0] == pytest.approx(3.0, rel=0.01)
+    assert limiter.stats()['discord:guilds']['throttled'] == 2
+
+
+def test_retries_stop_after_max_retries():
+    limiter = RateLimiter({'binance:klines': (6000, 60.0)}, max_retries=2, jitter=0)
+    assert limiter.record_response('binance:klines', 429, {'Retry-After': '0'}, attempt=1) == 0
+    assert limiter.record_response('binance:klines', 429, {'Retry-After': '0'}, attempt=2) is None
+    assert limiter.record_response('binance:klines', 200, {}) is None
+    assert limiter.stats()['binance:klines']['retries'] == 1
@@ -0,0 +1,252 @@
+"""
+Columnar result metrics against the loop-based metrics they replaced
+
+baseline_comprehensive and baseline_signal are the list-comprehension
+implementations of MetaSignalsBacktester.calculate_comprehensive_metrics
+and SignalBacktester.calculate_metrics before data.result_metrics.
+"""
+
+import numpy as np
+import pytest
+
+from data.result_metrics import comprehensive_metrics, signal_metrics
+
+OUTCOMES = ('TARGET1', 'TARGET2', 'TARGET3', 'STOP_LOSS', 'ONGOING', 'NO_DATA')
+
+
+def baseline_categories(results, category, skip_no_data, winrate_key):
+    stats = {}
+    for r in results:
+        if skip_no_data and r['final_outcome'] == 'NO_DATA':
+            continue
+        value = r.get(category, 'Unknown')
+        if value not in stats:
+            stats[value] = {'total': 0, 'wins': 0, 'losses': 0}
+        stats[value]['total'] += 1
+        if r['final_outcome'].startswith('TARGET'):
+            stats[value]['wins'] += 1
+        elif r['final_outcome'] == 'STOP_LOSS':
+            stats[value]['losses'] += 1
+    for value, group in stats.items():
+        group[winrate_key] = (group['wins'] / group['total']) * 100
+    return stats
+
+
+def baseline_comprehensive(results):
+    valid_results = [r for r in results if r['final_outcome'] != 'NO_DATA']
+    total_signals = len(results)
+    total_valid = len(valid_results)
+
+    target1_hits = sum(1 for r in valid_results if r['hit_target1'])
+    target2_hits = sum(1 for r in valid_results if r['hit_target2'])
+    target3_hits = sum(1 for r in valid_results if r['hit_target3'])
+    stop_loss_hits = sum(1 for r in valid_results if r['hit_stop_loss'])
+    any_target_wins = sum(1 for r in valid_results if r['final_outcome'].startswith('TARGET'))
+
+    target_times, sl_times, level_times = [], [], {1: [], 2: [], 3: []}
+    for r in valid_results:
+        for level in (1, 2, 3):
+            if r.get(f'target{level}_minutes'):
+                target_times.append(r[f'target{level}_minutes'])
+                level_times[level].append(r[f'target{level}_minutes'])
+        if r.get('stop_loss_minutes'):
+            sl_times.append(r['stop_loss_minutes'])
+
+    profits = [r['max_profit_pct'] for r in valid_results if r['max_profit_pct'] > 0]
+    drawdowns = [abs(r['max_drawdown_pct']) for r in valid_results if r['max_drawdown_pct'] < 0]
+    all_profits = [r['max_profit_pct'] for r in valid_results]
+    all_drawdowns = [r['max_drawdown_pct'] for r in valid_results]
+
+    symbol_stats = {}
+    for r in valid_results:
+        stats = symbol_stats.setdefault(r['symbol'], {'total': 0, 'wins': 0, 'losses': 0, 'profits': [],
+                                                      'drawdowns': [], 'target_times': []})
+        stats['total'] += 1
+        if r['final_outcome'].startswith('TARGET'):
+            stats['wins'] += 1
+            if r.get('target1_minutes'):
+                stats['target_times'].append(r['target1_minutes'])
+        elif r['final_outcome'] == 'STOP_LOSS':
+            stats['losses'] += 1
+        if r['max_profit_pct'] > 0:
+            stats['profits'].append(r['max_profit_pct'])
+        if r['max_drawdown_pct'] < 0:
+            stats['drawdowns'].append(abs(r['max_drawdown_pct']))
+    for stats in symbol_stats.values():
+        stats['winrate_pct'] = (stats['wins'] / stats['total']) * 100
+        stats['avg_profit_pct'] = np.mean(stats['profits']) if stats['profits'] else 0
+        stats['avg_drawdown_pct'] = np.mean(stats['drawdowns']) if stats['drawdowns'] else 0
+        stats['avg_target_time_min'] = np.mean(stats['target_times']) if stats['target_times'] else 0
+
+    return {
+        'total_signals': total_signals,
+        'valid_signals': total_valid,
+        'data_coverage_pct': (total_valid / total_signals) * 100,
+        'overall_winrate_pct': (any_target_wins / total_valid) * 100,
+        'target1_hit_rate_pct': (target1_hits / total_valid) * 100,
+        'target2_hit_rate_pct': (target2_hits / total_valid) * 100,
+        'target3_hit_rate_pct': (target3_hits / total_valid) * 100,
+        'stop_loss_rate_pct': (stop_loss_hits / total_valid) * 100,
+        'total_wins': any_target_wins,
+        'total_losses': stop_loss_hits,
+        'target1_only_wins': sum(1 for r in valid_results if r['final_outcome'] == 'TARGET1'),
+        'target2_wins': sum(1 for r in valid_results if r['final_outcome'] == 'TARGET2'),
+        'target3_wins': sum(1 for r in valid_results if r['final_outcome'] == 'TARGET3'),
+        'target1_hits': target1_hits,
+        'target2_hits': target2_hits,
+        'target3_hits': target3_hits,
+        'avg_target_time_min': np.mean(target_times) if target_times else 0,
+        'median_target_time_min': np.median(target_times) if target_times else 0,
+        'avg_target1_time_min': np.mean(level_times[1]) if level_times[1] else 0,
+        'avg_target2_time_min': np.mean(level_times[2]) if level_times[2] else 0,
+        'avg_target3_time_min': np.mean(level_times[3]) if level_times[3] else 0,
+        'avg_sl_time_min': np.mean(sl_times) if sl_times else 0,
+        'median_sl_time_min': np.median(sl_times) if sl_times else 0,
+        'fastest_target_min': min(target_times) if target_times else 0,
+        'slowest_target_min': max(target_times) if target_times else 0,
+        'avg_max_profit_pct': np.mean(profits) if profits else 0,
+        'median_max_profit_pct': np.median(profits) if profits else 0,
+        'best_profit_pct': max(profits) if profits else 0,
+        'avg_max_drawdown_pct': np.mean(drawdowns) if drawdowns else 0,
+        'median_max_drawdown_pct': np.median(drawdowns) if drawdowns else 0,
+        'worst_drawdown_pct': max(drawdowns) if drawdowns else 0,
+        'profit_factor': (sum(p for p in all_profits if p > 0) /
+                          abs(sum(d for d in all_drawdowns if d < 0)))
+                         if any(d < 0 for d in all_drawdowns) else float('inf'),
+        'sharpe_estimate': np.mean(all_profits) / np.std(all_profits)
+                           if len(all_profits) > 1 and np.std(all_profits) > 0 else 0,
+        'symbol_performance': symbol_stats,
+        'timeframe_performance': baseline_categories(results, 'timeframe', True, 'winrate_pct'),
+        'strategy_performance': baseline_categories(results, 'strategy_version', True, 'winrate_pct'),
+        'action_performance': baseline_categories(results, 'action', True, 'winrate_pct')
+    }
+
+
+def baseline_signal(results):
+    total_signals = len(results)
+    valid_results = [r for r in results if r['final_outcome'] != 'NO_DATA']
+    total_valid = len(valid_results)
+    target1_hits = sum(1 for r in valid_results if r['hit_target1'])
+    target2_hits = sum(1 for r in valid_results if r['hit_target2'])
+    target3_hits = sum(1 for r in valid_results if r['hit_target3'])
+    stop_loss_hits = sum(1 for r in valid_results if r['hit_stop_loss'])
+    wins = sum(1 for r in valid_results if r['final_outcome'].startswith('TARGET'))
+
+    target_times, sl_times = [], []
+    for r in valid_results:
+        for level in (1, 2, 3):
+            if r[f'target{level}_minutes']:
+                target_times.append(r[f'target{level}_minutes'])
+        if r['stop_loss_minutes']:
+            sl_times.append(r['stop_loss_minutes'])
+    profits = [r['max_profit_pct'] for r in valid_results if r['max_profit_pct'] > 0]
+    drawdowns = [abs(r['max_drawdown_pct']) for r in valid_results if r['max_drawdown_pct'] < 0]
+    rr_ratios = [r[target] for r in valid_results for target in ('rr_target1', 'rr_target2', 'rr_target3')
+                 if target in r and r[target]]
+
+    symbol_stats = {}
+    for r in results:
+        stats = symbol_stats.setdefault(r['symbol'], {'total': 0, 'wins': 0, 'losses': 0,
+                                                      'target_times': [], 'sl_times': []})
+        stats['total'] += 1
+        if r['final_outcome'].startswith('TARGET'):
+            stats['wins'] += 1
+            if r.get('target1_minutes'):
+                stats['target_times'].append(r['target1_minutes'])
+        elif r['final_outcome'] == 'STOP_LOSS':
+            stats['losses'] += 1
+            if r.get('stop_loss_minutes'):
+                stats['sl_times'].append(r['stop_loss_minutes'])
+    for stats in symbol_stats.values():
+        stats['winrate'] = (stats['wins'] / stats['total']) * 100
+        stats['avg_target_time'] = np.mean(stats['target_times']) if stats['target_times'] else 0
+        stats['avg_sl_time'] = np.mean(stats['sl_times']) if stats['sl_times'] else 0
+
+    return {
+        'total_signals': total_signals,
+        'valid_signals': total_valid,
+        'data_coverage': (total_valid / total_signals) * 100,
+        'overall_winrate': (wins / total_valid) * 100,
+        'target1_rate': (target1_hits / total_valid) * 100,
+        'target2_rate': (target2_hits / total_valid) * 100,
+        'target3_rate': (target3_hits / total_valid) * 100,
+        'stop_loss_rate': (stop_loss_hits / total_valid) * 100,
+        'target1_hits': target1_hits,
+        'target2_hits': target2_hits,
+        'target3_hits': target3_hits,
+        'stop_loss_hits': stop_loss_hits,
+        'wins': wins,
+        'losses': stop_loss_hits,
+        'avg_target_time': np.mean(target_times) if target_times else 0,
+        'median_target_time': np.median(target_times) if target_times else 0,
+        'avg_sl_time': np.mean(sl_times) if sl_times else 0,
+        'median_sl_time': np.median(sl_times) if sl_times else 0,
+        'fastest_target': min(target_times) if target_times else 0,
+        'slowest_target': max(target_times) if target_times else 0,
+        'avg_max_profit': np.mean(profits) if profits else 0,
+        'max_profit_achieved': max(profits) if profits else 0,
+        'avg_max_drawdown': np.mean(drawdowns) if drawdowns else 0,
+        'worst_drawdown': max(drawdowns) if drawdowns else 0,
+        'avg_risk_reward': np.mean(rr_ratios) if rr_ratios else 0,
+        'best_risk_reward': max(rr_ratios) if rr_ratios else 0,
+        'symbol_performance': symbol_stats,
+        'timeframe_performance': baseline_categories(results, 'timeframe', False, 'winrate'),
+        'strategy_performance': baseline_categories(results, 'strategy_version', False, 'winrate')
+    }
+
+
+def make_results(count: int, seed: int, drawdowns: bool = True):
+    """Outcome dictionaries with NO_DATA rows, hits without times and optional fields left out"""
+    rng = np.random.default_rng(seed)
+    results = []
+    for k in range(count):
+        final_outcome = OUTCOMES[rng.integers(len(OUTCOMES))]
+        result = {'signal_id': k, 'symbol': ('BTC', 'ETH', 'SOL', 'XRP')[rng.integers(4)],
+                  'action': ('LONG', 'SHORT')[k % 2], 'final_outcome': final_outcome}
+        if k % 5:
+            result['timeframe'] = ('15m', '1h', '4h')[k % 3]
+        if k % 3:
+            result['strategy_version'] = ('v1', 'v2')[k % 2]
+        if final_outcome != 'NO_DATA':
+            result['max_profit_pct'] = round(float(rng.normal(1, 2)), 4)
+            drawdown = round(float(rng.normal(-1, 2)), 4)
+            result['max_drawdown_pct'] = drawdown if drawdowns else abs(drawdown)
+        for level, reached in (('target1', final_outcome.startswith('TARGET')),
+                               ('target2', final_outcome in ('TARGET2', 'TARGET3')),
+                               ('target3', final_outcome == 'TARGET3'),
+                               ('stop_loss', final_outcome == 'STOP_LOSS')):
+            result[f'hit_{level}'] = reached
+            # Some hits have no recorded time
+            result[f'{level}_minutes'] = round(float(rng.uniform(1, 4000)), 2) if reached and k % 7 else None
+        for level in (1, 2, 3):
+            if k % 4:
+                result[f'rr_target{level}'] = round(level * float(rng.uniform(0.5, 2)), 3) if k % 6 else None
+        results.append(result)
+    return results
+
+
+@pytest.mark.parametrize('drawdowns', [True, False])
+def test_comprehensive_metrics_match_baseline(drawdowns):
+    results = make_results(3000, seed=7, drawdowns=drawdowns)
+    metrics = comprehensive_metrics(results)
+    expected = baseline_comprehensive(results)
+
+    assert metrics == expected
+    assert list(metrics) == list(expected)
+    assert (metrics['profit_factor'] == float('inf')) == (not drawdowns)
+
+
+def test_signal_metrics_match_baseline():
+    results = make_results(3000, seed=8)
+    metrics = signal_metrics(results)
+    expected = baseline_signal(results)
+
+    assert metrics == expected
+    assert list(metrics) == list(expected)
+
+
+def test_empty_and_all_no_data_results():
+    assert comprehensive_metrics([]) == {} and signal_metrics([]) == {}
+    no_data = [{'signal_id': 1, 'symbol': 'BTC', 'final_outcome': 'NO_DATA'}]
+    assert comprehensive_metrics(no_data) == {'error': 'No valid results to analyze'}
+    assert signal_metrics(no_data)['valid_signals'] == 0
@@ -0,0 +1,116 @@
+"""
+Resuming an interrupted full_backtest run from its results journal
+"""
+
+import pandas as pd
+import pytest
+
+import full_backtest
+from data import binance_data
+from data.kline_store import DAY_MS
+from data.result_sinks import results_frame
+from data.results_journal import JournalMismatchError, ResultsJournal
+
+START_MS = 19_723 * DAY_MS  # 2024-01-01 00:00 UTC
+DAYS = 4
+SYMBOLS = ('BTC', 'ETH')
+
+
+class StubClient:
+    """Stand-in for binance.client.Client with one synthetic series per pair"""
+
+    series = {}
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str):
+        return [row for row in self.series.get(symbol, []) if start_str <= row[0] <= end_str]
+
+
+class InterruptingSink:
+    """Result sink that stops the run after a number of outcomes"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.written = 0
+
+    def write(self, result):
+        if self.written == self.limit:
+            raise KeyboardInterrupt
+        self.written += 1
+
+    def flush(self):
+        pass
+
+
+def signals_frame(series, count: int) -> pd.DataFrame:
+    rows = []
+    for k in range(count):
+        symbol = SYMBOLS[k % len(SYMBOLS)]
+        candle = series[f"{symbol}USDT"][(k * 7) % ((DAYS - 1) * 1440)]
+        entry = float(candle[4])
+        side = 1 if k % 2 == 0 else -1
+        rows.append({
+            'message_id': 1000 + k, 'symbol': symbol, 'timeframe': '1h',
+            'action': 'LONG' if side == 1 else 'SHORT', 'entry_price': entry,
+            'stop_loss': entry * (1 - side * 0.004), 'target1': entry * (1 + side * 0.003),
+            'target2': entry * (1 + side * 0.008), 'target3': None,
+            'timestamp': str(pd.Timestamp(candle[0] + 15_000, unit='ms'))
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def run(make_klines, tmp_path, monkeypatch):
+    StubClient.series = {f"{symbol}USDT": make_klines(START_MS, DAYS * 1440, seed=seed)
+                         for seed, symbol in enumerate(SYMBOLS)}
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(binance_data, 'Client', StubClient)
+    # Small windows, so an interrupted run leaves shards unevaluated
+    monkeypatch.setattr(full_backtest, 'SHARD_WINDOW', 100)
+    signals = signals_frame(StubClient.series, 600)
+
+    def run(journal: str, resume: bool = False, sinks=None, **kwargs):
+        tester = full_backtest.MetaSignalsBacktester()
+        tester.binance.async_fetch = False
+        tester.signals_df = signals
+        results = tester.run_full_backtest(lookforward_hours=12, journal_path=str(tmp_path / journal),
+                                           resume=resume, sinks=sinks, **kwargs)
+        return results_frame(results)
+
+    return run
+
+
+def test_resumed_run_matches_uninterrupted_run(run, capsys):
+    expected = run('full.jsonl')
+
+    with pytest.raises(KeyboardInterrupt):
+        run('interrupted.jsonl', sinks=[InterruptingSink(250)])
+    with open('interrupted.jsonl') as f:
+        assert 250 <= len(f.readlines()) < 600
+    resumed = run('interrupted.jsonl', resume=True)
+
+    assert 'Resuming: 300 signal(s) already in journal, 300 to evaluate' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(resumed, expected)
+
+
+def test_resume_refuses_other_settings(run, tmp_path):
+    previous = {'1000': {'signal_id': 1000, 'final_outcome': 'ONGOING'}}
+    with pytest.raises(KeyboardInterrupt):
+        run('journal.jsonl', sinks=[InterruptingSink(10)])
+
+    # An incremental run or another lookforward must not reuse these outcomes
+    with pytest.raises(JournalMismatchError):
+        run('journal.jsonl', resume=True, previous_results=previous)
+    with pytest.raises(JournalMismatchError):
+        ResultsJournal(str(tmp_path / 'journal.jsonl'),
+                       {'lookforward_hours': 72, 'resolve_ties': False, 'incremental': None}).load()
+
+    # Starting over replaces the journal
+    run('journal.jsonl', previous_results=previous)
+    assert run('journal.jsonl', resume=True, previous_results=previous).shape[0] == 600
+
+
+def test_resolve_ties_is_part_of_the_journal_params(run):
+    tester = full_backtest.MetaSignalsBacktester()
+    with_ties = full_backtest.MetaSignalsBacktester(resolve_intrabar=True)
+    assert tester.journal_params(72) != with_ties.journal_params(72)
+    assert tester.journal_params(72, {'1': {'final_outcome': 'ONGOING'}}) != tester.journal_params(72)
@@ -0,0 +1,142 @@
+"""
+SlTpSweep against the outcome engine and against itself
+
+At multipliers (1.0, 1.0) a sweep cell is the signal's own stop loss and
+target1, so every signal must end as the outcome engine's evaluation with
+target2/target3 left out; run() must agree with signal_outcomes() cell
+by cell.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import SlTpSweep
+from data.outcome_engine import evaluate_signal, first_candle_at_or_after
+
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+MINUTE_MS = 60_000
+CANDLES = 4 * 1440
+WINDOW_MS = 12 * 3_600_000
+ENGINE_OUTCOMES = {'TARGET1': 'TARGET', 'STOP_LOSS': 'STOP_LOSS', 'ONGOING': 'ONGOING'}
+
+
+@pytest.fixture(scope='module')
+def series():
+    """Four days of 1m candles with bursts of volatility"""
+    rng = np.random.default_rng(5)
+    scale = np.where(rng.random(CANDLES) < 0.05, 0.008, 0.0015)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, scale)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    highs = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.001, CANDLES)))
+    lows = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.001, CANDLES)))
+    timestamps = START_MS + np.arange(CANDLES, dtype=np.int64) * MINUTE_MS
+    return timestamps, highs, lows
+
+
+def make_levels(series, count: int, seed: int):
+    """Random LONG/SHORT signals with a stop loss and target1 only"""
+    timestamps, highs, _ = series
+    rng = np.random.default_rng(seed)
+    signals = []
+    for k in range(count):
+        i = int(rng.integers(0, CANDLES - 1440))
+        entry = float(highs[i])
+        side = 1 if k % 2 == 0 else -1
+        # Every fifth signal has levels out of reach of a 12h window
+        reach = 10 if k % 5 == 0 else 1
+        signals.append({
+            'signal_id': k, 'symbol': 'BTC', 'pair': 'BTCUSDT',
+            'action': 'LONG' if side == 1 else 'SHORT', 'entry_price': entry,
+            'stop_loss': entry * (1 - side * reach * float(rng.uniform(0.002, 0.01))),
+            'target1': entry * (1 + side * reach * float(rng.uniform(0.002, 0.01))),
+            'target2': None, 'target3': None,
+            'signal_time': pd.Timestamp(int(timestamps[i]) + int(rng.integers(0, MINUTE_MS)),
+                                        unit='ms', tz='UTC')
+        })
+    return signals
+
+
+def build(levels_list, timestamps, highs, lows):
+    """Engine outcomes and a sweep over the same lookforward windows"""
+    sweep = SlTpSweep()
+    outcomes = []
+    for levels in levels_list:
+        end_ms = levels['signal_time'].value // 1_000_000 + WINDOW_MS
+        start = first_candle_at_or_after(timestamps, levels['signal_time'])
+        stop = int(np.searchsorted(timestamps, end_ms, side='right'))
+        outcomes.append(evaluate_signal(levels, timestamps, highs, lows, end_ms))
+        sweep.add_signal(levels['signal_time'], levels['action'], levels['entry_price'],
+                         levels['stop_loss'], levels['target1'], timestamps[start:stop],
+                         highs[start:stop], lows[start:stop], signal_id=levels['signal_id'])
+    return outcomes, sweep
+
+
+def assert_matches_engine(outcomes, sweep_outcomes):
+    assert len(outcomes) == len(sweep_outcomes)
+    for outcome, (_, row) in zip(outcomes, sweep_outcomes.iterrows()):
+        assert row['signal_id'] == outcome['signal_id']
+        assert row['outcome'] == ENGINE_OUTCOMES[outcome['final_outcome']]
+        if outcome['final_outcome'] == 'ONGOING':
+            assert row['exit_minutes'] is None or pd.isna(row['exit_minutes'])
+            continue
+        minutes = outcome['target1_minutes'] if row['outcome'] == 'TARGET' else outcome['stop_loss_minutes']
+        assert row['exit_minutes'] == pytest.approx(minutes, rel=1e-12)
+        level = outcome['target1'] if row['outcome'] == 'TARGET' else outcome['stop_loss']
+        pnl = abs(level - outcome['entry_price']) / outcome['entry_price'] * 100
+        assert row['pnl_pct'] == pytest.approx(pnl if row['outcome'] == 'TARGET' else -pnl, rel=1e-12)
+
+
+def test_unit_multipliers_match_outcome_engine(series):
+    outcomes, sweep = build(make_levels(series, 400, seed=1), *series)
+    sweep_outcomes = sweep.signal_outcomes(1.0, 1.0)
+
+    assert_matches_engine(outcomes, sweep_outcomes)
+    # The random signals reach every outcome
+    assert set(sweep_outcomes['outcome']) == {'TARGET', 'STOP_LOSS', 'ONGOING'}
+
+
+def test_candle_touching_stop_and_target_is_a_stop_loss():
+    timestamps = START_MS + np.arange(5, dtype=np.int64) * MINUTE_MS
+    highs = np.array([100.2, 100.4, 101.5, 102.0, 102.0])
+    lows = np.array([99.8, 99.6, 98.5, 99.0, 99.0])
+    levels = [
+        {'signal_id': 'long', 'symbol': 'BTC', 'action': 'LONG', 'entry_price': 100.0,
+         'stop_loss': 99.0, 'target1': 101.0},
+        {'signal_id': 'short', 'symbol': 'BTC', 'action': 'SHORT', 'entry_price': 100.0,
+         'stop_loss': 101.0, 'target1': 99.0}
+    ]
+    for signal in levels:
+        signal.update(target2=None, target3=None, signal_time=pd.Timestamp(START_MS, unit='ms', tz='UTC'))
+
+    outcomes, sweep = build(levels, timestamps, highs, lows)
+    sweep_outcomes = sweep.signal_outcomes(1.0, 1.0)
+
+    assert [outcome['final_outcome'] for outcome in outcomes] == ['STOP_LOSS', 'STOP_LOSS']
+    assert sweep_outcomes['outcome'].tolist() == ['STOP_LOSS', 'STOP_LOSS']
+    assert sweep_outcomes['exit_minutes'].tolist() == [2.0, 2.0]
+    assert_matches_engine(outcomes, sweep_outcomes)
+
+
+def test_run_cells_match_signal_outcomes(series):
+    _, sweep = build(make_levels(series, 200, seed=2), *series)
+    sl_multipliers, tp_multipliers = (0.5, 1.0, 1.75), (0.75, 1.0, 2.0, 3.0)
+    grid = sweep.run(sl_multipliers, tp_multipliers)
+
+    assert len(grid) == len(sl_multipliers) * len(tp_multipliers)
+    for _, cell in grid.iterrows():
+        outcomes = sweep.signal_outcomes(cell['sl_multiplier'], cell['tp_multiplier'])
+        wins = outcomes['outcome'] == 'TARGET'
+        losses = outcomes['outcome'] == 'STOP_LOSS'
+        closed = outcomes[wins | losses]
+
+        assert cell['trades'] == len(outcomes)
+        assert (cell['wins'], cell['losses']) == (wins.sum(), losses.sum())
+        assert cell['ongoing'] == len(outcomes) - len(closed)
+        assert cell['win_rate'] == pytest.approx(wins.mean() * 100)
+        assert cell['total_pnl_pct'] == pytest.approx(outcomes['pnl_pct'].sum(), rel=1e-12)
+        assert cell['avg_pnl_pct'] == pytest.approx(outcomes['pnl_pct'].mean(), rel=1e-12)
+        assert cell['profit_factor'] == pytest.approx(
+            outcomes.loc[wins, 'pnl_pct'].sum() / -outcomes.loc[losses, 'pnl_pct'].sum(), rel=1e-12)
+        assert cell['avg_exit_minutes'] == pytest.approx(closed['exit_minutes'].astype(float).mean(),
+                                                         rel=1e-12)